@@ -1,10 +1,37 @@
-from fastapi import FastAPI, HTTPException, Body, status, Response, Depends
-from pydantic import BaseModel, Field
+import asyncio
+import codecs
+import hashlib
+import json
+import os
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from fastapi import FastAPI, HTTPException, Body, status, Response, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from typing_extensions import Annotated, NotRequired, TypedDict  # pydantic needs these on Python < 3.12
 from datetime import date # Still need to import the 'date' type
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Literal
+
+# Optional: orjson is a much faster JSON encoder. Fall back to the standard library without it.
+try:
+    import orjson
+
+    def dumps_json(value: Any) -> bytes:
+        return orjson.dumps(value)
+except ImportError:
+    def dumps_json(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+from metrics import REGISTRY, MetricsMiddleware
+from db_maintenance import MaintenanceScheduler, DEFAULT_INTERVAL_SECONDS
 
 # IMPORTANT: This imports the database functions we just updated
-from database import initialize_db, add_expense, get_all_expenses, get_summary_by_category
+import database
+from database import (
+    initialize_db, close_pool, close_write_batcher, submit_expense, add_expenses_bulk, get_expenses_page, get_summary_by_category,
+    get_spend_timeseries, search_expenses, stream_expenses_csv, SEARCH_PAGE_SIZE_DEFAULT,
+    decode_cursor, get_data_version, EXPENSE_COLUMNS, PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX, BULK_CHUNK_SIZE,
+)
 
 # --- Pydantic Schemas for Data Validation and Documentation ---
 
@@ -21,10 +48,46 @@ class Expense(ExpenseCreate):
     # Already changed in the last step
     expense_id: int = Field(..., description="Unique ID of the expense")
 
+# Schema for one page of expenses returned by GET /expenses
+class ExpensePage(BaseModel):
+    items: List[Expense] = Field(..., description="Expenses on this page, newest first")
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to get the next page (null on the last page)")
+
+# Schema for one page of full-text search results
+class ExpenseSearchPage(BaseModel):
+    items: List[Expense] = Field(..., description="Matching expenses, best match first")
+    next_offset: Optional[int] = Field(None, description="Pass as ?offset= to get the next page (null on the last page)")
+
+# Schemas for the result of POST /expenses/bulk
+class BulkRowError(BaseModel):
+    index: int = Field(..., description="Position of the record in the request (0-based)")
+    error: str = Field(..., description="Why the record was rejected")
+
+class BulkChunkResult(BaseModel):
+    chunk: int = Field(..., description="Chunk number (0-based)")
+    received: int = Field(..., description="Records received in this chunk")
+    inserted: int = Field(..., description="Records written in this chunk's transaction")
+    errors: List[BulkRowError] = Field(default_factory=list, description="Row-level errors in this chunk")
+
+class BulkInsertResult(BaseModel):
+    total_received: int
+    total_inserted: int
+    chunks: List[BulkChunkResult]
+
 # Schema for the category summary data returned from the summary endpoint
 class CategorySummary(BaseModel):
     category: str = Field(..., description="Category name")
     total_spent: float = Field(..., description="Total amount spent in this category")
+    expense_count: int = Field(..., description="Number of expenses in this category")
+    min_amount: float = Field(..., description="Smallest expense in this category")
+    max_amount: float = Field(..., description="Largest expense in this category")
+
+# Schema for one point of the spend timeseries
+class SpendBucket(BaseModel):
+    bucket: str = Field(..., description="Start of the period (YYYY-MM-DD): the day, the Monday of the week, or the 1st of the month")
+    category: str = Field(..., description="Category name")
+    expense_count: int = Field(..., description="Number of expenses in this period and category")
+    total_spent: float = Field(..., description="Total amount spent in this period and category")
 
 # --- FastAPI Application Setup ---
 
@@ -34,63 +97,408 @@ app = FastAPI(
     version="1.0.3" # Incrementing version after the fix
 )
 
-# --- Startup Event (Database Initialization) ---
+# Per-route latency histograms and status counts (switch off with EXPENSE_API_METRICS=0)
+app.add_middleware(MetricsMiddleware)
+
+# --- Startup / Shutdown Events (Database Initialization and Pool Cleanup) ---
+
+# Background maintenance (incremental vacuum, optimize, checkpoint). Set to 0 to turn it off.
+MAINTENANCE_INTERVAL_SECONDS = float(os.environ.get("EXPENSE_MAINTENANCE_INTERVAL", DEFAULT_INTERVAL_SECONDS))
+maintenance_scheduler: Optional[MaintenanceScheduler] = None
 
 @app.on_event("startup")
 def startup_event():
     """Initializes the database when the application starts."""
+    global maintenance_scheduler
+    # The handlers below borrow pooled connections through the database functions
     initialize_db()
+    if MAINTENANCE_INTERVAL_SECONDS > 0:
+        maintenance_scheduler = MaintenanceScheduler(database.DATABASE_NAME, MAINTENANCE_INTERVAL_SECONDS)
+        maintenance_scheduler.start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Flushes queued writes and closes the pooled database connections when the application stops."""
+    global maintenance_scheduler
+    if maintenance_scheduler is not None:
+        maintenance_scheduler.stop()
+        maintenance_scheduler = None
+    close_write_batcher()
+    close_pool()
 
 # --- API Endpoints ---
 
+# How long POST /expenses waits for its group commit before answering 503
+WRITE_TIMEOUT_SECONDS = float(os.environ.get("EXPENSE_WRITE_TIMEOUT", 10.0))
+
 @app.post("/expenses", response_model=Dict[str, Any], status_code=status.HTTP_200_OK)
 def create_expense(expense: ExpenseCreate):
     """Adds a new expense to the tracker."""
     try:
         # CHANGED: Use expense.expense_date instead of expense.date
-        add_expense(
+        # The write is group-committed with other concurrent requests; wait until it is durable
+        submit_expense(
             date=expense.expense_date.isoformat(), # The argument name is still 'date' for the function
             amount=expense.amount,
             category=expense.category,
             description=expense.description
-        )
+        ).result(timeout=WRITE_TIMEOUT_SECONDS)
         return {
             "message": "Expense added successfully",
             "date": expense.expense_date.isoformat(),
             "amount": expense.amount
         }
+    except FutureTimeoutError:
+        # The write may still be committed later; the client can't know, so it should retry carefully
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"The write was not committed within {WRITE_TIMEOUT_SECONDS:g} seconds",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to add expense: {e}"
         )
 
-@app.get("/expenses", response_model=List[Expense], status_code=status.HTTP_200_OK)
-def read_expenses():
-    """Retrieves all recorded expenses."""
+# --- Conditional GET Helpers (ETag / If-None-Match) ---
+
+def _make_etag(request: Request) -> str:
+    """Builds a strong ETag from the data version plus the path and (sorted) query string.
+
+    Every page and filter combination gets its own ETag, and all of them change
+    as soon as anything is written.
+    """
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    key = f"{get_data_version()}|{request.url.path}|{query}"
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Checks an If-None-Match header (which may list several ETags, or be '*')."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+def _not_modified_or_tag(request: Request, response: Response) -> Optional[Response]:
+    """Returns a 304 response if the client's copy is current; otherwise tags `response` with the ETag.
+
+    The version is read BEFORE the database is queried, so a write that sneaks in
+    between can only make the ETag older than the data, never newer.
+    """
+    etag = _make_etag(request)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+# --- Bulk Ingestion Helpers ---
+
+# The same fields and rules as ExpenseCreate, as a TypedDict: validating into plain
+# dicts skips building a model object per row, which made validation ~4x faster
+class _BulkExpense(TypedDict):
+    expense_date: date
+    amount: Annotated[float, Field(gt=0)]
+    category: str
+    description: NotRequired[str]
+
+# Validates a whole chunk in one call instead of row by row
+_expense_batch_adapter = TypeAdapter(List[_BulkExpense])
+
+# A single record bigger than this means the body is malformed: stop instead of buffering more
+BULK_MAX_RECORD_BYTES = 64 * 1024
+
+def _format_validation_error(errors: List[Dict[str, Any]]) -> str:
+    """Turns Pydantic error dicts into one readable line."""
+    return "; ".join(f"{'.'.join(str(part) for part in err['loc']) or 'record'}: {err['msg']}" for err in errors)
+
+def _insert_chunk(chunk_number: int, indexes: List[int], records: List[Any], parse_errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Validates and inserts one chunk of records. Runs in the threadpool.
+
+    `indexes` holds each record's position in the request. `parse_errors` are the
+    records of this chunk that weren't valid JSON (already numbered).
+    """
+    received = len(records) + len(parse_errors)
+    errors = list(parse_errors)
+
+    # Validate the whole chunk in one TypeAdapter call. If some rows fail (a record that
+    # isn't an object fails like any other), record their errors and validate the rest again.
+    valid = []
+    while records:
+        try:
+            valid = _expense_batch_adapter.validate_python(records)
+            break
+        except ValidationError as e:
+            failed: Dict[int, List[Dict[str, Any]]] = {}
+            for err in e.errors():
+                failed.setdefault(err["loc"][0], []).append({**err, "loc": err["loc"][1:]})
+            for position, row_errors in failed.items():
+                errors.append({"index": indexes[position], "error": _format_validation_error(row_errors)})
+            indexes = [index for position, index in enumerate(indexes) if position not in failed]
+            records = [record for position, record in enumerate(records) if position not in failed]
+
+    rows = [
+        (expense["expense_date"].isoformat(), expense["amount"], expense["category"], expense.get("description"))
+        for expense in valid
+    ]
+    inserted = 0
+    try:
+        inserted = add_expenses_bulk(rows)
+    except Exception as e:
+        # The chunk's transaction was rolled back, so every valid row in it failed
+        errors.extend({"index": index, "error": f"Chunk insert failed: {e}"} for index in indexes)
+
+    errors.sort(key=lambda err: err["index"])
+    return {"chunk": chunk_number, "received": received, "inserted": inserted, "errors": errors}
+
+async def _iter_ndjson_records(request: Request):
+    """Streams the request body and yields (record, None) per line, or (None, error) for a bad line."""
+    buffer = b""
+    async for piece in request.stream():
+        buffer += piece
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()  # The last piece may be an incomplete line
+        if len(buffer) > BULK_MAX_RECORD_BYTES:
+            raise ValueError(f"A line is longer than {BULK_MAX_RECORD_BYTES} bytes")
+        for line in lines:
+            if line.strip():
+                yield _parse_ndjson_line(line)
+    if buffer.strip():
+        yield _parse_ndjson_line(buffer)
+
+def _parse_ndjson_line(line: bytes) -> Tuple[Any, Optional[str]]:
+    try:
+        return json.loads(line), None
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+
+async def _iter_json_array_records(request: Request):
+    """Streams a JSON array body and yields (record, None) for each element as soon as it
+    is complete, so the whole array is never held in memory.
+
+    Raises ValueError when the body is not an array or stops being valid JSON (the
+    records before that point have already been yielded).
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pieces = request.stream().__aiter__()
+    buffer, position, at_eof = "", 0, False
+
+    async def read_more() -> bool:
+        """Appends the next piece of the body to the buffer. Returns False at the end."""
+        nonlocal buffer, position, at_eof
+        if at_eof:
+            return False
+        try:
+            piece = await pieces.__anext__()
+        except StopAsyncIteration:
+            piece, at_eof = b"", True
+        buffer = buffer[position:] + text_decoder.decode(piece, final=at_eof)
+        position = 0
+        return True
+
+    async def next_char() -> str:
+        """Skips whitespace and returns the next character ('' at the end of the body)."""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not await read_more():
+                return ""
+
+    if await next_char() != "[":
+        raise ValueError("Expected a JSON array of expenses")
+    position += 1
+    if await next_char() == "]":
+        return
+    while True:
+        await next_char()
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            # Most likely the element is cut off at the end of the buffer: read more and retry
+            if len(buffer) - position > BULK_MAX_RECORD_BYTES or not await read_more():
+                # e.msg without the position: that would be relative to the buffer, not the body
+                raise ValueError(f"Invalid JSON body: {e.msg}")
+            continue
+        if end == len(buffer) and await read_more():
+            continue  # A bare number may go on in the next piece: decode it again
+        position = end
+        yield record, None
+
+        separator = await next_char()
+        if separator == "]":
+            return
+        if not separator:
+            raise ValueError("Invalid JSON body: the array is not closed")
+        if separator != ",":
+            raise ValueError("Invalid JSON body: expected ',' or ']' after an array element")
+        position += 1
+
+@app.get("/expenses", response_model=ExpensePage, status_code=status.HTTP_200_OK)
+def read_expenses(
+    request: Request,
+    response: Response,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX, description="Maximum number of expenses per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    date_from: Optional[date] = Query(None, alias="from", description="Only expenses on or after this date"),
+    date_to: Optional[date] = Query(None, alias="to", description="Only expenses on or before this date"),
+    category: Optional[str] = Query(None, description="Only expenses in this category"),
+    min_amount: Optional[float] = Query(None, ge=0, description="Only expenses of at least this amount"),
+):
+    """Retrieves recorded expenses one page at a time (newest first)."""
+    not_modified = _not_modified_or_tag(request, response)
+    if not_modified is not None:
+        return not_modified
+
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     try:
-        expenses = get_all_expenses()
-
-        # REMAPPING: Convert 'id' key from database output to 'expense_id' and 'date' to 'expense_date'
-        remapped_expenses = []
-        for exp in expenses:
-            remapped_expenses.append({
-                "expense_id": exp.pop("id"), # Renaming 'id' to 'expense_id'
-                "expense_date": exp.pop("date"), # Renaming 'date' to 'expense_date' for the model
-                **exp # Spreading the rest of the dictionary keys
-            })
-
-        return remapped_expenses
+        expenses, next_cursor = get_expenses_page(
+            limit=limit,
+            after=after,
+            date_from=date_from.isoformat() if date_from else None,
+            date_to=date_to.isoformat() if date_to else None,
+            category=category,
+            min_amount=min_amount,
+        )
+
+        # FAST PATH: the SQL already aliases id -> expense_id and date -> expense_date, and the
+        # rows were validated on the way in, so encode them directly instead of re-validating
+        # every row against List[Expense].
+        body = dumps_json({
+            "items": [dict(zip(EXPENSE_COLUMNS, row)) for row in expenses],
+            "next_cursor": next_cursor,
+        })
+        return Response(content=body, media_type="application/json", headers={"ETag": response.headers["etag"]})
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve expenses: {e}"
         )
 
+@app.get("/expenses/export", response_class=StreamingResponse, status_code=status.HTTP_200_OK)
+def export_expenses_csv(
+    gzip: bool = Query(False, description="Send expenses.csv.gz instead of plain CSV"),
+):
+    """Downloads every expense as CSV, streamed in chunks straight from the database."""
+    filename = "expenses.csv.gz" if gzip else "expenses.csv"
+    return StreamingResponse(
+        stream_expenses_csv(compress=gzip),
+        media_type="application/gzip" if gzip else "text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@app.get("/expenses/search", response_model=ExpenseSearchPage, status_code=status.HTTP_200_OK)
+def search_expense_descriptions(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, description='Words to find. Use din* for a prefix and "office cafe" for a phrase'),
+    limit: int = Query(SEARCH_PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX, description="Maximum number of results per page"),
+    offset: int = Query(0, ge=0, description="Number of results to skip (from next_offset)"),
+):
+    """Searches expense descriptions and categories, best matches first."""
+    not_modified = _not_modified_or_tag(request, response)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        expenses, next_offset = search_expenses(q, limit=limit, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search expenses: {e}"
+        )
+
+    body = dumps_json({
+        "items": [dict(zip(EXPENSE_COLUMNS, row)) for row in expenses],
+        "next_offset": next_offset,
+    })
+    return Response(content=body, media_type="application/json", headers={"ETag": response.headers["etag"]})
+
+@app.post("/expenses/bulk", response_model=BulkInsertResult, status_code=status.HTTP_200_OK)
+async def create_expenses_bulk(request: Request):
+    """Adds many expenses at once.
+
+    Send either a JSON array of expenses (Content-Type: application/json) or one
+    expense per line (Content-Type: application/x-ndjson). Both are parsed while the
+    body streams in, and records are validated and written in chunks of
+    BULK_CHUNK_SIZE, each chunk in a single transaction.
+    """
+    content_type = request.headers.get("content-type", "")
+    is_ndjson = "ndjson" in content_type or "jsonlines" in content_type
+    reader = _iter_ndjson_records(request) if is_ndjson else _iter_json_array_records(request)
+
+    chunks: List[Dict[str, Any]] = []
+    in_flight = None  # The insert of the previous chunk, running in the threadpool
+    indexes: List[int] = []
+    records: List[Any] = []
+    parse_errors: List[Dict[str, Any]] = []
+    received = 0
+
+    async def submit_chunk():
+        # Wait for the previous chunk, then start this one and go back to parsing: the next
+        # chunk is read and parsed while SQLite writes this one (it releases the GIL meanwhile)
+        nonlocal in_flight, indexes, records, parse_errors
+        if in_flight is not None:
+            chunks.append(await in_flight)
+        in_flight = asyncio.ensure_future(
+            run_in_threadpool(_insert_chunk, len(chunks), indexes, records, parse_errors)
+        )
+        indexes, records, parse_errors = [], [], []
+
+    try:
+        try:
+            async for record, error in reader:
+                if error is None:
+                    indexes.append(received)
+                    records.append(record)
+                else:
+                    parse_errors.append({"index": received, "error": error})
+                received += 1
+                if len(records) + len(parse_errors) >= BULK_CHUNK_SIZE:
+                    await submit_chunk()
+        except ValueError as e:
+            if received == 0:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            # There is no way to resynchronize after broken JSON: keep what was read and report the rest
+            parse_errors.append({"index": received, "error": f"{e} (the rest of the body was not read)"})
+            received += 1
+        if records or parse_errors:
+            await submit_chunk()
+    finally:
+        # Never leave a chunk's transaction running unobserved
+        if in_flight is not None:
+            chunks.append(await in_flight)
+
+    return {
+        "total_received": received,
+        "total_inserted": sum(chunk["inserted"] for chunk in chunks),
+        "chunks": chunks,
+    }
+
 # NEW ENDPOINT: Category Summary
 @app.get("/summary", response_model=List[CategorySummary], status_code=status.HTTP_200_OK)
-def get_category_summary():
-    """Calculates and returns the total spent per category."""
+def get_category_summary(request: Request, response: Response):
+    """Returns the total spent per category (read from the incrementally maintained totals)."""
+    not_modified = _not_modified_or_tag(request, response)
+    if not_modified is not None:
+        return not_modified
+
     try:
         summary = get_summary_by_category()
         return summary
@@ -100,6 +508,40 @@ def get_category_summary():
             detail=f"Failed to retrieve category summary: {e}"
         )
 
+@app.get("/summary/timeseries", response_model=List[SpendBucket], status_code=status.HTTP_200_OK)
+def get_spend_timeseries_summary(
+    request: Request,
+    response: Response,
+    granularity: Literal["day", "week", "month"] = Query("day", description="Size of each time bucket"),
+    date_from: Optional[date] = Query(None, alias="from", description="First date to include (its whole bucket is returned)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Last date to include"),
+    category: Optional[str] = Query(None, description="Only this category"),
+):
+    """Returns spend per category per day, week or month (read from the rollup table)."""
+    not_modified = _not_modified_or_tag(request, response)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        return get_spend_timeseries(
+            granularity,
+            date_from=date_from.isoformat() if date_from else None,
+            date_to=date_to.isoformat() if date_to else None,
+            category=category,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve spend timeseries: {e}"
+        )
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    """Exposes request, database and pool metrics in Prometheus text format."""
+    if not REGISTRY.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/", status_code=status.HTTP_200_OK)
 def read_root():
     """Simple root endpoint to confirm the API is running."""
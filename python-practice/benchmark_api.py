@@ -0,0 +1,274 @@
+"""Load test for api_server.py that runs fully in-process (no network, no uvicorn).
+
+The ASGI app is driven through httpx's ASGITransport by a fixed number of concurrent
+workers. Each worker picks its next request from a weighted mix of POST /expenses,
+GET /expenses and GET /summary. The database is seeded with synthetic rows first,
+once per size in --rows.
+
+Usage:
+    python benchmark_api.py --rows 10000 1000000 --concurrency 16 --requests 5000 \
+        --mix post=1,list=8,summary=1 --output benchmark_results.json
+
+Compare two runs by diffing their JSON files (or loading them side by side).
+
+Metrics overhead (A/B): --compare-metrics runs the same load with metrics off and on,
+alternating for --rounds rounds on the same seeded database, and reports how much
+throughput and p50 latency the instrumentation costs (the target is under 2%).
+    python benchmark_api.py --rows 100000 --compare-metrics --rounds 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+
+import database
+import api_server
+import metrics
+
+CATEGORIES = ["Food", "Rent", "Transport", "Learning", "Health", "Networking", "Cinema", "Gym"]
+
+# Each operation builds one request for the shared client
+def op_post(client, rng):
+    return client.post("/expenses", json={
+        "expense_date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "amount": round(rng.uniform(1, 500), 2),
+        "category": rng.choice(CATEGORIES),
+        "description": "benchmark expense",
+    })
+
+def op_list(client, rng):
+    params = {"limit": 50}
+    if rng.random() < 0.5:
+        params["category"] = rng.choice(CATEGORIES)
+    return client.get("/expenses", params=params)
+
+def op_summary(client, rng):
+    return client.get("/summary")
+
+OPERATIONS = {"post": op_post, "list": op_list, "summary": op_summary}
+
+def parse_mix(text: str) -> dict:
+    """'post=1,list=8,summary=1' -> {'post': 1.0, 'list': 8.0, 'summary': 1.0}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise SystemExit(f"Unknown operation '{name}' in --mix (choose from {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+def seed(rows: int):
+    """Inserts `rows` synthetic expenses with one INSERT ... SELECT, then rebuilds the derived tables."""
+    with database.get_pool().connection() as conn:
+        # Skip the per-row INSERT triggers; the derived tables are rebuilt in bulk below
+        with conn, database.suspended_insert_triggers(conn):
+            conn.execute(f"""
+                WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+                INSERT INTO expenses (date, amount, category, description)
+                SELECT
+                    date('2020-01-01', '+' || (abs(random()) % 2190) || ' days'),
+                    round((abs(random()) % 50000) / 100.0 + 1, 2),
+                    CASE abs(random()) % {len(CATEGORIES)}
+                        {' '.join(f"WHEN {i} THEN '{name}'" for i, name in enumerate(CATEGORIES))}
+                    END,
+                    'Synthetic expense #' || i
+                FROM n
+            """, (rows,))
+            database._rebuild_category_totals(conn)
+            database._rebuild_rollups(conn, database.DATE_COLUMN_SQL)
+            conn.execute("INSERT INTO expenses_fts (expenses_fts) VALUES ('rebuild')")
+            database.bump_data_version(conn)
+        conn.execute("PRAGMA optimize")
+
+def percentiles(latencies):
+    """p50/p95/p99 (nearest rank) and mean in milliseconds."""
+    if not latencies:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "mean_ms": None}
+    ordered = sorted(latencies)
+
+    def rank(pct):
+        return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))]
+
+    return {
+        "p50_ms": round(rank(50), 3),
+        "p95_ms": round(rank(95), 3),
+        "p99_ms": round(rank(99), 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+    }
+
+async def run_load(mix: dict, concurrency: int, total_requests: int, seed_value: int):
+    """Fires `total_requests` requests from `concurrency` workers and collects latencies per operation."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    remaining = total_requests
+
+    transport = httpx.ASGITransport(app=api_server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+
+        async def worker(worker_id):
+            nonlocal remaining
+            rng = random.Random(seed_value + worker_id)
+            while remaining > 0:
+                remaining -= 1
+                name = rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                response = await OPERATIONS[name](client, rng)
+                latencies[name].append((time.perf_counter() - started) * 1000.0)
+                if response.status_code >= 400:
+                    errors[name] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "requests": len(all_latencies),
+        "throughput_rps": round(len(all_latencies) / elapsed, 1),
+        "errors": sum(errors.values()),
+        **percentiles(all_latencies),
+        "operations": {
+            name: {"requests": len(latencies[name]), "errors": errors[name], **percentiles(latencies[name])}
+            for name in names
+        },
+    }
+
+def compare_metrics(mix: dict, concurrency: int, total_requests: int, warmup: int, seed_value: int, rounds: int):
+    """Runs the load `rounds` times each with metrics off and on (alternating, so slow
+    drift such as the table growing from POSTs hits both sides) and compares them.
+
+    The switch is metrics.REGISTRY.enabled, the same flag EXPENSE_API_METRICS sets.
+    The pool is closed between runs, because a connection decides at connect time
+    whether its queries are timed.
+    """
+    runs = {False: [], True: []}
+    original = metrics.REGISTRY.enabled
+    try:
+        for round_number in range(rounds):
+            # Swap which side goes first every round
+            order = (False, True) if round_number % 2 == 0 else (True, False)
+            for enabled in order:
+                metrics.REGISTRY.enabled = enabled
+                try:
+                    if warmup:
+                        asyncio.run(run_load(mix, concurrency, warmup, seed_value - 1))
+                    runs[enabled].append(asyncio.run(run_load(mix, concurrency, total_requests, seed_value)))
+                finally:
+                    database.close_write_batcher()
+                    database.close_pool()
+    finally:
+        metrics.REGISTRY.enabled = original
+
+    def summary(side):
+        return {
+            "throughput_rps": round(statistics.median(run["throughput_rps"] for run in side), 1),
+            "p50_ms": round(statistics.median(run["p50_ms"] for run in side), 3),
+            "p99_ms": round(statistics.median(run["p99_ms"] for run in side), 3),
+        }
+
+    off, on = summary(runs[False]), summary(runs[True])
+    return {
+        "rounds": rounds,
+        "metrics_off": off,
+        "metrics_on": on,
+        "throughput_overhead_pct": round((off["throughput_rps"] - on["throughput_rps"]) / off["throughput_rps"] * 100, 2),
+        "p50_overhead_pct": round((on["p50_ms"] - off["p50_ms"]) / off["p50_ms"] * 100, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process latency benchmark for api_server.py")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000],
+                        help="Table sizes to seed and test (one run per size)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent in-flight requests")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per run")
+    parser.add_argument("--warmup", type=int, default=200, help="Requests sent (and ignored) before measuring")
+    parser.add_argument("--mix", default="post=1,list=8,summary=1", help="Weighted operation mix")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the request mix")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare-metrics", action="store_true",
+                        help="A/B run: the same load with metrics off and on, and the overhead between them")
+    parser.add_argument("--rounds", type=int, default=3, help="Off/on pairs per size with --compare-metrics")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    results = []
+    for rows in args.rows:
+        if args.compare_metrics:
+            with tempfile.TemporaryDirectory() as workdir:
+                database.DATABASE_NAME = os.path.join(workdir, "benchmark.db")
+                database.initialize_db()
+                seed(rows)
+                database.close_pool()
+                comparison = {"rows": rows, **compare_metrics(mix, args.concurrency, args.requests,
+                                                              args.warmup, args.seed, args.rounds)}
+            results.append(comparison)
+
+            print(f"\n{rows:,} rows, median of {args.rounds} round(s)")
+            print(f"{'metrics':<8} | {'req/s':>8} | {'p50 ms':>8} | {'p99 ms':>8}")
+            print("-" * 42)
+            for label, side in (("off", comparison["metrics_off"]), ("on", comparison["metrics_on"])):
+                print(f"{label:<8} | {side['throughput_rps']:>8} | {side['p50_ms']:>8} | {side['p99_ms']:>8}")
+            overhead = comparison["throughput_overhead_pct"]
+            print(f"Overhead: {overhead}% throughput, {comparison['p50_overhead_pct']}% p50 "
+                  f"{'✅ under 2%' if overhead < 2 else '⚠️ over 2%'}")
+            continue
+
+        with tempfile.TemporaryDirectory() as workdir:
+            database.DATABASE_NAME = os.path.join(workdir, "benchmark.db")
+            database.initialize_db()
+
+            seed_started = time.perf_counter()
+            seed(rows)
+            seed_seconds = time.perf_counter() - seed_started
+            print(f"\nSeeded {rows:,} rows in {seed_seconds:.1f}s")
+
+            try:
+                if args.warmup:
+                    asyncio.run(run_load(mix, args.concurrency, args.warmup, args.seed - 1))
+                run = asyncio.run(run_load(mix, args.concurrency, args.requests, args.seed))
+            finally:
+                database.close_write_batcher()
+                database.close_pool()
+
+        run = {"rows": rows, "seed_seconds": round(seed_seconds, 2), **run}
+        results.append(run)
+
+        print(f"{'operation':<10} | {'requests':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'errors':>6}")
+        print("-" * 62)
+        for name, stats in run["operations"].items():
+            print(f"{name:<10} | {stats['requests']:>8} | {stats['p50_ms']:>8} | {stats['p95_ms']:>8} | "
+                  f"{stats['p99_ms']:>8} | {stats['errors']:>6}")
+        print(f"TOTAL: {run['throughput_rps']} req/s, p50 {run['p50_ms']} ms, p99 {run['p99_ms']} ms")
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": database.sqlite3.sqlite_version,
+        "config": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "mix": mix,
+            "seed": args.seed,
+            "compare_metrics": args.compare_metrics,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"\n💾 Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: row-by-row csv.DictReader summary vs. the mmap + process-pool aggregator.
+
+A synthetic export (same columns as expenses_export.csv, with a few malformed rows
+mixed in) is written to a temporary file and summarized both ways.
+
+Usage:
+    python benchmark_csv_summary.py --rows 1000000 10000000 --workers 1 4 8
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from csv_aggregate import aggregate_csv
+
+CATEGORIES = ["Food", "Rent", "Transport", "Learning", "Health", "Networking", "Cinema", "Gym"]
+
+def write_export(path: str, rows: int, seed: int = 42):
+    """Writes `rows` synthetic expenses; about 1 in 100,000 has a bad amount."""
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "amount", "category", "description", "timestamp"])
+        batch = []
+        for i in range(1, rows + 1):
+            amount = "n/a" if i % 100_000 == 0 else f"{rng.uniform(1, 500):.2f}"
+            # Some descriptions need quoting, like real exports
+            description = f"Lunch, table {i % 7}" if i % 10 == 0 else f"Expense {i}"
+            batch.append((i, amount, CATEGORIES[i % len(CATEGORIES)], description, "2025-10-18T12:00:00"))
+            if len(batch) == 50_000:
+                writer.writerows(batch)
+                batch = []
+        writer.writerows(batch)
+
+def legacy_summary(path: str):
+    """The previous summarize_from_csv loop (without the printing)."""
+    summary = {}
+    skipped = 0
+    with open(path, "r", newline="", encoding="utf-8") as csvfile:
+        for row in csv.DictReader(csvfile):
+            try:
+                amount = float(row["amount"])
+                summary[row["category"]] = summary.get(row["category"], 0.0) + amount
+            except (ValueError, KeyError):
+                skipped += 1
+    return summary, skipped
+
+def main():
+    parser = argparse.ArgumentParser(description="summarize_from_csv benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            path = os.path.join(workdir, f"export_{rows}.csv")
+            write_export(path, rows)
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            print(f"\n{rows:,} rows ({size_mb:.0f} MB)")
+            print(f"{'Method':<22} | {'seconds':>8} | {'rows/s':>12} | {'skipped':>7}")
+            print("-" * 60)
+
+            started = time.perf_counter()
+            expected, skipped = legacy_summary(path)
+            legacy_seconds = time.perf_counter() - started
+            print(f"{'csv.DictReader':<22} | {legacy_seconds:>8.2f} | {rows / legacy_seconds:>12,.0f} | {skipped:>7}")
+
+            for workers in args.workers:
+                started = time.perf_counter()
+                totals, _, problem_count = aggregate_csv(path, workers=workers)
+                seconds = time.perf_counter() - started
+                same = totals.keys() == expected.keys() and all(
+                    abs(totals[category] - expected[category]) < 0.01 for category in expected
+                )
+                print(f"{f'mmap, {workers} worker(s)':<22} | {seconds:>8.2f} | {rows / seconds:>12,.0f} | "
+                      f"{problem_count:>7}  {'✅' if same else '❌ totals differ'} {legacy_seconds / seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: old read_expenses serialization vs. the tuple + fast-encoder path.
+
+Both paths read the same rows from a throw-away database. The old path builds a
+dict per row, remaps the keys with pop(), validates every row as an `Expense` and
+encodes it the way FastAPI does. The fast path fetches aliased tuples and encodes
+them directly with `dumps_json` from api_server.
+
+Usage:
+    python benchmark_read_expenses.py --rows 10000 100000 1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+import database
+from api_server import Expense, EXPENSE_COLUMNS, dumps_json
+
+CATEGORIES = ["Food", "Rent", "Transport", "Learning", "Health", "Networking"]
+
+def seed(rows: int):
+    """Fills the benchmark database with `rows` synthetic expenses."""
+    batch = []
+    for i in range(rows):
+        batch.append((f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}", 1.0 + (i % 500), CATEGORIES[i % len(CATEGORIES)], f"Expense #{i}"))
+        if len(batch) == database.BULK_CHUNK_SIZE:
+            database.add_expenses_bulk(batch)
+            batch = []
+    database.add_expenses_bulk(batch)
+
+def old_path(rows: int) -> bytes:
+    """The previous read_expenses: dict rows, pop() remapping, per-row model validation."""
+    with database.get_pool().connection() as conn:
+        cursor = conn.execute("SELECT * FROM expenses ORDER BY date DESC, id DESC LIMIT ?", (rows,))
+        expenses = [dict(row) for row in cursor.fetchall()]
+    remapped_expenses = []
+    for exp in expenses:
+        remapped_expenses.append({
+            "expense_id": exp.pop("id"),
+            "expense_date": exp.pop("date"),
+            **exp
+        })
+    validated = TypeAdapter(List[Expense]).validate_python(remapped_expenses)
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+def fast_path(rows: int) -> bytes:
+    """The current read_expenses: aliased tuples encoded in one go."""
+    expenses, next_cursor = database.get_expenses_page(limit=rows)
+    return dumps_json({"items": [dict(zip(EXPENSE_COLUMNS, row)) for row in expenses], "next_cursor": next_cursor})
+
+def time_it(func, rows: int, repeat: int) -> float:
+    """Best-of-`repeat` wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+def main():
+    parser = argparse.ArgumentParser(description="read_expenses serialization benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database.DATABASE_NAME = os.path.join(workdir, "benchmark.db")
+        database.initialize_db()
+        seed(max(args.rows))
+
+        print(f"\n{'Rows':>10} | {'old path ms':>12} | {'fast path ms':>12} | {'speed-up':>8}")
+        print("-" * 52)
+        for rows in args.rows:
+            old_ms = time_it(old_path, rows, args.repeat)
+            fast_ms = time_it(fast_path, rows, args.repeat)
+            print(f"{rows:>10} | {old_ms:>12.1f} | {fast_ms:>12.1f} | {old_ms / fast_ms:>7.1f}x")
+
+        database.close_pool()
+
+if __name__ == "__main__":
+    main()
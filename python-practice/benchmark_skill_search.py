@@ -0,0 +1,62 @@
+"""Benchmark: /skills/search latency (TextSearchIndex.search) on a large skill list.
+
+Builds N synthetic skills whose names and notes are drawn from a tech vocabulary, then
+times typical search-as-you-type queries: a one-letter prefix, a longer prefix,
+several words with a prefix last, and a query whose rare last word is a number.
+Reported per query: best and median time over --repeat runs.
+
+Usage:
+    python benchmark_skill_search.py --skills 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from day4_first_api import TextSearchIndex
+
+VOCABULARY = [
+    "python", "pytorch", "pandas", "polars", "postgres", "prompt", "pipelines", "data",
+    "engineering", "statistics", "state", "streaming", "spark", "sql", "transformers",
+    "tensorflow", "kubernetes", "docker", "fastapi", "flask", "react", "rust", "golang",
+    "machine", "learning", "deep", "vision", "nlp", "embeddings", "vector", "search",
+    "cloud", "aws", "azure", "terraform", "linux", "networking", "security", "testing",
+    "airflow", "kafka", "redis", "mlops", "evaluation", "agents", "retrieval", "llm",
+]
+QUERIES = ["p", "pyth", "data engineering stat", "transformers kubernetes 9", "pyhton"]
+
+def make_skills(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "name": " ".join(rng.sample(VOCABULARY, 2)) + f" {rng.randint(1, 99)}",
+            "notes": " ".join(rng.sample(VOCABULARY, 4)),
+        }
+        for i in range(1, count + 1)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill search latency")
+    parser.add_argument("--skills", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    index = TextSearchIndex(fields=["name", "notes"])
+    started = time.perf_counter()
+    index.add_many(make_skills(args.skills))
+    print(f"Indexed {args.skills:,} skills in {time.perf_counter() - started:.2f}s\n")
+
+    print(f"{'query':<28} | {'best ms':>8} | {'median ms':>9} | hits")
+    print("-" * 60)
+    for query in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            hits = index.search(query, args.limit)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"{query:<28} | {min(timings):>8.3f} | {statistics.median(timings):>9.3f} | {len(hits)}")
+
+if __name__ == "__main__":
+    main()
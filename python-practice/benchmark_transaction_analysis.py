@@ -0,0 +1,127 @@
+"""Report: the analyze_transactions() questions, Python loops vs. TransactionAnalysis (NumPy).
+
+Builds N synthetic transactions straight into a TransactionTable and answers the
+same questions each way:
+  total, Learning filter + total, most expensive, 5% fee total, totals per category
+
+  - list of dicts : the old analyze_transactions() passes (only up to --dict-rows,
+                    10M dicts would need about 4 GB of memory)
+  - python loops  : the same passes, but over the table's array columns
+  - numpy         : TransactionAnalysis (masks, bincount, argmax)
+
+Usage:
+    python benchmark_transaction_analysis.py --rows 1000000 10000000
+"""
+import argparse
+import time
+from array import array
+
+import numpy as np
+
+from transaction_analysis import TransactionAnalysis
+from transaction_table import TransactionTable
+
+VENDORS = [f"Vendor {i}" for i in range(500)]
+CATEGORIES = ["Food", "Rent", "Transport", "Learning", "Health", "Networking", "Cinema", "Gym"]
+
+def build_table(rows: int, seed: int = 42) -> TransactionTable:
+    """A TransactionTable with `rows` random transactions, filled column by column."""
+    rng = np.random.default_rng(seed)
+    table = TransactionTable()
+    for vendor in VENDORS:
+        table.vendors.encode(vendor)
+    for category in CATEGORIES:
+        table.categories.encode(category)
+    months, days = rng.integers(1, 13, rows), rng.integers(1, 29, rows)
+    columns = {
+        "ids": np.arange(1760623379631, 1760623379631 + rows, dtype=np.int64),
+        "amounts": np.round(rng.uniform(1, 500, rows), 2),
+        "dates": (20250000 + months * 100 + days).astype(np.int32),
+        "vendor_codes": rng.integers(0, len(VENDORS), rows, dtype=np.uint32),
+        "category_codes": rng.integers(0, len(CATEGORIES), rows, dtype=np.uint32),
+    }
+    for name, values in columns.items():
+        column: array = getattr(table, name)
+        column.frombytes(values.tobytes())
+    return table
+
+def dict_analysis(transactions):
+    """The passes of the old analyze_transactions()."""
+    all_amounts = [t["amount"] for t in transactions]
+    total = sum(all_amounts)
+    learning_expenses = [t for t in transactions if t["category"] == "Learning"]
+    learning_total = sum([t["amount"] for t in learning_expenses])
+    most_expensive = max(transactions, key=lambda t: t["amount"])
+    transactions_with_fee = [{**t, "amount": t["amount"] * 1.05} for t in transactions]
+    fee_total = sum([t["amount"] for t in transactions_with_fee])
+    category_totals = {}
+    for t in transactions:
+        category_totals[t["category"]] = category_totals.get(t["category"], 0.0) + t["amount"]
+    return total, learning_total, most_expensive["amount"], fee_total, category_totals
+
+def column_loop_analysis(table: TransactionTable):
+    """The same passes as dict_analysis(), written as Python loops over the arrays."""
+    learning = table.categories.code_of("Learning")
+    total = sum(table.amounts)
+    learning_total = sum(a for a, c in zip(table.amounts, table.category_codes) if c == learning)
+    most_expensive = max(table.amounts)
+    fee_total = sum([a * 1.05 for a in table.amounts])
+    sums = [0.0] * len(table.categories)
+    for code, amount in zip(table.category_codes, table.amounts):
+        sums[code] += amount
+    return total, learning_total, most_expensive, fee_total, dict(zip(table.categories.values, sums))
+
+def numpy_analysis(analysis: TransactionAnalysis):
+    total = analysis.total()
+    learning_total = analysis.total(analysis.mask(category="Learning"))
+    most_expensive = analysis.largest()
+    fee_total = analysis.scaled_total(1.05)
+    category_totals = {name: group["sum"] for name, group in analysis.group_by("category").items()}
+    return total, learning_total, most_expensive["amount"], fee_total, category_totals
+
+def timed(func, arg, repeat: int = 3):
+    """(result, best seconds over `repeat` runs)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+def same_answers(a, b) -> bool:
+    close = all(abs(x - y) <= 1e-6 * max(1.0, abs(x)) for x, y in zip(a[:4], b[:4]))
+    return close and all(abs(a[4][c] - b[4][c]) <= 1e-6 * max(1.0, abs(a[4][c])) for c in a[4])
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy analysis engine benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--dict-rows", type=int, default=1_000_000,
+                        help="Largest size that is also run as a list of dicts")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        table = build_table(rows)
+        analysis = TransactionAnalysis(table)
+        numpy_result, numpy_s = timed(numpy_analysis, analysis)
+        loop_result, loop_s = timed(column_loop_analysis, table, repeat=1)
+        timings = [("python loops", loop_s, same_answers(loop_result, numpy_result))]
+        if rows <= args.dict_rows:
+            dicts = list(table.to_dicts())
+            dict_result, dict_s = timed(dict_analysis, dicts, repeat=1)
+            timings.insert(0, ("list of dicts", dict_s, same_answers(dict_result, numpy_result)))
+            del dicts
+
+        top_s = timed(lambda a: a.top(10), analysis)[1]
+        vendor_s = timed(lambda a: a.group_by("vendor"), analysis)[1]
+
+        print(f"\n{rows:,} transactions (total, filter, arg-max, fee, group-by)")
+        print(f"{'':<14} | {'seconds':>8} | {'vs numpy':>8} | same answers")
+        print("-" * 50)
+        for name, seconds, same in timings:
+            print(f"{name:<14} | {seconds:>8.3f} | {seconds / numpy_s:>7.1f}x | {'✅' if same else '❌'}")
+        print(f"{'numpy':<14} | {numpy_s:>8.3f} | {1:>7.1f}x |")
+        print(f"extra: top-10 {top_s * 1000:.1f} ms, group by vendor {vendor_s * 1000:.1f} ms")
+        del analysis, table
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Report: list of dicts vs. TransactionTable for memory and summary speed.
+
+Writes a synthetic transactions.json (same fields as day3_expense_tracker.py) to a
+temporary directory, loads it both ways and measures:
+  - memory retained after loading (tracemalloc)
+  - time for a category summary like show_summary()
+
+Usage:
+    python benchmark_transaction_table.py --rows 100000 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from transaction_table import TransactionTable
+
+VENDORS = [f"Vendor {i}" for i in range(500)]
+CATEGORIES = ["Food", "Rent", "Transport", "Learning", "Health", "Networking", "Cinema", "Gym"]
+
+def write_transactions(path: str, rows: int, seed: int = 42):
+    rng = random.Random(seed)
+    records = [
+        {
+            "id": 1760623379631 + i,
+            "vendor": rng.choice(VENDORS),
+            "amount": round(rng.uniform(1, 500), 2),
+            "category": rng.choice(CATEGORIES),
+            "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        }
+        for i in range(rows)
+    ]
+    with open(path, "w") as f:
+        json.dump(records, f)
+
+def measure_load(load):
+    """Returns (result, bytes still allocated after loading, seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = load()
+    seconds = time.perf_counter() - started
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, seconds
+
+def dict_summary(transactions):
+    """The show_summary() aggregation loop."""
+    category_totals = {}
+    for t in transactions:
+        amount = float(t["amount"])
+        category_totals[t["category"]] = category_totals.get(t["category"], 0.0) + amount
+    return category_totals
+
+def best_time(func, arg, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="TransactionTable memory/speed report")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            path = os.path.join(workdir, "transactions.json")
+            write_transactions(path, rows)
+
+            def load_dicts():
+                with open(path) as f:
+                    return json.load(f)
+
+            dicts, dict_bytes, dict_load = measure_load(load_dicts)
+            table, table_bytes, table_load = measure_load(lambda: TransactionTable.load_json(path))
+
+            dict_summary_s = best_time(dict_summary, dicts)
+            table_summary_s = best_time(TransactionTable.category_totals, table)
+            expected, got = dict_summary(dicts), table.category_totals()
+            same = all(abs(expected[c] - got[c]) < 0.01 for c in expected)
+
+            print(f"\n{rows:,} transactions")
+            print(f"{'':<16} | {'memory MB':>10} | {'bytes/row':>9} | {'load s':>7} | {'summary ms':>10}")
+            print("-" * 66)
+            print(f"{'list of dicts':<16} | {dict_bytes / 1e6:>10.1f} | {dict_bytes / rows:>9.0f} | "
+                  f"{dict_load:>7.2f} | {dict_summary_s * 1000:>10.1f}")
+            print(f"{'TransactionTable':<16} | {table_bytes / 1e6:>10.1f} | {table_bytes / rows:>9.0f} | "
+                  f"{table_load:>7.2f} | {table_summary_s * 1000:>10.1f}")
+            print(f"Memory: {dict_bytes / table_bytes:.1f}x smaller, summary: "
+                  f"{dict_summary_s / table_summary_s:.1f}x faster {'✅' if same else '❌ totals differ'}")
+            del dicts, table
+
+if __name__ == "__main__":
+    main()
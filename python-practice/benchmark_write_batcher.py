@@ -0,0 +1,106 @@
+"""Benchmark: group-commit WriteBatcher vs. one commit per insert.
+
+Concurrent writer threads insert expenses into a throw-away database and we record
+how long each caller waited for its write to be durable.
+
+Usage:
+    python benchmark_write_batcher.py --writers 32 --writes 200
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import database
+
+# (max_rows, max_wait_ms) combinations to compare
+# max_wait_ms = 0 means "commit whatever is already queued" (natural batching)
+BATCHER_CONFIGS = [
+    (500, 0.0),
+    (50, 0.5),
+    (200, 2.0),
+    (500, 5.0),
+    (2000, 10.0),
+]
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(values) - 1, max(0, int(round(pct / 100.0 * len(values))) - 1))
+    return values[index]
+
+def run_writers(write_one, writers: int, writes_per_writer: int):
+    """Starts `writers` threads that each call write_one() and returns (seconds, latencies_ms)."""
+    latencies = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(writers + 1)
+
+    def worker(worker_id):
+        local = []
+        start_gate.wait()
+        for i in range(writes_per_writer):
+            started = time.perf_counter()
+            write_one(worker_id, i)
+            local.append((time.perf_counter() - started) * 1000.0)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    start_gate.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, sorted(latencies)
+
+def report(label, seconds, latencies):
+    total = len(latencies)
+    print(f"{label:<30} | {total / seconds:>10.0f} | {statistics.median(latencies):>8.2f} | "
+          f"{percentile(latencies, 99):>8.2f}")
+
+def expense_params(worker_id, i):
+    return ("2025-10-18", 1.0 + (i % 100), f"Category {worker_id % 8}", f"writer {worker_id} #{i}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Group-commit throughput vs. latency benchmark")
+    parser.add_argument("--writers", type=int, default=32, help="Concurrent writer threads")
+    parser.add_argument("--writes", type=int, default=200, help="Writes per writer thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database.DATABASE_NAME = os.path.join(workdir, "benchmark.db")
+        database.initialize_db()
+
+        print(f"\n{args.writers} writers x {args.writes} writes each")
+        print(f"{'Strategy':<30} | {'writes/s':>10} | {'p50 ms':>8} | {'p99 ms':>8}")
+        print("-" * 66)
+
+        # Baseline: every insert is its own fully synced transaction (the old add_expense path)
+        pool = database.get_pool()
+
+        def direct_insert(worker_id, i):
+            with pool.connection() as conn:
+                conn.execute("PRAGMA synchronous = FULL")
+                conn.execute(database.INSERT_EXPENSE_SQL, expense_params(worker_id, i))
+                conn.commit()
+
+        report("commit per insert", *run_writers(direct_insert, args.writers, args.writes))
+
+        for max_rows, max_wait_ms in BATCHER_CONFIGS:
+            batcher = database.WriteBatcher(database.DATABASE_NAME, max_rows=max_rows, max_wait_ms=max_wait_ms)
+
+            def batched_insert(worker_id, i):
+                batcher.submit(database.INSERT_EXPENSE_SQL, expense_params(worker_id, i)).result()
+
+            try:
+                report(f"batcher rows={max_rows} wait={max_wait_ms}ms",
+                       *run_writers(batched_insert, args.writers, args.writes))
+            finally:
+                batcher.close()
+
+        database.close_pool()
+
+if __name__ == "__main__":
+    main()
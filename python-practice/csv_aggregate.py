@@ -0,0 +1,183 @@
+import csv
+import gzip
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# --- Aggregation Settings ---
+# Files smaller than this are summarized in-process: starting worker processes costs more than it saves
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+# Each worker walks its byte range in slices of about this size (bounded memory per worker)
+SLICE_BYTES = 8 * 1024 * 1024
+# Only the first problems are kept (and printed); the rest are just counted
+MAX_REPORTED_PROBLEMS = 100
+
+class RangeResult:
+    """Partial totals for one byte range of the file."""
+
+    def __init__(self):
+        self.totals: Dict[bytes, float] = {}
+        self.problems: List[str] = []
+        self.problem_count = 0
+
+    def report(self, message: str):
+        self.problem_count += 1
+        if len(self.problems) < MAX_REPORTED_PROBLEMS:
+            self.problems.append(message)
+
+    def merge(self, other: "RangeResult"):
+        for category, total in other.totals.items():
+            self.totals[category] = self.totals.get(category, 0.0) + total
+        for message in other.problems:
+            if len(self.problems) < MAX_REPORTED_PROBLEMS:
+                self.problems.append(message)
+        self.problem_count += other.problem_count
+
+def _read_header(path: str) -> Tuple[List[str], int, bytes]:
+    """Returns the column names, the byte offset where the data rows start and the
+    line ending the file uses (csv.writer writes \r\n by default).
+    """
+    with open(path, "rb") as f:
+        header_line = f.readline()
+    header = next(csv.reader([header_line.decode("utf-8-sig").rstrip("\r\n")]), [])
+    line_ending = b"\r\n" if header_line.endswith(b"\r\n") else b"\n"
+    return header, len(header_line), line_ending
+
+def split_ranges(mm, start: int, end: int, parts: int = 1, min_size: int = 1) -> List[Tuple[int, int]]:
+    """Splits mm[start:end] into about `parts` byte ranges (each at least `min_size`
+    bytes) that each end right after a newline.
+    """
+    step = max(min_size, (end - start) // max(parts, 1) + 1)
+    ranges = []
+    while start < end:
+        stop = min(end, start + step)
+        if stop < end:
+            newline = mm.find(b"\n", stop, end)
+            stop = end if newline == -1 else newline + 1
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def aggregate_range(
+    path: str, start: int, end: int, category_col: int, amount_col: int, line_ending: bytes = b"\n"
+) -> RangeResult:
+    """Sums amounts per category for the rows in bytes [start, end) of `path`.
+
+    Most lines are split on commas directly (as bytes) in a tight loop. Lines with
+    a quote character, and lines that fail to parse, take the slow path through
+    the csv module so quoted commas are handled correctly and problems are reported.
+    Note: quoted fields that contain a newline are not supported (every line is
+    treated as a row of its own).
+    """
+    result = RangeResult()
+    totals = result.totals
+    needed = max(category_col, amount_col) + 1
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for slice_start, slice_end in split_ranges(mm, start, end, min_size=SLICE_BYTES):
+            slow_lines = []
+            for line in mm[slice_start:slice_end].split(line_ending):
+                if b'"' in line:
+                    slow_lines.append(line)
+                    continue
+                fields = line.split(b",", needed)
+                try:
+                    # float() accepts bytes
+                    amount = float(fields[amount_col])
+                    category = fields[category_col]
+                except (ValueError, IndexError):
+                    slow_lines.append(line)
+                    continue
+                totals[category] = totals.get(category, 0.0) + amount
+
+            if slow_lines:
+                _aggregate_slow_lines(result, slow_lines, category_col, amount_col, needed)
+
+    return result
+
+def _aggregate_slow_lines(result: RangeResult, lines: List[bytes], category_col: int, amount_col: int, needed: int):
+    """Parses the leftover lines with the csv module and reports the ones that are malformed."""
+    text_lines = [line.decode("utf-8", "replace").rstrip("\r") for line in lines]
+    _aggregate_rows(result, csv.reader(text_lines), category_col, amount_col, needed)
+
+def _aggregate_rows(result: RangeResult, rows, category_col: int, amount_col: int, needed: int):
+    """Adds parsed CSV rows to `result`, reporting the malformed ones."""
+    for row in rows:
+        if not row or row == [""]:
+            continue
+        if len(row) < needed:
+            result.report(f"⚠️ Skipping row: Missing column (row: {','.join(row)[:80]})")
+            continue
+        try:
+            amount = float(row[amount_col])
+        except ValueError:
+            result.report(f"⚠️ Skipping row due to invalid amount: {row[amount_col]}")
+            continue
+        category = row[category_col].encode("utf-8")
+        result.totals[category] = result.totals.get(category, 0.0) + amount
+
+def aggregate_csv(
+    path: str,
+    category_column: str = "category",
+    amount_column: str = "amount",
+    workers: Optional[int] = None,
+) -> Tuple[Dict[str, float], List[str], int]:
+    """Totals `amount_column` per `category_column` over a CSV file.
+
+    The file is memory-mapped and cut into newline-aligned byte ranges that worker
+    processes aggregate independently; their partial totals are merged at the end.
+    Returns (totals, first_problems, problem_count).
+    Raises KeyError when a column is missing from the header.
+    """
+    header, data_start, line_ending = _read_header(path)
+    category_col = header.index(category_column) if category_column in header else None
+    amount_col = header.index(amount_column) if amount_column in header else None
+    if category_col is None or amount_col is None:
+        raise KeyError(category_column if category_col is None else amount_column)
+
+    size = os.path.getsize(path)
+    workers = workers or os.cpu_count() or 1
+    merged = RangeResult()
+
+    if size <= data_start:
+        return {}, [], 0
+
+    if workers == 1 or size < PARALLEL_MIN_BYTES:
+        merged.merge(aggregate_range(path, data_start, size, category_col, amount_col, line_ending))
+    else:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = split_ranges(mm, data_start, size, parts=workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(aggregate_range, path, start, end, category_col, amount_col, line_ending)
+                for start, end in ranges
+            ]
+            # Merge in file order so problems are reported in the order they appear
+            for future in futures:
+                merged.merge(future.result())
+
+    totals = {category.decode("utf-8", "replace"): total for category, total in merged.totals.items()}
+    return totals, merged.problems, merged.problem_count
+
+def aggregate_csv_gzip(
+    path: str,
+    category_column: str = "category",
+    amount_column: str = "amount",
+) -> Tuple[Dict[str, float], List[str], int]:
+    """aggregate_csv() for a .csv.gz file, with the same return value and errors.
+
+    A gzip stream can only be read from the start, so it is decompressed on the fly
+    and summed in this one process (no memory map, no workers).
+    """
+    result = RangeResult()
+    with gzip.open(path, "rt", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if category_column not in header or amount_column not in header:
+            raise KeyError(category_column if category_column not in header else amount_column)
+        category_col, amount_col = header.index(category_column), header.index(amount_column)
+        _aggregate_rows(result, reader, category_col, amount_col, max(category_col, amount_col) + 1)
+
+    totals = {category.decode("utf-8", "replace"): total for category, total in result.totals.items()}
+    return totals, result.problems, result.problem_count
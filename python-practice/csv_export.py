@@ -0,0 +1,147 @@
+import csv
+import io
+import itertools
+import os
+import zlib
+from typing import Callable, Iterable, Iterator, List, Optional
+
+# --- Export Settings ---
+EXPORT_CHUNK_SIZE = 5000    # Rows fetched from SQLite (and written out) at a time
+GZIP_LEVEL = 6              # zlib compression level for .csv.gz output
+
+def iter_csv_chunks(
+    cursor,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    include_header: bool = True,
+    on_chunk: Optional[Callable[[List[tuple]], None]] = None,
+) -> Iterator[str]:
+    """Turns an executed cursor into CSV text, one chunk of rows at a time.
+
+    Only `chunk_size` rows are ever held in memory (fetchmany instead of fetchall),
+    so this works the same for 100 rows or 100 million. The header comes from
+    cursor.description. `on_chunk` is called with each batch of rows, e.g. to count
+    them or remember the last id.
+    """
+    header = [column[0] for column in cursor.description]
+    row_chunks = iter(lambda: cursor.fetchmany(chunk_size), [])
+    return iter_csv_rows(header, row_chunks, include_header=include_header, on_chunk=on_chunk)
+
+def iter_csv_rows(
+    header: List[str],
+    row_chunks: Iterable[List[tuple]],
+    include_header: bool = True,
+    on_chunk: Optional[Callable[[List[tuple]], None]] = None,
+) -> Iterator[str]:
+    """Like iter_csv_chunks(), for rows that arrive in batches from anywhere (one CSV chunk per batch)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if include_header:
+        writer.writerow(header)
+
+    for rows in row_chunks:
+        if not rows:
+            continue
+        writer.writerows(rows)
+        if on_chunk is not None:
+            on_chunk(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    # Header of an empty result
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def iter_gzip(chunks: Iterable[str], level: int = GZIP_LEVEL) -> Iterator[bytes]:
+    """Compresses text chunks into one gzip stream without buffering all of it."""
+    # wbits=31 asks zlib for the gzip container (header + CRC) instead of raw deflate
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def write_csv_file(chunks: Iterable[str], path: str, compress: bool = False, append: bool = False):
+    """Writes CSV chunks to `path` (gzip-compressed if `compress`).
+
+    A full export goes to a temporary file that replaces `path` only once it is
+    complete, so a failed export never leaves a half-written file behind. With
+    `append`, the chunks are added to the end of the existing file instead (for
+    gzip this adds a new member, which gzip readers treat as one continuous file).
+    An append with no chunks at all leaves the file untouched.
+
+    The watermark of `path` must only ever describe rows that are really in it:
+    a full export deletes the old watermark before the rename (the caller saves the
+    new one afterwards), and an interrupted append is cut off again by read_watermark().
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None and append:
+        # Nothing new: don't add an empty gzip member (or touch the file at all)
+        return
+    if first is not None:
+        chunks = itertools.chain([first], chunks)
+
+    target = path if append else path + ".tmp"
+    try:
+        if compress:
+            with open(target, "ab" if append else "wb") as f:
+                for data in iter_gzip(chunks):
+                    f.write(data)
+        else:
+            with open(target, "a" if append else "w", newline="", encoding="utf-8") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+    except Exception:
+        if not append and os.path.exists(target):
+            os.remove(target)
+        raise
+    if not append:
+        # Crashing between these two steps leaves no watermark, so the next
+        # incremental export falls back to a full one instead of skipping rows
+        if os.path.exists(watermark_path(path)):
+            os.remove(watermark_path(path))
+        os.replace(target, path)
+
+# --- Incremental Export Watermarks ---
+
+def watermark_path(export_path: str) -> str:
+    """The small file next to an export that remembers the last exported id
+    and how many bytes of the export those rows fill ("<last id> <size>").
+    """
+    return export_path + ".watermark"
+
+def read_watermark(export_path: str) -> Optional[int]:
+    """Last id written to `export_path`, or None when the export or its watermark is
+    missing or doesn't match the file (then only a full export is safe).
+
+    Appended rows only count once save_watermark() has recorded them. If the export
+    is longer than the watermark says, an append was interrupted before that: the
+    extra bytes are cut off so those rows are exported again, not duplicated.
+    """
+    if not os.path.exists(export_path):
+        return None
+    try:
+        with open(watermark_path(export_path), "r", encoding="utf-8") as f:
+            fields = f.read().split()
+        last_id = int(fields[0])
+        size = int(fields[1]) if len(fields) > 1 else None   # Older watermarks hold only the id
+    except (OSError, ValueError, IndexError):
+        return None
+
+    if size is not None:
+        actual_size = os.path.getsize(export_path)
+        if actual_size < size:
+            return None
+        if actual_size > size:
+            with open(export_path, "r+b") as f:
+                f.truncate(size)
+    return last_id
+
+def save_watermark(export_path: str, last_id: int):
+    """Records `last_id` and the current size of `export_path` (atomically)."""
+    temp_path = watermark_path(export_path) + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(f"{last_id} {os.path.getsize(export_path)}")
+    os.replace(temp_path, watermark_path(export_path))
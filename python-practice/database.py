@@ -1,86 +1,1235 @@
 import sqlite3
-from typing import List, Dict, Any
+import argparse
+import base64
+import json
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, List, Dict, Any, Optional, Tuple
+
+import metrics
+from csv_export import EXPORT_CHUNK_SIZE, iter_csv_rows, iter_gzip
 
 DATABASE_NAME = "expense_tracker.db"
 
-def get_db_connection():
-    """Establishes and returns a connection to the SQLite database."""
-    conn = sqlite3.connect(DATABASE_NAME)
+# --- Connection Pool Settings ---
+POOL_SIZE = 8               # Maximum number of open connections kept by the pool
+POOL_TIMEOUT = 10.0         # Seconds to wait for a free connection before giving up
+CACHED_STATEMENTS = 256     # Prepared statements cached per connection
+
+# PRAGMAs applied to every new connection.
+# WAL lets readers run while a writer commits, and synchronous=NORMAL is safe in WAL mode.
+CONNECTION_PRAGMAS = (
+    # Only takes effect for a brand-new file (see db_maintenance.py); must come before journal_mode
+    "PRAGMA auto_vacuum = INCREMENTAL",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -20000",       # Negative value = size in KiB (about 20 MB)
+    "PRAGMA mmap_size = 268435456",     # Memory-map up to 256 MB of the file
+    "PRAGMA temp_store = MEMORY",
+)
+
+# --- Pagination Settings ---
+PAGE_SIZE_DEFAULT = 50
+PAGE_SIZE_MAX = 500
+
+# Column names (already aliased to the API's field names) of rows returned by get_expenses_page()
+EXPENSE_COLUMNS = ("expense_id", "expense_date", "amount", "category", "description")
+
+# --- Bulk Insert Settings ---
+BULK_CHUNK_SIZE = 20000     # Rows written per transaction by the bulk endpoint. The derived-table
+                            # upserts cost about the same per chunk whatever its size, so bigger
+                            # chunks are faster; each one holds the write lock for ~0.4 s.
+
+# --- Group-Commit Write Batcher Settings ---
+BATCH_MAX_ROWS = 500        # Commit as soon as this many writes are waiting...
+BATCH_MAX_WAIT_MS = 0.0     # ...or this long after the first write of a batch arrived.
+                            # 0 = commit whatever queued up during the previous commit
+                            # (see benchmark_write_batcher.py for the trade-off)
+BATCH_QUEUE_DEPTH = 10000   # Callers block (back-pressure) when this many writes are queued
+
+INSERT_EXPENSE_SQL = "INSERT INTO expenses (date, amount, category, description) VALUES (?, ?, ?, ?)"
+
+# --- Data Version ---
+# A counter stored IN the database and bumped by triggers on every insert, update and
+# delete of an expense, so the API's ETags change no matter who wrote: this process,
+# another worker, the CLI or an import. The epoch is random per database file, so a
+# restored or re-created database never repeats an old version.
+DATA_VERSION_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        epoch TEXT NOT NULL,
+        version INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO data_version (id, epoch, version) VALUES (1, lower(hex(randomblob(4))), 0)",
+    "DROP TRIGGER IF EXISTS trg_data_version_insert",
+    "CREATE TRIGGER trg_data_version_insert AFTER INSERT ON expenses BEGIN UPDATE data_version SET version = version + 1; END",
+    "DROP TRIGGER IF EXISTS trg_data_version_update",
+    "CREATE TRIGGER trg_data_version_update AFTER UPDATE ON expenses BEGIN UPDATE data_version SET version = version + 1; END",
+    "DROP TRIGGER IF EXISTS trg_data_version_delete",
+    "CREATE TRIGGER trg_data_version_delete AFTER DELETE ON expenses BEGIN UPDATE data_version SET version = version + 1; END",
+)
+
+def bump_data_version(conn: sqlite3.Connection):
+    """Marks the data as changed inside the caller's transaction.
+
+    Only needed for writes the triggers can't see: bulk loads (which suspend them)
+    and rebuilds of the derived tables.
+    """
+    conn.execute("UPDATE data_version SET version = version + 1")
+
+def get_data_version() -> str:
+    """Returns a token that changes whenever the expenses (or their derived tables) change."""
+    with get_pool().connection() as conn:
+        row = conn.execute("SELECT epoch, version FROM data_version").fetchone()
+    return f"{row[0]}-{row[1]}"
+
+# --- Instrumented Connections (see metrics.py) ---
+
+class _TimedCursor(sqlite3.Cursor):
+    """A cursor that reports execute and fetch time to the metrics registry."""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            metrics.observe_db("execute", started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            metrics.observe_db("execute", started)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            metrics.observe_db("fetch", started)
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            metrics.observe_db("fetch", started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            metrics.observe_db("fetch", started)
+
+class _TimedConnection(sqlite3.Connection):
+    """A connection whose cursors, execute shortcuts and commits are timed."""
+
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    # The C implementations of these shortcuts would bypass cursor(), so route them through it
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            metrics.observe_db("commit", started)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # 'with conn:' commits (or rolls back) here without going through commit()
+        started = time.perf_counter()
+        try:
+            return super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            metrics.observe_db("commit" if exc_type is None else "rollback", started)
+
+def _open_connection(database: str) -> sqlite3.Connection:
+    """Opens a tuned connection that can be shared between threads (one thread at a time)."""
+    instrumented = metrics.REGISTRY.enabled
+    started = time.perf_counter()
+    conn = sqlite3.connect(
+        database,
+        timeout=POOL_TIMEOUT,
+        check_same_thread=False,
+        cached_statements=CACHED_STATEMENTS,
+        factory=_TimedConnection if instrumented else sqlite3.Connection,
+    )
     # Set row_factory to sqlite3.Row so we can access columns by name
     conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    if instrumented:
+        metrics.observe_db("connect", started)
     return conn
 
+class ConnectionPool:
+    """A bounded pool of long-lived SQLite connections.
+
+    Connections are created lazily up to `size` and handed back after each use,
+    so the connect cost, the PRAGMA setup and the statement cache are paid only once.
+    """
+
+    def __init__(self, database: str = DATABASE_NAME, size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT):
+        self.database = database
+        self.size = size
+        self.timeout = timeout
+        # LIFO keeps the most recently used (warmest) connection at the front
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    def acquire(self) -> sqlite3.Connection:
+        """Borrows a connection, opening a new one if the pool is not full yet."""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return _open_connection(self.database)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        # Pool is saturated: wait for another request to give a connection back
+        started = time.perf_counter()
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection available after {self.timeout} seconds")
+        finally:
+            if metrics.REGISTRY.enabled:
+                metrics.observe_db("pool_wait", started)
+
+    @property
+    def in_use(self) -> int:
+        """Number of connections currently borrowed."""
+        return self._created - self._idle.qsize()
+
+    def release(self, conn: sqlite3.Connection):
+        """Returns a connection to the pool (or closes it if the pool was shut down)."""
+        if conn.in_transaction:
+            # Never hand out a connection with a half-finished transaction
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        """Context manager: `with pool.connection() as conn: ...`"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Closes every idle connection. Borrowed connections are closed when released."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+_STOP = object()  # Sentinel that tells the writer thread to finish
+
+class WriteBatcher:
+    """Group commit: one writer thread turns many small writes into few transactions.
+
+    Callers `submit()` a statement and get a Future back. The writer thread collects
+    writes for up to `max_wait_ms` (or until `max_rows` are waiting), runs them all in
+    one transaction and resolves each Future with its row id once the commit is on disk.
+    `on_commit`, if given, is called after every committed batch (before the Futures resolve).
+    `connect` opens the writer's connection; by default it is the expense database's
+    own (tuned, instrumented) _open_connection.
+    If the writer thread dies (e.g. the database can't be opened), every waiting and
+    later write fails with that error instead of hanging.
+    """
+
+    def __init__(
+        self,
+        database: str = DATABASE_NAME,
+        max_rows: int = BATCH_MAX_ROWS,
+        max_wait_ms: float = BATCH_MAX_WAIT_MS,
+        queue_depth: int = BATCH_QUEUE_DEPTH,
+        on_commit: Optional[Callable[[], None]] = None,
+        connect: Optional[Callable[[str], sqlite3.Connection]] = None,
+    ):
+        self.database = database
+        self.on_commit = on_commit
+        self._connect = connect or _open_connection
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue(maxsize=queue_depth)
+        self._closed = False
+        self._failure: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="write-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, sql: str, params: tuple) -> Future:
+        """Queues one write. The returned Future resolves to the new row id after commit."""
+        if self._closed:
+            raise RuntimeError("Write batcher is closed")
+        if self._failure is not None:
+            raise RuntimeError(f"Write batcher stopped: {self._failure}") from self._failure
+        future = Future()
+        self._queue.put((sql, params, future))
+        if self._failure is not None:
+            # The writer died while this write was being queued
+            self._fail_pending()
+        return future
+
+    def close(self):
+        """Commits everything still queued, then stops the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect_batch(self, first) -> Tuple[list, bool]:
+        """Gathers writes that arrive shortly after `first`. Returns (batch, stop_requested)."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_rows:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    # Time is up, but still take whatever is already waiting
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: list):
+        outcomes = []
+        try:
+            for sql, params, future in batch:
+                try:
+                    cursor = conn.execute(sql, params)
+                    outcomes.append((future, cursor.lastrowid, None))
+                except sqlite3.Error as e:
+                    if not conn.in_transaction:
+                        # Some errors (disk full, I/O errors, RAISE(ROLLBACK) ...) roll back the
+                        # WHOLE transaction: the writes before this one are gone too
+                        raise
+                    # Otherwise only the failing statement is undone; the rest of the batch continues
+                    outcomes.append((future, None, e))
+            conn.commit()
+        except Exception as e:
+            print(f"Error committing write batch: {e}")
+            if conn.in_transaction:
+                conn.rollback()
+            # Nothing of this batch was committed, so no write may report success
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        if self.on_commit is not None:
+            try:
+                self.on_commit()
+            except Exception as e:
+                print(f"Error in write batch on_commit hook: {e}")
+
+        for future, row_id, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(row_id)
+
+    def _fail_pending(self, batch: Optional[list] = None):
+        """Fails `batch` and everything still queued with the writer's error."""
+        error = RuntimeError(f"Write batcher stopped: {self._failure}")
+        pending = list(batch or [])
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                pending.append(item)
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    def _run(self):
+        conn = None
+        batch = []
+        try:
+            conn = self._connect(self.database)
+            # Each group commit is fully synced, so a resolved Future really means "on disk"
+            conn.execute("PRAGMA synchronous = FULL")
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                batch, stop = self._collect_batch(item)
+                self._commit_batch(conn, batch)
+                if stop:
+                    break
+        except BaseException as e:
+            print(f"Write batcher stopped: {e}")
+            self._failure = e
+            self._fail_pending(batch)
+        finally:
+            if conn is not None:
+                conn.close()
+
+_pool = None
+_pool_lock = threading.Lock()
+_write_batcher = None
+
+def get_pool() -> ConnectionPool:
+    """Returns the shared connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DATABASE_NAME)
+    return _pool
+
+def close_pool():
+    """Closes the shared connection pool (called when the API shuts down)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+def get_write_batcher() -> WriteBatcher:
+    """Returns the shared write batcher, starting its writer thread on first use
+    (and again after a writer thread died, so a later request can recover)."""
+    global _write_batcher
+    batcher = _write_batcher
+    if batcher is None or batcher._failure is not None:
+        with _pool_lock:
+            if _write_batcher is batcher:
+                _write_batcher = WriteBatcher(DATABASE_NAME)
+    return _write_batcher
+
+def close_write_batcher():
+    """Flushes pending writes and stops the shared write batcher."""
+    global _write_batcher
+    with _pool_lock:
+        batcher, _write_batcher = _write_batcher, None
+    if batcher is not None:
+        batcher.close()
+
+# Pool and write-queue gauges, read whenever /metrics is scraped
+metrics.REGISTRY.gauge("expense_db_pool_size", "Maximum connections in the pool",
+                       lambda: _pool.size if _pool else POOL_SIZE)
+metrics.REGISTRY.gauge("expense_db_pool_connections_open", "Connections currently open",
+                       lambda: _pool._created if _pool else 0)
+metrics.REGISTRY.gauge("expense_db_pool_connections_in_use", "Connections currently borrowed",
+                       lambda: _pool.in_use if _pool else 0)
+metrics.REGISTRY.gauge("expense_db_write_queue_depth", "Writes waiting for the group-commit batcher",
+                       lambda: _write_batcher._queue.qsize() if _write_batcher else 0)
+
+def get_db_connection():
+    """Establishes and returns a new, standalone connection to the SQLite database.
+
+    Prefer `get_pool().connection()` for request handling; this is kept for scripts
+    that want a connection of their own.
+    """
+    return _open_connection(DATABASE_NAME)
+
+# --- Bulk Loads ---
+# add_expenses_bulk() drops these per-row INSERT triggers INSIDE its own transaction
+# (DDL is transactional in SQLite, so no other connection ever sees them missing),
+# inserts a whole chunk, applies the derived-table changes for the chunk in a few
+# set-based statements, and re-creates the triggers before the commit.
+BULK_SUSPENDED_TRIGGERS = (
+    "trg_category_totals_insert", "trg_spend_rollups_insert", "trg_expenses_fts_insert", "trg_data_version_insert",
+)
+
+@contextmanager
+def suspended_insert_triggers(conn: sqlite3.Connection):
+    """Starts a write transaction with the INSERT triggers dropped; re-creates them on exit.
+
+    The caller commits (or rolls back, which brings the triggers back as well).
+    """
+    conn.execute("BEGIN IMMEDIATE")  # sqlite3 does not open a transaction before DDL by itself
+    placeholders = ", ".join("?" * len(BULK_SUSPENDED_TRIGGERS))
+    saved = conn.execute(
+        f"SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})",
+        BULK_SUSPENDED_TRIGGERS,
+    ).fetchall()
+    for name, _ in saved:
+        conn.execute(f"DROP TRIGGER {name}")
+    yield
+    for _, sql in saved:
+        conn.execute(sql)
+
+# --- Materialized Category Totals ---
+# 'category_totals' holds one row per category and is kept current by triggers,
+# so GET /summary never has to scan the whole 'expenses' table.
+# Triggers are dropped and re-created on every start so definition changes take effect.
+CATEGORY_TOTALS_SCHEMA = (
+    # Left behind by older versions, which skipped the triggers with a flag row instead
+    "DROP TABLE IF EXISTS bulk_load_guard",
+    """
+    CREATE TABLE IF NOT EXISTS category_totals (
+        category TEXT PRIMARY KEY,
+        expense_count INTEGER NOT NULL,
+        total_spent REAL NOT NULL,
+        min_amount REAL NOT NULL,
+        max_amount REAL NOT NULL
+    )
+    """,
+    "DROP TRIGGER IF EXISTS trg_category_totals_insert",
+    """
+    CREATE TRIGGER trg_category_totals_insert
+    AFTER INSERT ON expenses
+    BEGIN
+        INSERT INTO category_totals (category, expense_count, total_spent, min_amount, max_amount)
+        VALUES (NEW.category, 1, NEW.amount, NEW.amount, NEW.amount)
+        ON CONFLICT (category) DO UPDATE SET
+            expense_count = expense_count + 1,
+            total_spent = total_spent + excluded.total_spent,
+            min_amount = MIN(min_amount, excluded.min_amount),
+            max_amount = MAX(max_amount, excluded.max_amount);
+    END
+    """,
+    # Removing a row cannot shrink MIN/MAX incrementally, so only when the removed
+    # amount WAS the min or max do we look it up again (via the category index).
+    "DROP TRIGGER IF EXISTS trg_category_totals_delete",
+    """
+    CREATE TRIGGER trg_category_totals_delete
+    AFTER DELETE ON expenses
+    BEGIN
+        UPDATE category_totals SET
+            expense_count = expense_count - 1,
+            total_spent = total_spent - OLD.amount,
+            min_amount = CASE WHEN OLD.amount <= min_amount
+                THEN COALESCE((SELECT MIN(amount) FROM expenses WHERE category = OLD.category), min_amount)
+                ELSE min_amount END,
+            max_amount = CASE WHEN OLD.amount >= max_amount
+                THEN COALESCE((SELECT MAX(amount) FROM expenses WHERE category = OLD.category), max_amount)
+                ELSE max_amount END
+        WHERE category = OLD.category;
+        DELETE FROM category_totals WHERE category = OLD.category AND expense_count <= 0;
+    END
+    """,
+    # An update is handled as "remove the old row, add the new row"
+    "DROP TRIGGER IF EXISTS trg_category_totals_update",
+    """
+    CREATE TRIGGER trg_category_totals_update
+    AFTER UPDATE OF amount, category ON expenses
+    BEGIN
+        UPDATE category_totals SET
+            expense_count = expense_count - 1,
+            total_spent = total_spent - OLD.amount,
+            min_amount = CASE WHEN OLD.amount <= min_amount
+                THEN COALESCE((SELECT MIN(amount) FROM expenses WHERE category = OLD.category), min_amount)
+                ELSE min_amount END,
+            max_amount = CASE WHEN OLD.amount >= max_amount
+                THEN COALESCE((SELECT MAX(amount) FROM expenses WHERE category = OLD.category), max_amount)
+                ELSE max_amount END
+        WHERE category = OLD.category;
+        DELETE FROM category_totals WHERE category = OLD.category AND expense_count <= 0;
+        INSERT INTO category_totals (category, expense_count, total_spent, min_amount, max_amount)
+        VALUES (NEW.category, 1, NEW.amount, NEW.amount, NEW.amount)
+        ON CONFLICT (category) DO UPDATE SET
+            expense_count = expense_count + 1,
+            total_spent = total_spent + excluded.total_spent,
+            min_amount = MIN(min_amount, excluded.min_amount),
+            max_amount = MAX(max_amount, excluded.max_amount);
+    END
+    """,
+)
+
+# Floating-point sums drift slightly when maintained incrementally
+TOTALS_TOLERANCE = 1e-6
+
+# --- Time-Bucketed Spend Rollups ---
+# 'spend_rollups' holds count and total per (granularity, bucket, category), where the
+# bucket is the day itself, the Monday of its week, or the first day of its month.
+ROLLUP_GRANULARITIES = ("day", "week", "month")
+
+# SQL that turns a YYYY-MM-DD value into the bucket key for each granularity
+ROLLUP_BUCKET_SQL = {
+    "day": "date({d})",
+    "week": "date({d}, 'weekday 0', '-6 days')",
+    "month": "strftime('%Y-%m-01', {d})",
+}
+
+# How to read the expense date from a row; `{row}` is NEW/OLD inside triggers.
+# The API database has a 'date' column; the CLI database (expenses.db) only has an ISO 'timestamp'.
+DATE_COLUMN_SQL = "{row}.date"
+TIMESTAMP_COLUMN_SQL = "substr({row}.timestamp, 1, 10)"
+
+def _rollup_buckets_sql(date_sql: str) -> str:
+    """A 3-row SELECT giving (granularity, bucket) for one expense date."""
+    return " UNION ALL ".join(
+        # Fall back to the raw text so an unparseable date can never block an insert
+        f"SELECT '{granularity}' AS granularity, COALESCE({ROLLUP_BUCKET_SQL[granularity].format(d=date_sql)}, {date_sql}) AS bucket"
+        for granularity in ROLLUP_GRANULARITIES
+    )
+
+def _rollup_schema(date_template: str) -> List[str]:
+    """Builds the rollup table and its triggers for a table whose date is read with `date_template`."""
+    new_date = date_template.format(row="NEW")
+    old_date = date_template.format(row="OLD")
+    add_new = f"""
+        INSERT INTO spend_rollups (granularity, bucket, category, expense_count, total_spent)
+        SELECT buckets.granularity, buckets.bucket, NEW.category, 1, NEW.amount
+        FROM ({_rollup_buckets_sql(new_date)}) AS buckets
+        WHERE true
+        ON CONFLICT (granularity, bucket, category) DO UPDATE SET
+            expense_count = expense_count + 1,
+            total_spent = total_spent + excluded.total_spent;
+    """
+    remove_old = f"""
+        UPDATE spend_rollups SET
+            expense_count = expense_count - 1,
+            total_spent = total_spent - OLD.amount
+        WHERE category = OLD.category
+          AND (granularity, bucket) IN ({_rollup_buckets_sql(old_date)});
+        DELETE FROM spend_rollups
+        WHERE category = OLD.category AND expense_count <= 0;
+    """
+    date_columns = "date" if date_template == DATE_COLUMN_SQL else "timestamp"
+    return [
+        """
+        CREATE TABLE IF NOT EXISTS spend_rollups (
+            granularity TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            category TEXT NOT NULL,
+            expense_count INTEGER NOT NULL,
+            total_spent REAL NOT NULL,
+            PRIMARY KEY (granularity, bucket, category)
+        ) WITHOUT ROWID
+        """,
+        "DROP TRIGGER IF EXISTS trg_spend_rollups_insert",
+        f"CREATE TRIGGER trg_spend_rollups_insert AFTER INSERT ON expenses BEGIN {add_new} END",
+        "DROP TRIGGER IF EXISTS trg_spend_rollups_delete",
+        f"CREATE TRIGGER trg_spend_rollups_delete AFTER DELETE ON expenses BEGIN {remove_old} END",
+        "DROP TRIGGER IF EXISTS trg_spend_rollups_update",
+        f"CREATE TRIGGER trg_spend_rollups_update AFTER UPDATE OF {date_columns}, amount, category "
+        f"ON expenses BEGIN {remove_old} {add_new} END",
+    ]
+
+# --- Full-Text Search ---
+# An external-content FTS5 index over description and category: the text lives only in
+# 'expenses', FTS5 stores just the inverted index. prefix='2 3' pre-builds short prefixes
+# so autocomplete-style queries ("din*") stay fast.
+SEARCH_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS expenses_fts USING fts5(
+        description,
+        category,
+        content = 'expenses',
+        content_rowid = 'id',
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    "DROP TRIGGER IF EXISTS trg_expenses_fts_insert",
+    """
+    CREATE TRIGGER trg_expenses_fts_insert
+    AFTER INSERT ON expenses
+    BEGIN
+        INSERT INTO expenses_fts (rowid, description, category)
+        VALUES (NEW.id, NEW.description, NEW.category);
+    END
+    """,
+    "DROP TRIGGER IF EXISTS trg_expenses_fts_delete",
+    """
+    CREATE TRIGGER trg_expenses_fts_delete
+    AFTER DELETE ON expenses
+    BEGIN
+        INSERT INTO expenses_fts (expenses_fts, rowid, description, category)
+        VALUES ('delete', OLD.id, OLD.description, OLD.category);
+    END
+    """,
+    "DROP TRIGGER IF EXISTS trg_expenses_fts_update",
+    """
+    CREATE TRIGGER trg_expenses_fts_update
+    AFTER UPDATE OF description, category ON expenses
+    BEGIN
+        INSERT INTO expenses_fts (expenses_fts, rowid, description, category)
+        VALUES ('delete', OLD.id, OLD.description, OLD.category);
+        INSERT INTO expenses_fts (rowid, description, category)
+        VALUES (NEW.id, NEW.description, NEW.category);
+    END
+    """,
+)
+
+SEARCH_PAGE_SIZE_DEFAULT = 20
+
+def build_search_query(text: str) -> str:
+    """Turns what a user typed into a safe FTS5 MATCH expression.
+
+    - words are matched as whole terms:        dinner cafe
+    - a trailing * makes a prefix search:      din*
+    - double quotes make a phrase search:      "office cafe"
+    Every term is quoted, so characters like '-' or ':' can't break the query syntax.
+    """
+    parts = []
+    for match in re.finditer(r'"([^"]*)"|(\S+)', text):
+        phrase, word = match.groups()
+        if phrase is not None:
+            if phrase.strip():
+                parts.append('"' + phrase.replace('"', '""') + '"')
+            continue
+        is_prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            parts.append('"' + word.replace('"', '""') + '"' + ("*" if is_prefix else ""))
+    if not parts:
+        raise ValueError("Search query is empty")
+    return " ".join(parts)
+
+def _apply_bulk_deltas(conn: sqlite3.Connection, after_id: int):
+    """Adds a chunk of inserted rows to the derived tables (the suspended INSERT triggers' job).
+
+    The new rows are exactly those past the previous highest id, so each derived
+    table gets one grouped statement over `id > after_id` (a range scan of the
+    primary key) instead of one trigger run per row.
+    """
+    conn.execute("""
+        INSERT INTO category_totals (category, expense_count, total_spent, min_amount, max_amount)
+        SELECT category, COUNT(*), SUM(amount), MIN(amount), MAX(amount)
+        FROM expenses WHERE id > ?
+        GROUP BY category
+        ON CONFLICT (category) DO UPDATE SET
+            expense_count = expense_count + excluded.expense_count,
+            total_spent = total_spent + excluded.total_spent,
+            min_amount = MIN(min_amount, excluded.min_amount),
+            max_amount = MAX(max_amount, excluded.max_amount)
+    """, (after_id,))
+
+    # The chunk is grouped by (date, category) once; every granularity then
+    # re-buckets those few groups instead of the rows themselves.
+    buckets = " UNION ALL ".join(
+        f"SELECT '{granularity}' AS granularity, COALESCE({ROLLUP_BUCKET_SQL[granularity].format(d='day')}, day) AS bucket, "
+        f"category, expense_count, total_spent FROM days"
+        for granularity in ROLLUP_GRANULARITIES
+    )
+    conn.execute(f"""
+        WITH days AS MATERIALIZED (
+            SELECT date AS day, category, COUNT(*) AS expense_count, SUM(amount) AS total_spent
+            FROM expenses WHERE id > ?
+            GROUP BY date, category
+        )
+        INSERT INTO spend_rollups (granularity, bucket, category, expense_count, total_spent)
+        SELECT granularity, bucket, category, SUM(expense_count), SUM(total_spent)
+        FROM ({buckets})
+        GROUP BY granularity, bucket, category
+        ON CONFLICT (granularity, bucket, category) DO UPDATE SET
+            expense_count = expense_count + excluded.expense_count,
+            total_spent = total_spent + excluded.total_spent
+    """, (after_id,))
+
+    conn.execute("""
+        INSERT INTO expenses_fts (rowid, description, category)
+        SELECT id, description, category FROM expenses WHERE id > ?
+    """, (after_id,))
+
+def _rebuild_rollups(conn: sqlite3.Connection, date_template: str):
+    """Recomputes 'spend_rollups' from the expenses table (caller commits)."""
+    expense_date = date_template.format(row="expenses")
+    conn.execute("DELETE FROM spend_rollups")
+    for granularity in ROLLUP_GRANULARITIES:
+        bucket = ROLLUP_BUCKET_SQL[granularity].format(d=expense_date)
+        conn.execute(f"""
+            INSERT INTO spend_rollups (granularity, bucket, category, expense_count, total_spent)
+            SELECT ?, COALESCE({bucket}, {expense_date}), category, COUNT(*), SUM(amount)
+            FROM expenses
+            GROUP BY 2, category
+        """, (granularity,))
+
 def initialize_db():
     """Initializes the database by creating the 'expenses' table if it doesn't exist."""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS expenses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT NOT NULL,
-                amount REAL NOT NULL,
-                category TEXT NOT NULL,
-                description TEXT
-            )
-        """)
-        conn.commit()
-    except Exception as e:
-        print(f"Error initializing database: {e}")
-    finally:
-        conn.close()
+    with get_pool().connection() as conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS expenses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date TEXT NOT NULL,
+                    amount REAL NOT NULL,
+                    category TEXT NOT NULL,
+                    description TEXT
+                )
+            """)
+            # Composite indexes for keyset pagination on (date, id).
+            # 'amount' is included so min_amount can be checked without visiting the table.
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_expenses_date_id_amount
+                ON expenses (date, id, amount)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_expenses_category_date_id_amount
+                ON expenses (category, date, id, amount)
+            """)
+            has_totals = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'category_totals'"
+            ).fetchone() is not None
+            for statement in CATEGORY_TOTALS_SCHEMA:
+                cursor.execute(statement)
+            if not has_totals:
+                # First run on an existing database: fill the table from the rows already there
+                _rebuild_category_totals(conn)
+            has_rollups = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'spend_rollups'"
+            ).fetchone() is not None
+            for statement in _rollup_schema(DATE_COLUMN_SQL):
+                cursor.execute(statement)
+            if not has_rollups:
+                _rebuild_rollups(conn, DATE_COLUMN_SQL)
+            has_search = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'expenses_fts'"
+            ).fetchone() is not None
+            for statement in SEARCH_SCHEMA:
+                cursor.execute(statement)
+            if not has_search:
+                # Index the rows that existed before full-text search was added
+                cursor.execute("INSERT INTO expenses_fts (expenses_fts) VALUES ('rebuild')")
+            for statement in DATA_VERSION_SCHEMA:
+                cursor.execute(statement)
+            conn.commit()
+        except Exception as e:
+            print(f"Error initializing database: {e}")
 
 def add_expense(date: str, amount: float, category: str, description: str):
     """Inserts a new expense record into the database."""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO expenses (date, amount, category, description)
-            VALUES (?, ?, ?, ?)
-        """, (date, amount, category, description))
-        conn.commit()
-    except Exception as e:
-        print(f"Error adding expense: {e}")
-        raise
-    finally:
-        conn.close()
+    with get_pool().connection() as conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute(INSERT_EXPENSE_SQL, (date, amount, category, description))
+            conn.commit()
+        except Exception as e:
+            print(f"Error adding expense: {e}")
+            raise
+
+def submit_expense(date: str, amount: float, category: str, description: str) -> Future:
+    """Queues an expense on the group-commit batcher. The Future resolves to its new id."""
+    return get_write_batcher().submit(INSERT_EXPENSE_SQL, (date, amount, category, description))
+
+def add_expenses_bulk(rows: List[Tuple[str, float, str, Optional[str]]]) -> int:
+    """Inserts many (date, amount, category, description) rows in ONE transaction.
+
+    executemany() reuses a single prepared statement, and the whole chunk is
+    committed (and synced to disk) once instead of once per row. The per-row
+    INSERT triggers are suspended and the derived tables are updated once per chunk.
+    """
+    if not rows:
+        return 0
+    with get_pool().connection() as conn:
+        try:
+            # 'with conn' commits on success and rolls back the whole chunk on error
+            with conn, suspended_insert_triggers(conn):
+                after_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM expenses").fetchone()[0]
+                conn.executemany(INSERT_EXPENSE_SQL, rows)
+                _apply_bulk_deltas(conn, after_id)
+                bump_data_version(conn)
+        except Exception as e:
+            print(f"Error adding expenses in bulk: {e}")
+            raise
+    return len(rows)
 
 def get_all_expenses() -> List[Dict[str, Any]]:
     """Retrieves all expenses from the database, returned as a list of dictionaries."""
-    conn = get_db_connection()
     expenses = []
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM expenses ORDER BY date DESC, id DESC")
-        # Convert sqlite3.Row objects to standard Python dictionaries
-        expenses = [dict(row) for row in cursor.fetchall()]
-    except Exception as e:
-        print(f"Error retrieving all expenses: {e}")
-        raise
-    finally:
-        conn.close()
+    with get_pool().connection() as conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM expenses ORDER BY date DESC, id DESC")
+            # Convert sqlite3.Row objects to standard Python dictionaries
+            expenses = [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Error retrieving all expenses: {e}")
+            raise
     return expenses
 
+def _iter_expense_chunks(columns: str, chunk_size: int, plain_rows: bool = False):
+    """Yields lists of up to `chunk_size` expense rows, oldest id first.
+
+    `columns` must start with the id. Every chunk is its own keyset query
+    (id > last id of the previous chunk) on a connection that goes back to the pool
+    before the chunk is yielded, so a slow or abandoned consumer never holds a pool
+    slot or an open read transaction (which would stop WAL checkpoints). Rows added
+    while the export runs show up if their id is beyond the current position.
+    """
+    last_id = 0
+    while True:
+        with get_pool().connection() as conn:
+            try:
+                cursor = conn.cursor()
+                if plain_rows:
+                    cursor.row_factory = None
+                rows = cursor.execute(
+                    f"SELECT {columns} FROM expenses WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, chunk_size),
+                ).fetchall()
+            except Exception as e:
+                print(f"Error streaming expenses: {e}")
+                raise
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+def iter_expenses(chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Yields every expense as a dictionary, oldest id first, without loading them all.
+
+    Only `chunk_size` rows are fetched at a time, and no connection is held between
+    chunks (see _iter_expense_chunks). Feed it to lazy_query.Query for filters and
+    aggregates over the whole table.
+    """
+    for rows in _iter_expense_chunks("*", chunk_size):
+        for row in rows:
+            yield dict(row)
+
+def stream_expenses_csv(compress: bool = False, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Yields every expense as CSV (str chunks, or gzip bytes if `compress`), oldest id first.
+
+    Only `chunk_size` rows are in memory at a time, and no connection is held between
+    chunks, so a client that stops reading mid-download doesn't tie up the pool.
+    """
+    rows = _iter_expense_chunks("id, date, amount, category, description", chunk_size, plain_rows=True)
+    chunks = iter_csv_rows(list(EXPENSE_COLUMNS), rows)
+    yield from (iter_gzip(chunks) if compress else chunks)
+
+def encode_cursor(expense_date: str, expense_id: int) -> str:
+    """Packs the (date, id) of the last row on a page into an opaque cursor string."""
+    raw = json.dumps([expense_date, expense_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Unpacks a cursor made by encode_cursor(). Raises ValueError if it is not valid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        expense_date, expense_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(expense_date, str) or not isinstance(expense_id, int):
+        raise ValueError("Invalid pagination cursor")
+    return expense_date, expense_id
+
+def get_expenses_page(
+    limit: int = PAGE_SIZE_DEFAULT,
+    after: Optional[Tuple[str, int]] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    category: Optional[str] = None,
+    min_amount: Optional[float] = None,
+) -> Tuple[List[tuple], Optional[str]]:
+    """Returns one page of expenses (newest first) and the cursor for the next page.
+
+    Rows are plain tuples in EXPENSE_COLUMNS order; the renaming to the API field
+    names happens in SQL so no per-row dict has to be built or remapped.
+    Uses keyset pagination: instead of OFFSET, the query continues right after the
+    (date, id) of the previous page, so every page costs the same no matter how deep it is.
+
+    min_amount without a category is scan-bound: no index can answer `amount >= ?`
+    in (date, id) order, so SQLite walks idx_expenses_date_id_amount newest first and
+    checks the amount stored in the index, reading only matching rows from the table.
+    A page costs about (rows skipped before `limit` matches are found) index entries;
+    a threshold that few expenses reach can mean scanning most of the index for one page.
+    An index led by amount would find the matches but then has to sort all of them
+    before the first page, which is worse for the common, unselective thresholds.
+    """
+    conditions = []
+    params: List[Any] = []
+    if category is not None:
+        conditions.append("category = ?")
+        params.append(category)
+    if date_from is not None:
+        conditions.append("date >= ?")
+        params.append(date_from)
+    if date_to is not None:
+        conditions.append("date <= ?")
+        params.append(date_to)
+    if min_amount is not None:
+        conditions.append("amount >= ?")
+        params.append(min_amount)
+    if after is not None:
+        # Row-value comparison lets SQLite seek straight into the (date, id) index
+        conditions.append("(date, id) < (?, ?)")
+        params.extend(after)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    # Fetch one extra row to find out whether another page exists
+    params.append(limit + 1)
+
+    expenses = []
+    with get_pool().connection() as conn:
+        try:
+            cursor = conn.cursor()
+            # Fetch plain tuples instead of sqlite3.Row objects
+            cursor.row_factory = None
+            cursor.execute(f"""
+                SELECT id AS expense_id, date AS expense_date, amount, category, description
+                FROM expenses
+                {where}
+                ORDER BY date DESC, id DESC
+                LIMIT ?
+            """, params)
+            expenses = cursor.fetchall()
+        except Exception as e:
+            print(f"Error retrieving expenses page: {e}")
+            raise
+
+    next_cursor = None
+    if len(expenses) > limit:
+        del expenses[limit:]
+        expense_id, expense_date = expenses[-1][0], expenses[-1][1]
+        next_cursor = encode_cursor(expense_date, expense_id)
+    return expenses, next_cursor
+
+def search_expenses(
+    text: str,
+    limit: int = SEARCH_PAGE_SIZE_DEFAULT,
+    offset: int = 0,
+) -> Tuple[List[tuple], Optional[int]]:
+    """Full-text search over description and category, best matches (BM25) first.
+
+    Returns rows as tuples in EXPENSE_COLUMNS order plus the offset of the next page.
+    Raises ValueError for an empty query.
+    """
+    match = build_search_query(text)
+    expenses = []
+    with get_pool().connection() as conn:
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute("""
+                SELECT e.id AS expense_id, e.date AS expense_date, e.amount, e.category, e.description
+                FROM expenses_fts
+                JOIN expenses AS e ON e.id = expenses_fts.rowid
+                WHERE expenses_fts MATCH ?
+                ORDER BY expenses_fts.rank
+                LIMIT ? OFFSET ?
+            """, (match, limit + 1, offset))
+            expenses = cursor.fetchall()
+        except Exception as e:
+            print(f"Error searching expenses: {e}")
+            raise
+
+    next_offset = None
+    if len(expenses) > limit:
+        del expenses[limit:]
+        next_offset = offset + limit
+    return expenses, next_offset
+
 def get_summary_by_category() -> List[Dict[str, Any]]:
-    """Calculates the total amount spent for each category."""
-    conn = get_db_connection()
+    """Returns count, total, min and max spent per category from the materialized totals table."""
     summary = []
+    with get_pool().connection() as conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    category,
+                    total_spent,
+                    expense_count,
+                    min_amount,
+                    max_amount
+                FROM category_totals
+                ORDER BY total_spent DESC
+            """)
+            # Convert sqlite3.Row objects to standard Python dictionaries
+            summary = [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Error retrieving category summary: {e}")
+            raise
+    return summary
+
+def _rebuild_category_totals(conn: sqlite3.Connection):
+    """Recomputes 'category_totals' from scratch (caller commits)."""
+    conn.execute("DELETE FROM category_totals")
+    conn.execute("""
+        INSERT INTO category_totals (category, expense_count, total_spent, min_amount, max_amount)
+        SELECT category, COUNT(*), SUM(amount), MIN(amount), MAX(amount)
+        FROM expenses
+        GROUP BY category
+    """)
+
+def rebuild_category_totals() -> int:
+    """Recomputes the materialized category totals and returns the number of categories."""
+    with get_pool().connection() as conn:
+        try:
+            with conn:
+                _rebuild_category_totals(conn)
+                bump_data_version(conn)
+            return conn.execute("SELECT COUNT(*) FROM category_totals").fetchone()[0]
+        except Exception as e:
+            print(f"Error rebuilding category totals: {e}")
+            raise
+
+def verify_category_totals() -> List[Dict[str, Any]]:
+    """Compares 'category_totals' with a fresh GROUP BY and returns the categories that differ."""
+    with get_pool().connection() as conn:
+        try:
+            stored = {row["category"]: dict(row) for row in conn.execute("SELECT * FROM category_totals")}
+            actual = {row["category"]: dict(row) for row in conn.execute("""
+                SELECT category, COUNT(*) AS expense_count, SUM(amount) AS total_spent,
+                       MIN(amount) AS min_amount, MAX(amount) AS max_amount
+                FROM expenses
+                GROUP BY category
+            """)}
+        except Exception as e:
+            print(f"Error verifying category totals: {e}")
+            raise
+
+    mismatches = []
+    for category in sorted(set(stored) | set(actual)):
+        expected = actual.get(category)
+        found = stored.get(category)
+        if expected is None or found is None:
+            mismatches.append({"category": category, "expected": expected, "stored": found})
+            continue
+        for column in ("expense_count", "total_spent", "min_amount", "max_amount"):
+            if abs(expected[column] - found[column]) > TOTALS_TOLERANCE * max(1.0, abs(expected[column])):
+                mismatches.append({"category": category, "expected": expected, "stored": found})
+                break
+    return mismatches
+
+def get_spend_timeseries(
+    granularity: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    category: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Returns spend per (bucket, category) for one granularity, read only from the rollups."""
+    if granularity not in ROLLUP_GRANULARITIES:
+        raise ValueError(f"granularity must be one of {', '.join(ROLLUP_GRANULARITIES)}")
+    conditions = ["granularity = ?"]
+    params: List[Any] = [granularity]
+    if date_from is not None:
+        # Include the bucket that CONTAINS date_from (e.g. the whole month)
+        conditions.append(f"bucket >= {ROLLUP_BUCKET_SQL[granularity].format(d='?')}")
+        params.append(date_from)
+    if date_to is not None:
+        conditions.append("bucket <= ?")
+        params.append(date_to)
+    if category is not None:
+        conditions.append("category = ?")
+        params.append(category)
+
+    timeseries = []
+    with get_pool().connection() as conn:
+        try:
+            cursor = conn.execute(f"""
+                SELECT bucket, category, expense_count, total_spent
+                FROM spend_rollups
+                WHERE {' AND '.join(conditions)}
+                ORDER BY bucket, category
+            """, params)
+            timeseries = [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Error retrieving spend timeseries: {e}")
+            raise
+    return timeseries
+
+def backfill_rollups(database: str) -> int:
+    """Creates (if needed) and rebuilds the rollups in any expenses database.
+
+    Works on both schemas: the API's (with 'date') and the CLI's expenses.db
+    (with an ISO 'timestamp'). Triggers are installed too, so the rollups stay
+    current afterwards. Returns the number of expenses rolled up.
+    """
+    conn = _open_connection(database)
     try:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT 
-                category, 
-                SUM(amount) AS total_spent
-            FROM expenses
-            GROUP BY category
-            ORDER BY total_spent DESC
-        """)
-        # Convert sqlite3.Row objects to standard Python dictionaries
-        summary = [dict(row) for row in cursor.fetchall()]
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(expenses)")}
+        if "date" in columns:
+            date_template = DATE_COLUMN_SQL
+        elif "timestamp" in columns:
+            date_template = TIMESTAMP_COLUMN_SQL
+        else:
+            raise ValueError(f"'{database}' has no expenses table with a date or timestamp column")
+        with conn:
+            for statement in _rollup_schema(date_template):
+                conn.execute(statement)
+            _rebuild_rollups(conn, date_template)
+            if date_template == DATE_COLUMN_SQL:
+                for statement in DATA_VERSION_SCHEMA:
+                    conn.execute(statement)
+                bump_data_version(conn)
+        return conn.execute("SELECT COUNT(*) FROM expenses").fetchone()[0]
     except Exception as e:
-        print(f"Error retrieving category summary: {e}")
+        print(f"Error backfilling rollups in '{database}': {e}")
         raise
     finally:
         conn.close()
-    return summary
+
+# --- Command Line Maintenance ---
+
+def main():
+    """Small maintenance CLI, e.g. `python database.py verify-totals`
+    or `python database.py backfill-rollups --db expense_tracker.db --db expenses.db`."""
+    global DATABASE_NAME
+    parser = argparse.ArgumentParser(description="Expense tracker database maintenance")
+    parser.add_argument("command", choices=["rebuild-totals", "verify-totals", "backfill-rollups"])
+    parser.add_argument("--db", action="append", help=f"Path to a SQLite database file (repeatable, default: {DATABASE_NAME})")
+    args = parser.parse_args()
+    databases = args.db or [DATABASE_NAME]
+
+    if args.command == "backfill-rollups":
+        for path in databases:
+            count = backfill_rollups(path)
+            print(f"✅ Rebuilt spend rollups for {count} expenses in '{path}'.")
+        return
+
+    failed = False
+    for path in databases:
+        DATABASE_NAME = path
+        initialize_db()
+        try:
+            if args.command == "rebuild-totals":
+                count = rebuild_category_totals()
+                print(f"✅ Rebuilt category totals for {count} categories in '{path}'.")
+            elif args.command == "verify-totals":
+                mismatches = verify_category_totals()
+                if not mismatches:
+                    print(f"✅ Category totals in '{path}' match the expenses table.")
+                else:
+                    failed = True
+                    for mismatch in mismatches:
+                        print(f"⚠️ {mismatch['category']}: stored={mismatch['stored']} expected={mismatch['expected']}")
+                    print("Run `python database.py rebuild-totals` to fix them.")
+        finally:
+            close_pool()
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
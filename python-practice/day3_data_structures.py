@@ -1,6 +1,11 @@
 # DAY 3, PART B: Hands-On Data Structures Practice
 # Focus: Nested Data (Lists of Dictionaries) & Advanced Manipulation
 
+import random
+
+from lazy_query import Count, Max, MaxBy, Mean, Query, Sum
+from transaction_analysis import TransactionAnalysis
+
 # ═══════════════════════════════════════════════════
 # EXERCISE 1: AI Engineer Project Tracker
 # Goal: Model complex, nested data and calculate simple metrics.
@@ -92,7 +97,7 @@ current_portfolio = track_ai_projects()
 
 # ═══════════════════════════════════════════════════
 # EXERCISE 2: Financial Transaction Aggregator & Analysis
-# Goal: Introduce List Comprehensions and lambda for filtering/summarization.
+# Goal: Answer several questions about the same data with NumPy (masks, group-by, top-k).
 # ═══════════════════════════════════════════════════
 
 def analyze_transactions():
@@ -100,63 +105,115 @@ def analyze_transactions():
 
     # Simulating API data (list of expense dictionaries)
     transactions = [
-        {"id": "t1", "vendor": "G42 Office Cafe", "amount": 15.50, "category": "Food", "date": "2025-10-14"},
-        {"id": "t2", "vendor": "Python Academy", "amount": 99.00, "category": "Learning", "date": "2025-10-14"},
-        {"id": "t3", "vendor": "ADNOC Petrol", "amount": 80.00, "category": "Transport", "date": "2025-10-15"},
-        {"id": "t4", "vendor": "Amazon AWS", "amount": 5.25, "category": "Learning", "date": "2025-10-15"},
-        {"id": "t5", "vendor": "Talabat", "amount": 42.00, "category": "Food", "date": "2025-10-16"},
-        {"id": "t6", "vendor": "Bus Pass", "amount": 120.00, "category": "Transport", "date": "2025-10-16"},
-        {"id": "t7", "vendor": "Presight Conference", "amount": 350.00, "category": "Networking", "date": "2025-10-16"}
+        {"id": 1, "vendor": "G42 Office Cafe", "amount": 15.50, "category": "Food", "date": "2025-10-14"},
+        {"id": 2, "vendor": "Python Academy", "amount": 99.00, "category": "Learning", "date": "2025-10-14"},
+        {"id": 3, "vendor": "ADNOC Petrol", "amount": 80.00, "category": "Transport", "date": "2025-10-15"},
+        {"id": 4, "vendor": "Amazon AWS", "amount": 5.25, "category": "Learning", "date": "2025-10-15"},
+        {"id": 5, "vendor": "Talabat", "amount": 42.00, "category": "Food", "date": "2025-10-16"},
+        {"id": 6, "vendor": "Bus Pass", "amount": 120.00, "category": "Transport", "date": "2025-10-16"},
+        {"id": 7, "vendor": "Presight Conference", "amount": 350.00, "category": "Networking", "date": "2025-10-16"}
     ]
 
     print("\n" + "="*70)
-    print("EXERCISE 2: TRANSACTION ANALYSIS (LIST COMPREHENSIONS)")
+    print("EXERCISE 2: TRANSACTION ANALYSIS (NUMPY, VECTORIZED)")
     print("="*70)
 
-    # --- 1. List Comprehension: Extracting Data ---
-    # Create a new list containing only the amounts. (Faster and cleaner than a for loop)
-    all_amounts = [t["amount"] for t in transactions]
-    print(f"Total Transactions: {len(all_amounts)}")
-    print(f"All Amounts Extracted: {all_amounts}")
-    print(f"Overall Total Spent: AED {sum(all_amounts):.2f}")
+    # Load the list of dicts ONCE into NumPy columns. Every question below is then a
+    # single vectorized pass over one column instead of a new Python loop over all dicts.
+    analysis = TransactionAnalysis.from_records(transactions)
+
+    # --- 1. Column Access: All Amounts ---
+    # analysis.amounts is a NumPy array (no new list is built)
+    print(f"Total Transactions: {len(analysis)}")
+    print(f"All Amounts Extracted: {analysis.amounts.tolist()}")
+    print(f"Overall Total Spent: AED {analysis.total():.2f}")
 
 
-    # --- 2. List Comprehension: Filtering Data ---
-    # Create a new list containing only transactions where category is "Learning".
-    learning_expenses = [t for t in transactions if t["category"] == "Learning"]
-    learning_total = sum([t["amount"] for t in learning_expenses]) # Sum the filtered amounts
+    # --- 2. Filter Mask: Learning Expenses ---
+    # A mask is an array of True/False, one per transaction. It selects rows without copying them.
+    is_learning = analysis.mask(category="Learning")
 
     print("\n--- Learning Expenses ---")
-    for expense in learning_expenses:
+    for expense in analysis.records(is_learning.nonzero()[0]):
         print(f"  • {expense['vendor']}: AED {expense['amount']:.2f}")
-    print(f"Total Learning Spend: AED {learning_total:.2f}")
+    print(f"Total Learning Spend: AED {analysis.total(is_learning):.2f}")
 
 
-    # --- 3. Filtering using a lambda function (Advanced Filtering/Sorting) ---
-    # Find the single most expensive transaction, useful for anomaly detection.
-    # The max() function uses a 'key' argument which takes a lambda function.
-    # A lambda function is a small, anonymous function: lambda x: expression
-    
-    # max() iterates through 'transactions' and uses the lambda to compare the 'amount'
-    most_expensive = max(transactions, key=lambda t: t["amount"])
+    # --- 3. Arg-Max: Most Expensive Transaction ---
+    # np.argmax finds the position of the largest amount (useful for anomaly detection)
+    most_expensive = analysis.largest()
 
     print("\n--- Most Expensive Transaction ---")
     print(f"Vendor: {most_expensive['vendor']}")
     print(f"Amount: AED {most_expensive['amount']:.2f} (Category: {most_expensive['category']})")
 
-    # --- 4. Modifying Data (Applying a Tax or Fee) ---
-    # Use a list comprehension to create a NEW list with a 5% "Admin Fee" applied to all amounts.
-    transactions_with_fee = [
-        {**t, "amount": t["amount"] * 1.05}
-        for t in transactions
-    ]
+    # --- 4. Group By: Spending per Category ---
+    # One np.bincount call adds up the amounts for every category at once
+    print("\n--- Spending by Category ---")
+    for category, group in analysis.group_by("category").items():
+        print(f"  • {category:<12}: AED {group['sum']:>7.2f} | {group['count']} txn(s) | avg AED {group['mean']:.2f}")
 
+    # --- 5. Top-K: The 3 Biggest Transactions ---
+    print("\n--- Top 3 Transactions ---")
+    for expense in analysis.top(3):
+        print(f"  • {expense['vendor']}: AED {expense['amount']:.2f}")
+
+    # --- 6. Column Arithmetic (Applying a Tax or Fee) ---
+    # Multiply the amounts column by 1.05 for a 5% "Admin Fee": no copy of any dict is made.
     print("\n--- Total Spent with 5% Admin Fee ---")
-    # Sum the new amounts from the modified list
-    new_total = sum([t["amount"] for t in transactions_with_fee])
+    new_total = analysis.scaled_total(1.05)
     print(f"New Total (with fee): AED {new_total:.2f}")
 
     print("="*70 + "\n")
 
 # Run the analysis
 analyze_transactions()
+
+
+# ═══════════════════════════════════════════════════
+# EXERCISE 3: Lazy Query Pipeline (Data Bigger Than Memory)
+# Goal: Filter, transform and aggregate in ONE pass, without building any list.
+# ═══════════════════════════════════════════════════
+
+def generate_transactions(count):
+    """A generator: produces one transaction at a time, so `count` can be in the millions.
+    (The same pipeline works on lazy_query.iter_csv_rows(path) or database.iter_expenses().)"""
+    vendors = {"Food": "Talabat", "Learning": "Python Academy", "Transport": "Bus Pass", "Networking": "Meetup"}
+    rng = random.Random(7)
+    for i in range(count):
+        category = rng.choice(list(vendors))
+        yield {"id": i, "vendor": vendors[category], "amount": round(rng.uniform(5, 400), 2),
+               "category": category, "date": f"2025-10-{rng.randint(1, 28):02d}"}
+
+def lazy_transaction_pipeline(count=200_000):
+    print("\n" + "="*70)
+    print(f"EXERCISE 3: LAZY QUERY PIPELINE ({count:,} streamed transactions)")
+    print("="*70)
+
+    # Nothing runs yet: where() and map() only describe the stages
+    with_fee = (
+        Query(generate_transactions(count))
+        .where(lambda t: t["amount"] >= 10)                        # Ignore tiny purchases
+        .map(lambda t: {**t, "amount": round(t["amount"] * 1.05, 2)})  # 5% Admin Fee, one row at a time
+    )
+
+    # agg() pulls every row through both stages once and updates all aggregates together
+    per_category = with_fee.group_by("category").agg(
+        total=Sum("amount"), count=Count(), average=Mean("amount"), biggest=Max("amount"),
+    )
+    for category, result in sorted(per_category.items(), key=lambda item: item[1]["total"], reverse=True):
+        print(f"  • {category:<11}: AED {result['total']:>14,.2f} | {result['count']:>7,} txn(s) | "
+              f"avg AED {result['average']:.2f} | max AED {result['biggest']:.2f}")
+
+    # A source is read once per query, so a new generator is needed for another scan
+    learning = Query(generate_transactions(count)).where(lambda t: t["category"] == "Learning")
+    summary = learning.agg(total=Sum("amount"), most_expensive=MaxBy("amount"))
+    print(f"\nTotal Learning Spend: AED {summary['total']:,.2f}")
+    print(f"Most Expensive Learning Transaction: {summary['most_expensive']}")
+
+    print("="*70 + "\n")
+
+# Streams 200,000 rows (a few seconds), so only when this file is run directly,
+# not when something imports it
+if __name__ == "__main__":
+    lazy_transaction_pipeline()
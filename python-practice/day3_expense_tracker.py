@@ -1,67 +1,300 @@
 import csv
 import json
 import os
+import threading
 import time
 
+from transaction_analysis import TransactionAnalysis, split_valid_records
+
 # --- File Paths ---
 # We store the data in two different formats to practice both I/O methods.
 CSV_FILE = 'transactions.csv'
 JSON_FILE = 'transactions.json'
 
+# Day-to-day storage: every add is one line appended to the journal, and the
+# journal is folded into the snapshot now and then (compaction).
+# The JSON/CSV files above are only written on export or exit.
+JOURNAL_FILE = 'transactions.journal.jsonl'
+SNAPSHOT_FILE = 'transactions.snapshot.json'
+COMPACT_EVERY = 500   # Journal entries before they are folded into a new snapshot
+
+# The JSON/CSV files are also refreshed in the background: a burst of changes
+# within AUTOSAVE_DEBOUNCE seconds becomes one write (but never later than AUTOSAVE_MAX_DELAY)
+AUTOSAVE_DEBOUNCE = 2.0
+AUTOSAVE_MAX_DELAY = 10.0
+
 # Global variable to hold the transaction data (list of dictionaries)
 transactions = []
 
+# Sequence number of the last journal entry, and of the last one included in the snapshot
+journal_seq = 0
+snapshot_seq = 0
+
+# Why the last load_data() could not read everything (None when it did). While this is
+# set, nothing rewrites the snapshot, journal or exports: the files on disk still hold
+# data that isn't in memory, and writing the partial state would make the loss permanent.
+load_error = None
+
 # ====================================================================
 # I/O Functions (Persistence)
 # ====================================================================
 
+def _write_file_atomically(path, write):
+    """Writes to a temp file, fsyncs it, then renames it over `path` (never half-written)."""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', newline='') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def append_to_journal(transaction):
+    """Appends one transaction to the journal and waits until it is on disk (fsync).
+
+    Refused after a load that failed (see `load_error`): the line would land after
+    the corrupt part of the journal, where the next load never reads it.
+    """
+    global journal_seq
+    if load_error is not None:
+        raise RuntimeError(f"Not writing to {JOURNAL_FILE}: {load_error}")
+    journal_seq += 1
+    line = json.dumps({"seq": journal_seq, "op": "add", "transaction": transaction})
+    with open(JOURNAL_FILE, 'a') as f:
+        f.write(line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def compact_if_needed():
+    """Folds the journal into a new snapshot once it has COMPACT_EVERY entries."""
+    if journal_seq - snapshot_seq >= COMPACT_EVERY:
+        compact_journal()
+
+def compact_journal():
+    """Writes the current state as a new snapshot, then empties the journal.
+
+    The snapshot remembers the last journal sequence number it contains, so if we
+    crash after writing it but before clearing the journal, load_data() simply skips
+    the entries that are already in the snapshot.
+    Refused (returns False) after a load that failed, see `load_error`.
+    """
+    global snapshot_seq
+    if load_error is not None:
+        print(f"⚠️ Not compacting the journal: {load_error}")
+        return False
+    snapshot = {"last_seq": journal_seq, "transactions": transactions}
+    _write_file_atomically(SNAPSHOT_FILE, lambda f: json.dump(snapshot, f))
+    snapshot_seq = journal_seq
+    # Start a fresh, empty journal
+    _write_file_atomically(JOURNAL_FILE, lambda f: None)
+    return True
+
+def _replay_journal():
+    """Applies journal entries newer than the snapshot to `transactions`. Returns how many.
+
+    A bad LAST line is what a crash while appending leaves behind, so it is cut off.
+    A bad line with valid entries after it is real corruption: replay stops there,
+    nothing is truncated, and `load_error` is set.
+    """
+    global journal_seq, load_error
+    if not os.path.exists(JOURNAL_FILE):
+        return 0
+    replayed = 0
+    good_bytes = 0
+    with open(JOURNAL_FILE, 'rb') as f:
+        for line in f:
+            try:
+                entry = json.loads(line) if line.strip() else None
+            except json.JSONDecodeError:
+                entry = None
+            if entry is None or not line.endswith(b"\n"):
+                if line.strip():
+                    if f.read().strip():
+                        load_error = (f"{JOURNAL_FILE} is corrupt at byte {good_bytes} and has entries after it; "
+                                      f"fix or move the file, nothing after that point was loaded")
+                        print(f"⚠️ {load_error}.")
+                        break
+                    # A crash while appending can leave a partial last line: cut it off,
+                    # otherwise the next append would be glued onto it
+                    print("⚠️ Removing an incomplete entry at the end of the journal.")
+                    with open(JOURNAL_FILE, 'r+b') as journal:
+                        journal.truncate(good_bytes)
+                    break
+                good_bytes += len(line)
+                continue
+            good_bytes += len(line)
+            if entry["seq"] <= snapshot_seq:
+                continue
+            if entry["op"] == "add":
+                transactions.append(entry["transaction"])
+            journal_seq = entry["seq"]
+            replayed += 1
+    return replayed
+
 def load_data():
-    """Attempts to load transaction data from the JSON file first."""
-    global transactions
-    
-    # os.path.exists checks if the file is there
-    if os.path.exists(JSON_FILE):
-        try:
-            # 'r' mode means read
+    """Rebuilds the transactions from the snapshot plus the journal entries written after it."""
+    global transactions, journal_seq, snapshot_seq, load_error
+    transactions = []
+    journal_seq = snapshot_seq = 0
+    load_error = None
+
+    try:
+        if os.path.exists(SNAPSHOT_FILE):
+            with open(SNAPSHOT_FILE, 'r') as f:
+                snapshot = json.load(f)
+            transactions = snapshot["transactions"]
+            journal_seq = snapshot_seq = snapshot["last_seq"]
+        elif os.path.exists(JSON_FILE) and not os.path.exists(JOURNAL_FILE):
+            # First run with journal storage: start from the old JSON file
             with open(JSON_FILE, 'r') as f:
                 # json.load converts the JSON text back into a Python list/dict
                 transactions = json.load(f)
-            print(f"💾 Data loaded successfully from {JSON_FILE} ({len(transactions)} records).")
+            compact_journal()
+            print(f"💾 Moved {len(transactions)} records from {JSON_FILE} into {SNAPSHOT_FILE}.")
+
+        replayed = _replay_journal()
+        if transactions:
+            if load_error is None:
+                print(f"💾 Data loaded successfully ({len(transactions)} records, {replayed} from the journal).")
+            else:
+                print(f"⚠️ Loaded only {len(transactions)} records; the files will not be rewritten this session.")
             return
 
-        except json.JSONDecodeError:
-            print(f"⚠️ Error reading JSON file. Starting with empty data.")
-        except Exception as e:
-            print(f"⚠️ An unexpected error occurred while loading JSON: {e}")
+    except json.JSONDecodeError:
+        load_error = f"{SNAPSHOT_FILE} could not be read; fix or move it"
+        print(f"⚠️ Error reading {SNAPSHOT_FILE}. Starting with empty data; it will not be overwritten.")
+    except Exception as e:
+        load_error = f"loading failed ({e})"
+        print(f"⚠️ An unexpected error occurred while loading data: {e}")
 
     # Fallback/First Run: Initialize with empty list
     transactions = []
     print("✅ Initializing new transaction list.")
 
 
-def save_data():
-    """Saves the current transactions list to both JSON and CSV files."""
+def save_data(records=None, quiet=False):
+    """Exports the transactions list to both JSON and CSV files.
+
+    Each file is written to a temp file and renamed over the old one, so a crash
+    mid-save never leaves a truncated transactions.json behind.
+    """
+    if load_error is not None:
+        if not quiet:
+            print(f"⚠️ Not saving {JSON_FILE} and {CSV_FILE}: {load_error}")
+        return False
+    # Work on a copy so the list can keep changing while we write
+    records = list(transactions if records is None else records)
     try:
         # 1. Save to JSON (Best for complex data structures)
-        # 'w' mode means write (or overwrite)
-        with open(JSON_FILE, 'w') as f:
-            # json.dump converts the Python list/dict into JSON text, indent=4 makes it readable
-            json.dump(transactions, f, indent=4)
+        # json.dump converts the Python list/dict into JSON text, indent=4 makes it readable
+        _write_file_atomically(JSON_FILE, lambda f: json.dump(records, f, indent=4))
 
         # 2. Save to CSV (Best for simple, tabular data)
-        if transactions:
+        if records:
             # We need the keys of the dictionary to be the column headers
-            fieldnames = transactions[0].keys()
-            with open(CSV_FILE, 'w', newline='') as f:
+            fieldnames = records[0].keys()
+
+            def write_csv(f):
                 # DictWriter knows how to map dictionary keys to CSV columns
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader() # Writes the column headers
-                writer.writerows(transactions) # Writes all transaction rows
+                writer.writerows(records) # Writes all transaction rows
+
+            _write_file_atomically(CSV_FILE, write_csv)
         
-        print(f"\n💾 Data saved successfully to {JSON_FILE} and {CSV_FILE}.")
+        if not quiet:
+            print(f"\n💾 Data saved successfully to {JSON_FILE} and {CSV_FILE}.")
+        return True
 
     except Exception as e:
         print(f"❌ Error during saving: {e}")
+        return False
+
+class AutoSaver:
+    """Saves in a background thread so the menu never waits for file writes.
+
+    request_save() only marks the data as changed. The thread waits until no new
+    change has arrived for `debounce` seconds (or `max_delay` has passed since the
+    first one) and then writes once, so a burst of changes costs a single save.
+    `coalesced` counts the requests that were folded into a save already pending.
+    A save that fails (returns False or raises) marks the data as changed again, so
+    it is retried after the next debounce and by flush().
+    """
+
+    def __init__(self, save, debounce=AUTOSAVE_DEBOUNCE, max_delay=AUTOSAVE_MAX_DELAY):
+        self._save = save
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.saves_written = 0
+        self.coalesced = 0
+        self._dirty = False
+        self._first_change = 0.0
+        self._last_change = 0.0
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def request_save(self):
+        with self._condition:
+            now = time.monotonic()
+            if self._dirty:
+                self.coalesced += 1
+            else:
+                self._dirty = True
+                self._first_change = now
+            self._last_change = now
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._dirty and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                # Debounce: keep waiting while changes are still coming in
+                while not self._stopping:
+                    now = time.monotonic()
+                    deadline = min(self._last_change + self.debounce, self._first_change + self.max_delay)
+                    if now >= deadline:
+                        break
+                    self._condition.wait(deadline - now)
+                if self._stopping:
+                    return
+                self._dirty = False
+            # Write outside the lock so request_save() never blocks on disk
+            self._write()
+
+    def _write(self):
+        try:
+            saved = self._save()
+        except Exception as e:
+            print(f"❌ Background save failed: {e}")
+            saved = False
+        if saved:
+            self.saves_written += 1
+            return
+        with self._condition:
+            now = time.monotonic()
+            if not self._dirty:
+                self._dirty = True
+                self._first_change = now
+            self._last_change = now
+
+    def flush(self):
+        """Stops the thread and saves synchronously if anything is still unsaved (used on exit)."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        # Join first: a background save that fails while we wait marks the data dirty again
+        self._thread.join()
+        with self._condition:
+            pending = self._dirty
+            self._dirty = False
+        if pending:
+            self._write()
+
+autosaver = None
 
 # ====================================================================
 # Core Tracker Logic
@@ -71,6 +304,11 @@ def add_transaction():
     """Prompts user for transaction details and adds it to the list."""
     
     print("\n--- Add New Transaction ---")
+    if load_error is not None:
+        # Anything added now would be lost at the next start, so don't take it
+        print(f"⚠️ Adding is disabled for this session: {load_error}.")
+        print("   Fix or move the file and restart the tracker to add transactions again.")
+        return
     
     while True:
         try:
@@ -92,9 +330,13 @@ def add_transaction():
                 "date": time.strftime("%Y-%m-%d")
             }
             
+            # Durable first (one journal line), then in memory
+            append_to_journal(new_transaction)
             transactions.append(new_transaction)
+            compact_if_needed()
+            if autosaver is not None:
+                autosaver.request_save()
             print(f"✅ Added {vendor} for AED {amount:.2f}.")
-            save_data() # Save immediately after adding
             break
             
         except ValueError as e:
@@ -110,46 +352,40 @@ def show_summary():
         print("\nNo transactions recorded yet.")
         return
 
-    total_spent = 0.0
-    category_totals = {}
-    
-    # 1. Loop and Aggregate
-    for t in transactions:
-        try:
-            amount = float(t['amount']) 
-            category = t['category']
-            
-            total_spent += amount
-            
-            # Use .get() to aggregate category totals—a key dictionary skill
-            category_totals[category] = category_totals.get(category, 0.0) + amount
-        except ValueError:
-            print(f"Skipping record with invalid amount: {t}")
-        
+    # 1. Aggregate (NumPy: one vectorized pass instead of a Python loop per record)
+    valid, invalid = split_valid_records(transactions)
+    for t in invalid:
+        print(f"Skipping invalid record: {t}")
+    analysis = TransactionAnalysis.from_records(valid)
+    total_spent = analysis.total()
+    category_totals = analysis.group_by("category")  # Already sorted, highest total first
+
     print("\n" + "="*50)
     print(f"PERSONAL FINANCE SUMMARY ({len(transactions)} Records)")
     print("="*50)
     print(f"TOTAL SPENT: AED {total_spent:.2f}")
     
     print("\n--- Breakdown by Category ---")
-    # Sort categories by total spent (highest first)
-    for category, total in sorted(category_totals.items(), key=lambda item: item[1], reverse=True):
-        print(f"  • {category:<15}: AED {total:.2f}")
+    for category, group in category_totals.items():
+        print(f"  • {category:<15}: AED {group['sum']:.2f} ({group['count']} × avg AED {group['mean']:.2f})")
         
     print("="*50)
 
 
 def main_menu():
     """Main application loop."""
+    global autosaver
     load_data() # Load data at startup
+    autosaver = AutoSaver(lambda: save_data(quiet=True))
 
     while True:
         print("\n--- Finance Tracker Menu ---")
         print("1. Add New Transaction")
         print("2. View Summary")
-        print("3. Exit and Save")
+        print("3. Export to JSON and CSV")
+        print("4. Exit and Save")
         
-        choice = input("Enter your choice (1-3): ")
+        choice = input("Enter your choice (1-4): ")
         
         if choice == '1':
             add_transaction()
@@ -157,10 +393,15 @@ def main_menu():
             show_summary()
         elif choice == '3':
             save_data()
+        elif choice == '4':
+            compact_journal()
+            # Stop the background saver; it writes the exports once if anything is unsaved
+            autosaver.flush()
+            print(f"Autosave: {autosaver.saves_written} background saves, {autosaver.coalesced} changes coalesced.")
             print("\nExiting tracker. Happy learning!")
             break
         else:
-            print("Invalid choice. Please select 1, 2, or 3.")
+            print("Invalid choice. Please select 1, 2, 3, or 4.")
 
 # ====================================================================
 # Application Entry Point
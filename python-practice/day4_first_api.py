@@ -1,8 +1,20 @@
-from fastapi import FastAPI, HTTPException
-from typing import List, Dict, Optional
-from datetime import datetime
+import gc
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter, deque
+from fastapi import FastAPI, HTTPException, Query
+from typing import List, Dict, Optional, Any, Iterable
+from datetime import date, datetime, timedelta
 from pydantic import BaseModel
 
+from journey_database import (
+    JOURNEY_DATABASE_NAME, STARTUP_TARGET_SECONDS, JourneyWriter,
+    initialize_journey_db, seed_if_empty, load_all,
+)
+
 # ═══════════════════════════════════════════════════
 # DATA MODELS (Pydantic)
 # ═══════════════════════════════════════════════════
@@ -33,10 +45,529 @@ class DailyProgress(BaseModel):
     ready_for_next: bool
 
 # ═══════════════════════════════════════════════════
-# SAMPLE DATA (In real app, this would be database)
+# INDEXED IN-MEMORY STORE
+# ═══════════════════════════════════════════════════
+
+class IndexedStore:
+    """Keeps records in a dict keyed by id, plus secondary indexes for fast filtering.
+
+    - get(id) is a single dict lookup instead of scanning a list
+    - find(field, value) returns only the matching records, without looking at the rest
+    - load() only stores the records; each index is then built in one pass over
+      them (build_indexes(), or on first use), not one record at a time
+    - records keep the ids SQLite gave them; the store never invents ids
+    - running totals of `sum_fields` are updated on every add, so averages are O(1)
+    - with a `rank_field`, every index bucket also keeps its ids presorted by that
+      field (highest first), so match() returns results in rank order without sorting
+    """
+
+    def __init__(
+        self,
+        index_fields: Iterable[str] = (),
+        multi_index_fields: Iterable[str] = (),
+        sum_fields: Iterable[str] = (),
+        rank_field: Optional[str] = None,
+    ):
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._sums: Dict[str, float] = {field: 0 for field in sum_fields}
+        # field -> lowercased value -> {id: record}  (dicts keep insertion order)
+        self._indexes: Dict[str, Dict[str, Dict[int, Dict[str, Any]]]] = {}
+        self._multi_fields = set(multi_index_fields)
+        for field in list(index_fields) + list(multi_index_fields):
+            self._indexes[field] = {}
+        # field -> lowercased value -> [(-rank, id), ...] kept sorted (best first)
+        self._rank_field = rank_field
+        self._ranked: Dict[str, Dict[str, List[tuple]]] = {field: {} for field in self._indexes} if rank_field else {}
+        # Fields whose index doesn't cover every record yet (rebuilt on first use)
+        self._stale: set = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(value: Any) -> str:
+        # Lookups are case-insensitive, like the old `.lower() == .lower()` comparisons
+        return str(value).lower()
+
+    def _index_values(self, record: Dict[str, Any], field: str) -> Iterable[Any]:
+        values = record.get(field)
+        if values is None:
+            return ()
+        # A multi-valued field (like tech_stack) puts the record under every value it holds
+        return values if field in self._multi_fields else (values,)
+
+    def _rank_key(self, record: Dict[str, Any]) -> tuple:
+        # Negated so the highest rank sorts first; the id breaks ties
+        return (-(record.get(self._rank_field) or 0), record["id"])
+
+    def _add_to_indexes(self, record: Dict[str, Any]):
+        for field in self._sums:
+            self._sums[field] += record.get(field) or 0
+        for field, index in self._indexes.items():
+            if field in self._stale:
+                continue
+            for value in self._index_values(record, field):
+                bucket = index.setdefault(self._key(value), {})
+                # A value listed twice (e.g. "n8n" and "N8N") indexes the record once
+                if record["id"] in bucket:
+                    continue
+                bucket[record["id"]] = record
+                if self._rank_field:
+                    insort(self._ranked[field].setdefault(self._key(value), []), self._rank_key(record))
+
+    def add(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Stores one record that already has its id (e.g. one SQLite just assigned)."""
+        with self._lock:
+            self._records[record["id"]] = record
+            self._add_to_indexes(record)
+        return record
+
+    def load(self, records: Iterable[Dict[str, Any]]):
+        """Adds many records that already have ids (everything in the database at startup).
+
+        Only the records and the running sums are stored here; the indexes are
+        rebuilt from all records by build_indexes(), or else the first time each is used.
+        """
+        records = list(records)
+        if not records:
+            return
+        with self._lock:
+            self._records.update((record["id"], record) for record in records)
+            for field in self._sums:
+                self._sums[field] += sum(record.get(field) or 0 for record in records)
+            self._stale.update(self._indexes)
+
+    def build_indexes(self):
+        """Builds every index that load() left stale, one pass per field."""
+        with self._lock:
+            for field in list(self._stale):
+                self._ensure_index(field)
+
+    def _ensure_index(self, field: str):
+        """Builds `field`'s index from every record if it is stale (caller holds the lock)."""
+        if field not in self._stale:
+            return
+        index = self._indexes[field]
+        index.clear()
+        # One pass over the records for this field instead of one method call per record.
+        # Few distinct values repeat a lot, so each value's bucket is looked up (and its
+        # key lowercased) once, not once per record.
+        buckets: Dict[Any, Dict[int, Dict[str, Any]]] = {}
+
+        def bucket_for(value):
+            bucket = index.setdefault(self._key(value), {})
+            buckets[value] = bucket
+            return bucket
+
+        if field in self._multi_fields:
+            for record_id, record in self._records.items():
+                for value in record.get(field) or ():
+                    (buckets.get(value) or bucket_for(value))[record_id] = record
+        else:
+            for record_id, record in self._records.items():
+                value = record.get(field)
+                if value is not None:
+                    (buckets.get(value) or bucket_for(value))[record_id] = record
+        if self._rank_field:
+            # Sort each bucket once instead of insort-ing every record
+            ranked = self._ranked[field]
+            ranked.clear()
+            rank_field = self._rank_field
+            for value, bucket in index.items():
+                # Same (-rank, id) keys as _rank_key(), without a method call per record
+                ranked[value] = sorted((-(record.get(rank_field) or 0), record_id) for record_id, record in bucket.items())
+        self._stale.discard(field)
+
+    def remove(self, record_id: int) -> Optional[Dict[str, Any]]:
+        """Takes a record out of the store and all its indexes."""
+        with self._lock:
+            record = self._records.pop(record_id, None)
+            if record is None:
+                return None
+            for field in self._sums:
+                self._sums[field] -= record.get(field) or 0
+            for field, index in self._indexes.items():
+                if field in self._stale:
+                    continue
+                for value in self._index_values(record, field):
+                    bucket = index.get(self._key(value))
+                    if bucket is not None:
+                        bucket.pop(record_id, None)
+                        if not bucket:
+                            del index[self._key(value)]
+                    ranked = self._ranked.get(field, {}).get(self._key(value))
+                    if ranked:
+                        position = bisect_left(ranked, self._rank_key(record))
+                        if position < len(ranked) and ranked[position][1] == record_id:
+                            del ranked[position]
+                        if not ranked:
+                            del self._ranked[field][self._key(value)]
+        return record
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            for index in self._indexes.values():
+                index.clear()
+            for ranked in self._ranked.values():
+                ranked.clear()
+            for field in self._sums:
+                self._sums[field] = 0
+            self._stale.clear()
+
+    def get(self, record_id: int) -> Optional[Dict[str, Any]]:
+        return self._records.get(record_id)
+
+    def find(self, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Returns every record whose `field` equals `value` (case-insensitive)."""
+        with self._lock:
+            self._ensure_index(field)
+            return list(self._indexes[field].get(self._key(value), {}).values())
+
+    def match(self, field: str, all_values: Iterable[Any] = (), any_values: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        """Records whose `field` holds every value in `all_values` and at least one of
+        `any_values`, highest `rank_field` first. Needs a store created with rank_field.
+        """
+        all_keys = list(dict.fromkeys(self._key(value) for value in all_values))
+        any_keys = list(dict.fromkeys(self._key(value) for value in any_values))
+        with self._lock:
+            self._ensure_index(field)
+            index, ranked = self._indexes[field], self._ranked[field]
+            any_buckets = [index[key] for key in any_keys if key in index]
+            if any(key not in index for key in all_keys) or (any_keys and not any_buckets):
+                return []
+
+            if all_keys:
+                # Walk the smallest presorted list and keep ids that are in every other
+                # bucket (intersection) and in at least one "any" bucket (union)
+                all_keys.sort(key=lambda key: len(index[key]))
+                others = [index[key] for key in all_keys[1:]]
+                ids = [
+                    record_id for _, record_id in ranked[all_keys[0]]
+                    if all(record_id in bucket for bucket in others)
+                    and (not any_buckets or any(record_id in bucket for bucket in any_buckets))
+                ]
+            else:
+                # Union: merge the presorted lists; a record in several lists shows up
+                # in adjacent positions because (-rank, id) is unique per record
+                ids, previous = [], None
+                for entry in heapq.merge(*(ranked[key] for key in any_keys if key in ranked)):
+                    if entry != previous:
+                        ids.append(entry[1])
+                        previous = entry
+            return [self._records[record_id] for record_id in ids]
+
+    def count(self, field: str, value: Any) -> int:
+        """How many records have `field` equal to `value`, ignoring case like every
+        other lookup here ("Live", "live" and "LIVE" all count). It is the size of
+        the value's index bucket, so it costs the same however many records match.
+        """
+        with self._lock:
+            self._ensure_index(field)
+            return len(self._indexes[field].get(self._key(value), {}))
+
+    def total(self, field: str) -> float:
+        """Running sum of a numeric field."""
+        return self._sums[field]
+
+    def average(self, field: str) -> float:
+        count = len(self._records)
+        return self._sums[field] / count if count > 0 else 0
+
+    def all(self) -> List[Dict[str, Any]]:
+        return list(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+# ═══════════════════════════════════════════════════
+# TEXT SEARCH INDEX (autocomplete + typo tolerance)
 # ═══════════════════════════════════════════════════
 
-skills_db = [
+WORD_PATTERN = re.compile(r"\w+")
+
+class TextSearchIndex:
+    """Word index over some text fields of a record, for search-as-you-type.
+
+    - a trie of every word answers prefix queries ("mach" -> "machine") by walking
+      only the branch under the prefix, shortest completions first
+    - a trigram index (word -> its 3-letter pieces) finds words close to a typo
+      ("pyhton" -> "python") by counting shared trigrams
+    - each word maps to the ids that contain it, already split by the field it came
+      from (earlier fields in `fields` rank higher), so the best-ranked ids are
+      always read first and a search can stop as soon as it has `limit` results
+    """
+
+    # Minimum trigram similarity (Jaccard) for a fuzzy match
+    FUZZY_THRESHOLD = 0.25
+
+    # Ranking bonus of a prefix match over a fuzzy match of the last query word
+    PREFIX_BONUS = 10
+
+    def __init__(self, fields: Iterable[str]):
+        self._fields = list(fields)
+        self._trie: Dict[str, Any] = {}
+        # word -> one {id: None} per field (None until a record uses the word there);
+        # an id sits only under the best field it has the word in
+        self._postings: Dict[str, List[Optional[Dict[int, None]]]] = {}
+        # trigram -> set of words
+        self._trigrams: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _words(text: Any) -> List[str]:
+        return WORD_PATTERN.findall(str(text or "").lower())
+
+    @staticmethod
+    def _word_trigrams(word: str) -> set:
+        # Padding makes the start and end of a word count as trigrams too
+        padded = f"  {word} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _record_words(self, record: Dict[str, Any]) -> Dict[str, int]:
+        """word -> position of the first (best) field it appears in."""
+        positions: Dict[str, int] = {}
+        for position, field in enumerate(self._fields):
+            for word in self._words(record.get(field)):
+                positions.setdefault(word, position)
+        return positions
+
+    def _add_word(self, word: str):
+        node = self._trie
+        for char in word:
+            node = node.setdefault(char, {})
+        # "" can never be a character, so it marks the end of a word
+        node[""] = word
+        for trigram in self._word_trigrams(word):
+            self._trigrams.setdefault(trigram, set()).add(word)
+
+    def add(self, record: Dict[str, Any]):
+        with self._lock:
+            self._add_record(record)
+
+    def add_many(self, records: List[Dict[str, Any]], chunk_size: int = 1000):
+        """Indexes many records, releasing the lock between chunks so searches and
+        single adds aren't blocked for the whole load.
+        """
+        for start in range(0, len(records), chunk_size):
+            with self._lock:
+                for record in records[start:start + chunk_size]:
+                    self._add_record(record)
+
+    def _add_record(self, record: Dict[str, Any]):
+        record_id = record["id"]
+        for word, position in self._record_words(record).items():
+            levels = self._postings.get(word)
+            if levels is None:
+                levels = self._postings[word] = [None] * len(self._fields)
+                self._add_word(word)
+            ids = levels[position]
+            if ids is None:
+                ids = levels[position] = {}
+            ids[record_id] = None
+
+    def remove(self, record: Dict[str, Any]):
+        # The word stays in the trie and trigram index; words without ids are skipped
+        with self._lock:
+            for word, position in self._record_words(record).items():
+                levels = self._postings.get(word)
+                if levels is not None and levels[position] is not None:
+                    levels[position].pop(record["id"], None)
+
+    def clear(self):
+        with self._lock:
+            self._trie.clear()
+            self._postings.clear()
+            self._trigrams.clear()
+
+    def _prefix_words(self, prefix: str):
+        """Yields the words that start with `prefix`, shortest first (breadth-first)."""
+        node = self._trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return
+        queue = deque([node])
+        while queue:
+            node = queue.popleft()
+            for char, child in node.items():
+                if char == "":
+                    yield child
+                else:
+                    queue.append(child)
+
+    def _fuzzy_words(self, word: str) -> List[str]:
+        """Words sharing enough trigrams with `word`, most similar first."""
+        query_trigrams = self._word_trigrams(word)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._trigrams.get(trigram, ()))
+        # similarity <= common / len(query_trigrams), so most candidates are ruled out
+        # before their own trigram set is built
+        least_common = self.FUZZY_THRESHOLD * len(query_trigrams)
+        scored = []
+        for candidate, common in shared.items():
+            if common < least_common:
+                continue
+            similarity = common / (len(query_trigrams) + len(self._word_trigrams(candidate)) - common)
+            if similarity >= self.FUZZY_THRESHOLD:
+                scored.append((-similarity, candidate))
+        return [candidate for _, candidate in sorted(scored)]
+
+    def scan(self, records: Iterable[Dict[str, Any]], query: str, limit: int = 10) -> List[int]:
+        """Answers `query` by reading `records` one by one, without the index.
+
+        The slow path for while the index is still being built: same word rules and
+        field ranking as search(), but no typo tolerance (complete words must match
+        exactly). Stops early once `limit` records matched in the first field.
+        """
+        words = self._words(query)
+        if not words or limit <= 0:
+            return []
+        *complete, last = words
+        required = set(complete)
+        fields = self._fields
+        # One list of ids per field position of the last word's match
+        tiers: List[List[int]] = [[] for _ in fields]
+        for record in records:
+            # Cheap substring test first: most records don't contain the query words at
+            # all, and only the rest are split into words
+            text = " ".join([str(record.get(field) or "") for field in fields]).lower()
+            if last not in text or any(word not in text for word in required):
+                continue
+            positions = self._record_words(record)
+            if not required.issubset(positions):
+                continue
+            best = min((position for word, position in positions.items() if word.startswith(last)), default=None)
+            if best is None:
+                continue
+            tiers[best].append(record["id"])
+            if best == 0 and len(tiers[0]) >= limit:
+                break
+        return [record_id for tier in tiers for record_id in tier][:limit]
+
+    def _word_ids(self, word: str) -> List[Dict[int, None]]:
+        """The non-empty id dicts of `word`, best field first (nothing is copied)."""
+        return [ids for ids in self._postings.get(word, ()) if ids]
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """Ids matching `query`, best-ranked first: prefix matches before fuzzy matches,
+        then by the field the last word was found in.
+
+        Every query word must match (the last one as a prefix, since the user may
+        still be typing it). Postings are read in rank order and the search stops as
+        soon as `limit` ids were found.
+        """
+        words = self._words(query)
+        if not words or limit <= 0:
+            return []
+        *complete, last = words
+        with self._lock:
+            # One group per complete word: the id dicts of the word itself, or of its
+            # close spellings. An id qualifies when every group contains it.
+            groups = []
+            for word in complete:
+                group = self._word_ids(word)
+                if not group:
+                    group = [ids for candidate in self._fuzzy_words(word) for ids in self._word_ids(candidate)]
+                if not group:
+                    return []
+                groups.append(group)
+            # Smallest group first, so the running intersection shrinks fastest
+            groups.sort(key=lambda group: sum(map(len, group)))
+
+            found: Dict[int, None] = {}
+            fuzzy_words = None
+            # Rank tiers: (prefix or fuzzy) x field position, best first
+            for prefix in (True, False):
+                if not prefix:
+                    fuzzy_words = self._fuzzy_words(last)
+                for position in range(len(self._fields)):
+                    for word in (self._prefix_words(last) if prefix else fuzzy_words):
+                        ids = self._postings[word][position]
+                        if not ids:
+                            continue
+                        if groups:
+                            # 'keys() & dict' runs in C over the smaller side and builds
+                            # only the (small) intersection, never a copy of a postings list
+                            hits = ids.keys()
+                            for group in groups:
+                                matched = set()
+                                for group_ids in group:
+                                    matched |= hits & group_ids.keys()
+                                hits = matched
+                                if not hits:
+                                    break
+                            hits = sorted(hits)
+                        else:
+                            hits = ids
+                        for record_id in hits:
+                            if record_id not in found:
+                                found[record_id] = None
+                                if len(found) >= limit:
+                                    return list(found)
+            return list(found)
+
+# ═══════════════════════════════════════════════════
+# DAILY PROGRESS LOG
+# ═══════════════════════════════════════════════════
+
+class ProgressLog:
+    """Daily progress entries with running totals and streaks.
+
+    Streaks are tracked as runs of consecutive day numbers: each run is stored by
+    its start and by its end, so logging a day only has to look at its two
+    neighbours (day - 1 and day + 1) to extend or join runs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries: Dict[int, Dict[str, Any]] = {}
+            self._run_end_by_start: Dict[int, int] = {}
+            self._run_start_by_end: Dict[int, int] = {}
+            self.total_hours = 0.0
+            self.ready_days = 0
+            self.latest_day = 0
+            self.longest_streak = 0
+
+    def log(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Adds (or replaces) the entry for entry["day_number"]."""
+        day = entry["day_number"]
+        with self._lock:
+            previous = self._entries.get(day)
+            self._entries[day] = entry
+            self.total_hours += entry["hours_studied"] - (previous["hours_studied"] if previous else 0)
+            self.ready_days += int(entry["ready_for_next"]) - (int(previous["ready_for_next"]) if previous else 0)
+            if previous is None:
+                self._add_day(day)
+            self.latest_day = max(self.latest_day, day)
+        return entry
+
+    def _add_day(self, day: int):
+        start = self._run_start_by_end.pop(day - 1, day)
+        end = self._run_end_by_start.pop(day + 1, day)
+        self._run_end_by_start[start] = end
+        self._run_start_by_end[end] = start
+        self.longest_streak = max(self.longest_streak, end - start + 1)
+
+    @property
+    def days_logged(self) -> int:
+        return len(self._entries)
+
+    @property
+    def current_streak(self) -> int:
+        """Length of the run of consecutive days that ends at the latest logged day."""
+        if not self._entries:
+            return 0
+        return self.latest_day - self._run_start_by_end[self.latest_day] + 1
+
+# ═══════════════════════════════════════════════════
+# SAMPLE DATA (written to an empty database on first start)
+# ═══════════════════════════════════════════════════
+
+SAMPLE_SKILLS = [
     {
         "id": 1,
         "name": "Python Basics",
@@ -63,7 +594,7 @@ skills_db = [
     }
 ]
 
-projects_db = [
+SAMPLE_PROJECTS = [
     {
         "id": 1,
         "name": "AI Daily Motivation",
@@ -84,6 +615,98 @@ projects_db = [
     }
 ]
 
+# The stores are a warm cache of the SQLite database (see journey_database.py):
+# filled with one bulk read at startup, and every write goes through to disk.
+# The cache only sees writes made by its own process, so run a SINGLE worker. Ids come
+# from SQLite, so another writer on the same file (a script, a second process) can't
+# collide with ours, but its rows only show up here after a restart.
+skills_store = IndexedStore(index_fields=["category"], sum_fields=["proficiency"])
+
+projects_store = IndexedStore(
+    index_fields=["status"],
+    multi_index_fields=["tech_stack"],
+    sum_fields=["abu_dhabi_relevance"],
+    rank_field="abu_dhabi_relevance",
+)
+
+# Autocomplete over skill names (ranked first) and notes
+skills_search = TextSearchIndex(fields=["name", "notes"])
+# Set once the background build of skills_search has finished (see load_stores);
+# until then /skills/search scans the skills store instead
+search_index_ready = threading.Event()
+search_index_stats: Dict[str, Any] = {}
+
+progress_log = ProgressLog()
+
+journey_writer: Optional[JourneyWriter] = None
+startup_stats: Dict[str, Any] = {}
+
+def _build_search_index(skills: List[Dict[str, Any]]):
+    started = time.perf_counter()
+    skills_search.add_many(skills)
+    search_index_stats["seconds"] = round(time.perf_counter() - started, 3)
+    search_index_ready.set()
+
+def load_stores(database: str = JOURNEY_DATABASE_NAME) -> Dict[str, Any]:
+    """Fills the in-memory stores from SQLite and returns how long each step took.
+
+    The reported time covers the records AND the stores' field indexes, i.e. every
+    endpoint answers at full speed once this returns. The skill search index is built
+    on a background thread; until it is ready /skills/search still answers, from a
+    plain scan of the skills store (TextSearchIndex.scan). Its build time ends up in
+    search_index_stats once search_index_ready is set.
+    """
+    started = time.perf_counter()
+    # A million new dicts would set off one full garbage collection after another, and
+    # none of them can be garbage, so collection is paused for the load only
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        initialize_journey_db(database)
+        seeded = seed_if_empty(SAMPLE_SKILLS, SAMPLE_PROJECTS, database)
+        skills, projects, progress = load_all(database)
+        read_done = time.perf_counter()
+
+        skills_store.clear()
+        projects_store.clear()
+        progress_log.clear()
+        skills_store.load(skills)
+        projects_store.load(projects)
+        for entry in progress:
+            progress_log.log(entry)
+        store_done = time.perf_counter()
+
+        skills_store.build_indexes()
+        projects_store.build_indexes()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    finished = time.perf_counter()
+
+    # The search index is by far the slowest part and only /skills/search needs it
+    search_index_ready.clear()
+    search_index_stats.clear()
+    skills_search.clear()
+    threading.Thread(target=_build_search_index, args=(skills,), daemon=True).start()
+
+    return {
+        "seeded_sample_data": seeded,
+        "records_loaded": len(skills) + len(projects) + len(progress),
+        "read_seconds": round(read_done - started, 3),
+        "store_seconds": round(store_done - read_done, 3),
+        "index_seconds": round(finished - store_done, 3),
+        "total_seconds": round(finished - started, 3),
+        "target_seconds": STARTUP_TARGET_SECONDS,
+    }
+
+# The plan: day 1 was JOURNEY_START_DATE, and the journey lasts TOTAL_DAYS days
+JOURNEY_START_DATE = date(2025, 10, 14)
+TOTAL_DAYS = 180
+
+# Used until the first DailyProgress is logged
+DEFAULT_CURRENT_DAY = 4
+DEFAULT_HOURS_PER_DAY = 4.0
+
 # ═══════════════════════════════════════════════════
 # CREATE FASTAPI APP
 # ═══════════════════════════════════════════════════
@@ -94,6 +717,28 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# ═══════════════════════════════════════════════════
+# STARTUP / SHUTDOWN
+# ═══════════════════════════════════════════════════
+
+@app.on_event("startup")
+def startup_event():
+    """Load everything from SQLite into the indexed stores and start the writer"""
+    global journey_writer
+    startup_stats.update(load_stores(JOURNEY_DATABASE_NAME))
+    print(f"💾 Loaded {startup_stats['records_loaded']} records in {startup_stats['total_seconds']:.2f}s")
+    if startup_stats["total_seconds"] > STARTUP_TARGET_SECONDS:
+        print(f"⚠️ Startup took longer than the {STARTUP_TARGET_SECONDS}s target")
+    journey_writer = JourneyWriter(JOURNEY_DATABASE_NAME)
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Flush queued writes to SQLite"""
+    global journey_writer
+    if journey_writer is not None:
+        journey_writer.close()
+        journey_writer = None
+
 # ═══════════════════════════════════════════════════
 # ROOT ENDPOINT
 # ═══════════════════════════════════════════════════
@@ -105,8 +750,8 @@ def read_root():
         "message": "Welcome to AI Learning Journey API",
         "student": "Mahdi",
         "goal": "AI Engineer in Abu Dhabi",
-        "current_day": 4,
-        "total_days": 180,
+        "current_day": progress_log.latest_day or DEFAULT_CURRENT_DAY,
+        "total_days": TOTAL_DAYS,
         "status": "On Track",
         "documentation": "/docs"
     }
@@ -119,14 +764,36 @@ def read_root():
 def get_all_skills():
     """Get all skills"""
     return {
-        "total": len(skills_db),
-        "skills": skills_db
+        "total": len(skills_store),
+        "skills": skills_store.all()
+    }
+
+# Declared before /skills/{skill_id} so "search" isn't read as a skill id
+@app.get("/skills/search")
+def search_skills(
+    q: str = Query(..., min_length=1, description="Search text; the last word can be a prefix"),
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Autocomplete skills by name or notes, tolerating small typos"""
+    index_ready = search_index_ready.is_set()
+    if index_ready:
+        skill_ids = skills_search.search(q, limit)
+    else:
+        # Right after startup: slower, and without typo tolerance, but never a 503
+        skill_ids = skills_search.scan(skills_store.all(), q, limit)
+    matches = [skills_store.get(skill_id) for skill_id in skill_ids]
+    
+    return {
+        "query": q,
+        "count": len(matches),
+        "index_ready": index_ready,
+        "skills": matches
     }
 
 @app.get("/skills/{skill_id}")
 def get_skill(skill_id: int):
     """Get specific skill by ID"""
-    skill = next((s for s in skills_db if s["id"] == skill_id), None)
+    skill = skills_store.get(skill_id)
     
     if skill is None:
         raise HTTPException(status_code=404, detail="Skill not found")
@@ -136,7 +803,7 @@ def get_skill(skill_id: int):
 @app.get("/skills/category/{category}")
 def get_skills_by_category(category: str):
     """Get skills by category"""
-    filtered = [s for s in skills_db if s["category"].lower() == category.lower()]
+    filtered = skills_store.find("category", category)
     
     return {
         "category": category,
@@ -147,14 +814,15 @@ def get_skills_by_category(category: str):
 @app.post("/skills")
 def add_skill(skill: Skill):
     """Add a new skill"""
-    new_id = max([s["id"] for s in skills_db]) + 1 if skills_db else 1
-    
-    new_skill = {
-        "id": new_id,
-        **skill.dict()
-    }
+    data = skill.dict()
+    try:
+        # Wait until the skill is committed to disk; SQLite picks its id
+        skill_id = journey_writer.save_skill(data).result()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to save skill: {e}")
     
-    skills_db.append(new_skill)
+    new_skill = skills_store.add({"id": skill_id, **data})
+    skills_search.add(new_skill)
     
     return {
         "message": "Skill added successfully",
@@ -169,14 +837,36 @@ def add_skill(skill: Skill):
 def get_all_projects():
     """Get all projects"""
     return {
-        "total": len(projects_db),
-        "projects": projects_db
+        "total": len(projects_store),
+        "projects": projects_store.all()
+    }
+
+# Declared before /projects/{project_id} so "tech" isn't read as a project id
+@app.get("/projects/tech")
+def get_projects_by_tech(
+    all_tech: Optional[str] = Query(None, alias="all", description="Comma-separated: projects must use every one"),
+    any_tech: Optional[str] = Query(None, alias="any", description="Comma-separated: projects must use at least one"),
+):
+    """Find projects by technology, most relevant to Abu Dhabi first"""
+    all_values = [tech.strip() for tech in (all_tech or "").split(",") if tech.strip()]
+    any_values = [tech.strip() for tech in (any_tech or "").split(",") if tech.strip()]
+    
+    if not all_values and not any_values:
+        raise HTTPException(status_code=400, detail="Pass at least one technology in 'all' or 'any'")
+    
+    matches = projects_store.match("tech_stack", all_values, any_values)
+    
+    return {
+        "all": all_values,
+        "any": any_values,
+        "count": len(matches),
+        "projects": matches
     }
 
 @app.get("/projects/{project_id}")
 def get_project(project_id: int):
     """Get specific project by ID"""
-    project = next((p for p in projects_db if p["id"] == project_id), None)
+    project = projects_store.get(project_id)
     
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -186,7 +876,7 @@ def get_project(project_id: int):
 @app.get("/projects/status/{status}")
 def get_projects_by_status(status: str):
     """Get projects by status"""
-    filtered = [p for p in projects_db if p["status"].lower() == status.lower()]
+    filtered = projects_store.find("status", status)
     
     return {
         "status": status,
@@ -194,68 +884,122 @@ def get_projects_by_status(status: str):
         "projects": filtered
     }
 
+@app.post("/projects")
+def add_project(project: Project):
+    """Add a new project"""
+    data = project.dict()
+    try:
+        # Wait until the project is committed to disk; SQLite picks its id
+        project_id = journey_writer.save_project(data).result()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to save project: {e}")
+    
+    new_project = projects_store.add({"id": project_id, **data})
+    
+    return {
+        "message": "Project added successfully",
+        "project": new_project
+    }
+
 # ═══════════════════════════════════════════════════
 # STATISTICS ENDPOINTS
 # ═══════════════════════════════════════════════════
 
 @app.get("/stats")
 def get_statistics():
-    """Get learning statistics"""
-    
-    # Skills stats
-    total_skills = len(skills_db)
-    avg_proficiency = sum(s["proficiency"] for s in skills_db) / total_skills if total_skills > 0 else 0
-    
-    # Projects stats
-    total_projects = len(projects_db)
-    live_projects = len([p for p in projects_db if p["status"] == "Live"])
-    avg_relevance = sum(p["abu_dhabi_relevance"] for p in projects_db) / total_projects if total_projects > 0 else 0
+    """Get learning statistics
+
+    projects.live counts projects whose status is "Live" in any letter case,
+    the same matching as GET /projects/status/Live.
+    """
+    current_day = progress_log.latest_day or DEFAULT_CURRENT_DAY
     
+    # Every number below is a running total kept up to date on insert - no scans
     return {
         "journey": {
-            "current_day": 4,
-            "total_days": 180,
-            "progress_percentage": (4 / 180) * 100
+            "current_day": current_day,
+            "total_days": TOTAL_DAYS,
+            "progress_percentage": (current_day / TOTAL_DAYS) * 100
         },
         "skills": {
-            "total": total_skills,
-            "average_proficiency": round(avg_proficiency, 1)
+            "total": len(skills_store),
+            "average_proficiency": round(skills_store.average("proficiency"), 1)
         },
         "projects": {
-            "total": total_projects,
-            "live": live_projects,
-            "average_abu_dhabi_relevance": round(avg_relevance, 1)
+            "total": len(projects_store),
+            "live": projects_store.count("status", "Live"),
+            "average_abu_dhabi_relevance": round(projects_store.average("abu_dhabi_relevance"), 1)
         }
     }
 
 @app.get("/stats/progress")
 def get_progress():
     """Get detailed progress report"""
-    days_completed = 4
-    days_remaining = 180 - days_completed
-    estimated_hours = days_completed * 4  # Assuming 4 hours/day
+    if progress_log.days_logged:
+        # Real numbers from the logged DailyProgress entries
+        days_completed = progress_log.latest_day
+        total_hours = progress_log.total_hours
+        average_hours = total_hours / progress_log.days_logged
+    else:
+        # Nothing logged yet: fall back to the planned estimate
+        days_completed = DEFAULT_CURRENT_DAY
+        total_hours = days_completed * DEFAULT_HOURS_PER_DAY
+        average_hours = DEFAULT_HOURS_PER_DAY
+    days_remaining = TOTAL_DAYS - days_completed
     
     return {
         "timeline": {
-            "start_date": "2025-10-14",
+            "start_date": JOURNEY_START_DATE.isoformat(),
             "current_day": days_completed,
             "days_remaining": days_remaining,
-            "percentage_complete": round((days_completed / 180) * 100, 2),
-            "estimated_completion": "2026-04-12"
+            "percentage_complete": round((days_completed / TOTAL_DAYS) * 100, 2),
+            # One day number per calendar day from the start date
+            "estimated_completion": (JOURNEY_START_DATE + timedelta(days=TOTAL_DAYS)).isoformat()
         },
         "effort": {
-            "total_hours": estimated_hours,
-            "average_hours_per_day": 4.0,
-            "projected_total_hours": 180 * 4
+            "total_hours": round(total_hours, 2),
+            "average_hours_per_day": round(average_hours, 2),
+            "projected_total_hours": round(TOTAL_DAYS * average_hours, 1)
+        },
+        "streaks": {
+            "days_logged": progress_log.days_logged,
+            "current_streak": progress_log.current_streak,
+            "longest_streak": progress_log.longest_streak,
+            "days_ready_for_next": progress_log.ready_days
         },
         "milestones": {
-            "skills_learned": len(skills_db),
-            "projects_built": len(projects_db),
-            "github_commits": 4
+            "skills_learned": len(skills_store),
+            "projects_built": len(projects_store)
         },
         "status": "On Track ✅"
     }
 
+@app.post("/progress")
+def log_progress(progress: DailyProgress):
+    """Log (or replace) the progress entry for one day"""
+    if progress.day_number < 1:
+        raise HTTPException(status_code=400, detail="day_number must be 1 or more")
+    
+    entry = progress.dict()
+    
+    try:
+        # Save first, then update the in-memory totals
+        journey_writer.save_progress(entry).result()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to save progress: {e}")
+    progress_log.log(entry)
+    
+    return {
+        "message": "Progress logged successfully",
+        "progress": entry,
+        "totals": {
+            "days_logged": progress_log.days_logged,
+            "total_hours": round(progress_log.total_hours, 2),
+            "current_streak": progress_log.current_streak,
+            "longest_streak": progress_log.longest_streak
+        }
+    }
+
 # ═══════════════════════════════════════════════════
 # HEALTH CHECK
 # ═══════════════════════════════════════════════════
@@ -266,7 +1010,8 @@ def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "startup": startup_stats
     }
 
 # ═══════════════════════════════════════════════════
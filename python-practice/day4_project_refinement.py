@@ -1,12 +1,18 @@
 import sqlite3
-import csv
 from datetime import datetime
 import sys
 import os
+from typing import Optional
+
+from csv_export import iter_csv_chunks, write_csv_file, read_watermark, save_watermark
+from csv_aggregate import aggregate_csv, aggregate_csv_gzip
+from expense_importer import import_file, print_import_report
+from db_maintenance import MaintenanceScheduler, enable_incremental_vacuum, run_maintenance, print_report
 
 # --- Configuration ---
 DB_NAME = "expenses.db"
 EXPORT_FILE = "expenses_export.csv"
+MAINTENANCE_INTERVAL_SECONDS = 600   # How often background maintenance runs once started (option 8)
 
 def get_db_connection():
     """Connects to the SQLite database and returns the connection."""
@@ -25,6 +31,9 @@ def initialize_db():
     conn = get_db_connection()
     if conn:
         try:
+            # Lets maintenance give free pages back a few at a time instead of a full VACUUM.
+            # Only applies to a new database file (existing ones are converted once, see option 7).
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS expenses (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -139,73 +148,90 @@ def delete_expense(expense_id: int):
 
 # --- New Refinement Functions (Phase 3) ---
 
-def export_to_csv():
-    """Exports all expenses from the database to a CSV file."""
+def export_to_csv(incremental: bool = False, compress: bool = False):
+    """Streams expenses from the database to a CSV file (optionally gzip-compressed).
+
+    Rows are fetched and written in chunks, so memory use stays flat however big
+    the table is. With `incremental`, only rows with an id above the last export's
+    watermark are appended to the existing file. Rows are exported in id order,
+    which SQLite reads straight off the table without a sort.
+    Note: an incremental export only sees new rows, not deleted or edited ones.
+    """
+    export_path = EXPORT_FILE + (".gz" if compress else "")
+    watermark = read_watermark(export_path) if incremental else None
+    appending = watermark is not None
+
     conn = get_db_connection()
     if conn:
         try:
-            cursor = conn.execute("SELECT id, amount, category, description, timestamp FROM expenses ORDER BY timestamp ASC;")
-            expenses = cursor.fetchall()
-
-            if not expenses:
-                print("No expenses to export.")
-                return
-
-            # Get the column names (headers)
-            header = [description[0] for description in cursor.description]
-            
-            with open(EXPORT_FILE, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                
-                # Write header row
-                writer.writerow(header)
-                
-                # Write data rows
-                for row in expenses:
-                    # 'row' is a sqlite3.Row object, treat it like a dictionary
-                    writer.writerow(list(row)) 
-            
-            print(f"✅ Successfully exported {len(expenses)} records to '{EXPORT_FILE}'.")
+            # Plain tuples are all the csv writer needs
+            conn.row_factory = None
+            cursor = conn.execute(
+                "SELECT id, amount, category, description, timestamp FROM expenses WHERE id > ? ORDER BY id ASC;",
+                (watermark or 0,),
+            )
+
+            progress = {"rows": 0, "last_id": watermark or 0}
+
+            def track(rows):
+                progress["rows"] += len(rows)
+                progress["last_id"] = rows[-1][0]
+
+            chunks = iter_csv_chunks(cursor, include_header=not appending, on_chunk=track)
+            write_csv_file(chunks, export_path, compress=compress, append=appending)
+            save_watermark(export_path, progress["last_id"])
+
+            if appending:
+                print(f"✅ Appended {progress['rows']} new records (id > {watermark}) to '{export_path}'.")
+            elif progress["rows"] == 0:
+                print(f"No expenses to export ('{export_path}' contains only the header).")
+            else:
+                print(f"✅ Successfully exported {progress['rows']} records to '{export_path}'.")
 
         except sqlite3.Error as e:
             print(f"Error exporting to CSV: {e}")
         except IOError as e:
-            print(f"Error writing to file {EXPORT_FILE}: {e}")
+            print(f"Error writing to file {export_path}: {e}")
         finally:
             conn.close()
 
 
+def latest_export() -> Optional[str]:
+    """The newer of the plain and the compressed export (None if neither exists)."""
+    candidates = [path for path in (EXPORT_FILE, EXPORT_FILE + ".gz") if os.path.exists(path)]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
 def summarize_from_csv():
-    """Loads expenses from the CSV file and summarizes them using Python logic."""
-    if not os.path.exists(EXPORT_FILE):
+    """Loads expenses from the CSV file and summarizes them using Python logic.
+
+    Reads whichever export is newer, expenses_export.csv or expenses_export.csv.gz.
+    A plain file is memory-mapped and split into chunks that are summed in parallel
+    worker processes (see csv_aggregate.py), so multi-GB exports stay fast; a .gz
+    file is decompressed as a stream in this process.
+    """
+    export_path = latest_export()
+    if export_path is None:
         print(f"❌ Error: CSV file '{EXPORT_FILE}' not found. Please run option 5 (Export to CSV) first.")
         return
 
-    summary = {}
-    total_all = 0.0
-    
     try:
-        with open(EXPORT_FILE, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile) # Use DictReader to access columns by header name
-            
-            for row in reader:
-                try:
-                    category = row['category']
-                    # Convert amount from string (in CSV) back to float
-                    amount = float(row['amount']) 
-                    
-                    # Python Aggregation: Use a dictionary to sum totals by category
-                    summary[category] = summary.get(category, 0.0) + amount
-                    total_all += amount
-                except ValueError:
-                    print(f"⚠️ Skipping row due to invalid amount: {row['amount']}")
-                except KeyError as e:
-                    print(f"⚠️ Skipping row: Missing column {e}")
+        print(f"\nReading '{export_path}'")
+        if export_path.endswith(".gz"):
+            summary, problems, problem_count = aggregate_csv_gzip(export_path)
+        else:
+            summary, problems, problem_count = aggregate_csv(export_path)
+
+        for message in problems:
+            print(message)
+        if problem_count > len(problems):
+            print(f"⚠️ ... and {problem_count - len(problems)} more rows skipped")
 
         if not summary:
             print("No valid data found in CSV to summarize.")
             return
 
+        total_all = sum(summary.values())
+
         print("\n--- Summary by Category (Python Aggregation from CSV) ---")
         print(f"{'Category':<15} | {'Total Spent':<12}")
         print("-" * 28)
@@ -219,44 +245,60 @@ def summarize_from_csv():
         print("-" * 28)
         print(f"{'TOTAL':<15} | ${total_all:<11.2f}")
 
+    except KeyError as e:
+        print(f"❌ Error: CSV file is missing the {e} column.")
     except IOError as e:
-        print(f"Error reading file {EXPORT_FILE}: {e}")
+        print(f"Error reading file {export_path}: {e}")
 
 def db_health_check():
-    """Runs database maintenance (VACUUM) and verifies primary key integrity."""
-    conn = get_db_connection()
-    if conn:
-        try:
-            print("\n--- Running Database Health Check ---")
-            
-            # 1. VACUUM: Reclaims space from deleted rows and rebuilds the database file.
-            print("Running VACUUM to reclaim space and optimize file structure...")
-            conn.execute("VACUUM;")
-            print("✅ VACUUM complete.")
-
-            # 2. Integrity Check: Check for proper sequence of the ID column
-            # Note: After VACUUM, the physical ROWID might reset, but the key integrity should be fine.
-            # We check the max ID vs count to ensure no obvious gaps.
-            cursor_max = conn.execute("SELECT MAX(id) FROM expenses;").fetchone()[0]
-            cursor_count = conn.execute("SELECT COUNT(id) FROM expenses;").fetchone()[0]
-            
-            if cursor_max is None or cursor_max == cursor_count:
-                 print("✅ ID Integrity Check: All sequential IDs seem present (or DB is empty/freshly compacted).")
-            else:
-                 print(f"⚠️ ID Integrity Warning: Max ID is {cursor_max}, but total count is {cursor_count}. This is expected after deletions and prior to VACUUM.")
-
-            conn.commit()
-            print("--- Health Check Complete ---")
-
-        except sqlite3.Error as e:
-            print(f"Error during health check: {e}")
-        finally:
-            conn.close()
-
+    """Runs online database maintenance and prints what it did.
+
+    Instead of a full VACUUM (which rewrites the whole file and blocks writers),
+    this runs quick_check, reclaims free pages in small incremental_vacuum steps,
+    refreshes statistics with PRAGMA optimize and checkpoints the WAL.
+    """
+    print("\n--- Running Database Health Check ---")
+    report = run_maintenance(DB_NAME)
+    print_report(report)
+    if "error" not in report:
+        print("--- Health Check Complete ---")
+
+def convert_to_incremental_vacuum():
+    """One-time switch of an older database file to auto_vacuum=INCREMENTAL."""
+    try:
+        if enable_incremental_vacuum(DB_NAME):
+            print("✅ Database converted to auto_vacuum=INCREMENTAL (one full VACUUM was needed).")
+        else:
+            print("✅ Database already uses auto_vacuum=INCREMENTAL.")
+    except sqlite3.Error as e:
+        print(f"Error converting database: {e}")
+
+def toggle_background_maintenance(scheduler: MaintenanceScheduler):
+    """Starts or stops the background maintenance thread and shows its last result."""
+    if scheduler.running:
+        scheduler.stop()
+        print(f"⏹️ Background maintenance stopped after {scheduler.runs} run(s).")
+    else:
+        scheduler.start()
+        print(f"▶️ Background maintenance runs every {scheduler.interval_seconds:.0f}s (the menu keeps working).")
+    # A failed run's report carries its error, so print_report shows that too
+    if scheduler.last_report is not None:
+        print_report(scheduler.last_report)
+
+
+def import_expenses(path: str, dedup: bool = False):
+    """Imports expenses from a CSV or JSON file (see expense_importer.py)."""
+    try:
+        print_import_report(import_file(path, DB_NAME, dedup=dedup))
+    except FileNotFoundError:
+        print(f"❌ Error: File '{path}' not found.")
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error importing {path}: {e}")
 
 def main():
     """The main command-line interface loop for the expense tracker."""
     initialize_db()
+    scheduler = MaintenanceScheduler(DB_NAME, MAINTENANCE_INTERVAL_SECONDS)
 
     while True:
         print("\n--- Expense Tracker Menu (Refined) ---")
@@ -268,9 +310,11 @@ def main():
         print("5. **Export All Data to CSV** (New Feature 1)")
         print("6. **View Summary (Python/CSV)** (New Feature 2)")
         print("7. **Run DB Health Check** (New Feature 3)")
-        print("8. Exit")
+        print(f"8. {'Stop' if scheduler.running else 'Start'} Background Maintenance")
+        print("9. Import Expenses from CSV/JSON")
+        print("10. Exit")
         
-        choice = input("Enter choice (1-8): ").strip()
+        choice = input("Enter choice (1-10): ").strip()
 
         if choice == '1':
             try:
@@ -298,20 +342,33 @@ def main():
                 print("❌ Invalid ID. Please enter an integer.")
 
         elif choice == '5':
-            export_to_csv()
+            incremental = input("Only append new expenses since the last export? (y/N): ").strip().lower() == 'y'
+            compress = input("Compress with gzip? (y/N): ").strip().lower() == 'y'
+            export_to_csv(incremental=incremental, compress=compress)
             
         elif choice == '6':
             summarize_from_csv()
 
         elif choice == '7':
             db_health_check()
-            
+            if input("Convert to incremental auto-vacuum if needed (one-time full VACUUM)? (y/N): ").strip().lower() == 'y':
+                convert_to_incremental_vacuum()
+
         elif choice == '8':
+            toggle_background_maintenance(scheduler)
+            
+        elif choice == '9':
+            path = input("File to import (e.g., data/transactions.csv, data/transactions.json): ").strip()
+            dedup = input("Skip expenses that are already in the database? (y/N): ").strip().lower() == 'y'
+            import_expenses(path, dedup=dedup)
+
+        elif choice == '10':
+            scheduler.stop()
             print("Exiting Expense Tracker. Data is saved to 'expenses.db'.")
             break
             
         else:
-            print("Invalid choice. Please enter a number between 1 and 8.")
+            print("Invalid choice. Please enter a number between 1 and 10.")
 
 
 if __name__ == "__main__":
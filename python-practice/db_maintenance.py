@@ -0,0 +1,214 @@
+import argparse
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# --- Maintenance Settings ---
+VACUUM_STEP_PAGES = 256         # Pages freed per incremental_vacuum step (one short write lock each)
+VACUUM_TIME_BUDGET = 2.0        # Seconds a run may spend reclaiming pages before it stops for now
+BUSY_TIMEOUT_MS = 1000          # How long a step waits for a busy database before it is skipped
+ANALYSIS_LIMIT = 400            # Rows sampled per index by PRAGMA optimize (keeps ANALYZE bounded)
+DEFAULT_INTERVAL_SECONDS = 3600
+
+def _connect(database: str) -> sqlite3.Connection:
+    # isolation_level=None: every statement runs on its own, so no lock is held between steps
+    conn = sqlite3.connect(database, timeout=BUSY_TIMEOUT_MS / 1000.0, isolation_level=None)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    return conn
+
+def _pragma_value(conn: sqlite3.Connection, name: str) -> Any:
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+def enable_incremental_vacuum(database: str) -> bool:
+    """Switches an existing database to auto_vacuum=INCREMENTAL.
+
+    This is a one-time conversion: SQLite only applies the new mode after a full
+    VACUUM, which rewrites the file and blocks writers while it runs. New databases
+    get the mode at creation (see the initialize_db functions) and never need this.
+    Returns True when a conversion was done.
+    """
+    conn = _connect(database)
+    try:
+        if _pragma_value(conn, "auto_vacuum") == 2:
+            return False
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+    except sqlite3.Error as e:
+        print(f"Error enabling incremental vacuum: {e}")
+        raise
+    finally:
+        conn.close()
+
+def run_maintenance(
+    database: str,
+    step_pages: int = VACUUM_STEP_PAGES,
+    time_budget: float = VACUUM_TIME_BUDGET,
+) -> Dict[str, Any]:
+    """One online maintenance pass. Never rewrites the whole file.
+
+    1. PRAGMA quick_check  - a fast structural check (no index/content cross-check)
+    2. incremental_vacuum  - frees up to `step_pages` pages per step until the free
+                             list is empty or `time_budget` seconds have passed
+    3. PRAGMA optimize     - re-runs ANALYZE only on tables whose statistics are stale
+    4. wal_checkpoint      - PASSIVE: copies what it can without waiting on readers
+
+    Each step takes its own short lock. A step that finds the database busy for
+    longer than BUSY_TIMEOUT_MS is recorded as skipped instead of waiting.
+    Returns a report with the time spent per step and the pages reclaimed. Nothing is
+    printed here (this also runs on the scheduler thread): a database error ends the
+    pass and is returned in report["error"] for print_report() to show.
+    """
+    report: Dict[str, Any] = {"database": database, "steps": {}, "skipped": []}
+    started = time.perf_counter()
+    conn = None
+    try:
+        conn = _connect(database)
+        page_size = _pragma_value(conn, "page_size")
+        report["auto_vacuum"] = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}.get(_pragma_value(conn, "auto_vacuum"))
+        free_before = _pragma_value(conn, "freelist_count")
+        pages_before = _pragma_value(conn, "page_count")
+
+        # 1. Quick integrity check
+        step_started = time.perf_counter()
+        problems = [row[0] for row in conn.execute("PRAGMA quick_check(20)")]
+        report["quick_check"] = "ok" if problems == ["ok"] else problems
+        report["steps"]["quick_check"] = round(time.perf_counter() - step_started, 4)
+
+        # 2. Reclaim free pages in small steps
+        step_started = time.perf_counter()
+        vacuum_steps = 0
+        if report["auto_vacuum"] == "INCREMENTAL":
+            while _pragma_value(conn, "freelist_count") > 0 and time.perf_counter() - step_started < time_budget:
+                try:
+                    # executescript steps the pragma to completion (execute() frees only one page)
+                    conn.executescript(f"PRAGMA incremental_vacuum({int(step_pages)});")
+                    vacuum_steps += 1
+                except sqlite3.OperationalError as e:
+                    report["skipped"].append(f"incremental_vacuum: {e}")
+                    break
+        report["steps"]["incremental_vacuum"] = round(time.perf_counter() - step_started, 4)
+        report["vacuum_steps"] = vacuum_steps
+
+        # 3. Refresh query planner statistics where needed
+        step_started = time.perf_counter()
+        try:
+            conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+            conn.execute("PRAGMA optimize")
+        except sqlite3.OperationalError as e:
+            report["skipped"].append(f"optimize: {e}")
+        report["steps"]["optimize"] = round(time.perf_counter() - step_started, 4)
+
+        # 4. Move WAL content into the database file (no-op outside WAL mode)
+        step_started = time.perf_counter()
+        try:
+            busy, wal_pages, checkpointed = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            report["checkpoint"] = {"busy": bool(busy), "wal_pages": wal_pages, "checkpointed_pages": checkpointed}
+        except sqlite3.OperationalError as e:
+            report["skipped"].append(f"wal_checkpoint: {e}")
+        report["steps"]["wal_checkpoint"] = round(time.perf_counter() - step_started, 4)
+
+        free_after = _pragma_value(conn, "freelist_count")
+        pages_after = _pragma_value(conn, "page_count")
+        report["free_pages_before"] = free_before
+        report["free_pages_after"] = free_after
+        report["pages_reclaimed"] = pages_before - pages_after
+        report["bytes_reclaimed"] = (pages_before - pages_after) * page_size
+    except sqlite3.Error as e:
+        report["error"] = str(e)
+    finally:
+        if conn is not None:
+            conn.close()
+
+    report["seconds"] = round(time.perf_counter() - started, 4)
+    return report
+
+def print_report(report: Dict[str, Any]):
+    """Prints a maintenance report in the same style as the menu output."""
+    print(f"\n--- Maintenance Report ({report['database']}) ---")
+    if "error" in report:
+        print(f"❌ Maintenance stopped by a database error: {report['error']}")
+    # A pass that stopped early has only the steps it got through
+    if "quick_check" in report:
+        check = report["quick_check"]
+        print("✅ quick_check: ok" if check == "ok" else f"❌ quick_check found problems: {check}")
+    if "auto_vacuum" in report:
+        print(f"auto_vacuum mode : {report['auto_vacuum']}")
+    if "pages_reclaimed" in report:
+        print(f"Pages reclaimed  : {report['pages_reclaimed']} ({report['bytes_reclaimed'] / 1024:.1f} KiB) "
+              f"in {report['vacuum_steps']} step(s)")
+        print(f"Free pages left  : {report['free_pages_after']}")
+    if "checkpoint" in report and report["checkpoint"]["wal_pages"] < 0:
+        print("WAL checkpoint   : not in WAL mode")
+    elif "checkpoint" in report:
+        checkpoint = report["checkpoint"]
+        print(f"WAL checkpoint   : {checkpoint['checkpointed_pages']}/{checkpoint['wal_pages']} pages"
+              f"{' (readers busy)' if checkpoint['busy'] else ''}")
+    for step, seconds in report.get("steps", {}).items():
+        print(f"  {step:<20} {seconds * 1000:>8.1f} ms")
+    for message in report.get("skipped", []):
+        print(f"⚠️ Skipped (database busy): {message}")
+    if "seconds" in report:
+        print(f"Total time       : {report['seconds'] * 1000:.1f} ms")
+
+class MaintenanceScheduler:
+    """Runs run_maintenance() every `interval_seconds` on a background daemon thread.
+
+    The latest report is kept in `last_report` instead of being printed, so it never
+    interrupts the interactive menu or the API. A failed run still leaves a report
+    (with its "error"), and the message is also kept in `last_error`.
+    """
+
+    def __init__(self, database: str, interval_seconds: float = DEFAULT_INTERVAL_SECONDS):
+        self.database = database
+        self.interval_seconds = interval_seconds
+        self.last_report: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+        self.runs = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        # wait() returns True as soon as stop() is called, so shutdown is immediate
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                report = run_maintenance(self.database)
+            except Exception as e:
+                report = {"database": self.database, "error": str(e)}
+            self.last_report = report
+            self.last_error = report.get("error")
+            self.runs += 1
+
+def main():
+    parser = argparse.ArgumentParser(description="Online maintenance for the expense databases")
+    parser.add_argument("database", help="SQLite database file")
+    parser.add_argument("--enable-incremental", action="store_true",
+                        help="One-time conversion to auto_vacuum=INCREMENTAL (runs a full VACUUM)")
+    parser.add_argument("--step-pages", type=int, default=VACUUM_STEP_PAGES)
+    parser.add_argument("--time-budget", type=float, default=VACUUM_TIME_BUDGET)
+    args = parser.parse_args()
+
+    if args.enable_incremental and enable_incremental_vacuum(args.database):
+        print(f"✅ '{args.database}' now uses auto_vacuum=INCREMENTAL.")
+    print_report(run_maintenance(args.database, step_pages=args.step_pages, time_budget=args.time_budget))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# --- Import Settings ---
+DEFAULT_DATABASE = "expenses.db"
+BATCH_SIZE = 10_000             # Rows per executemany call
+DROP_INDEXES_MIN_BYTES = 50 * 1024 * 1024   # Files at least this big load faster without indexes
+JSON_READ_BYTES = 1024 * 1024   # How much of a JSON file is read at a time
+JSON_MAX_RECORD_BYTES = 16 * 1024 * 1024    # A single JSON element bigger than this is rejected
+MAX_REPORTED_PROBLEMS = 20
+
+INSERT_SQL = "INSERT INTO expenses (amount, category, description, timestamp) VALUES (?, ?, ?, ?)"
+
+# Each target column and the source fields that can fill it, in order of preference:
+# expenses_export.csv uses description/timestamp, transactions.csv/.json use vendor/date
+FIELD_ALIASES = {
+    "amount": ("amount",),
+    "category": ("category",),
+    "description": ("description", "vendor"),
+    "timestamp": ("timestamp", "date"),
+}
+
+# ====================================================================
+# Readers (all streaming: one record at a time)
+# ====================================================================
+
+def iter_csv_records(path: str) -> Iterator[tuple]:
+    """Yields (amount, category, description, timestamp) straight from the CSV columns.
+
+    The header is mapped onto the target columns once, so each row is a plain
+    list lookup instead of building a dict per row like csv.DictReader.
+    """
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader, [])]
+        positions = [
+            next((header.index(name) for name in aliases if name in header), None)
+            for aliases in FIELD_ALIASES.values()
+        ]
+        for row in reader:
+            if not row:
+                continue
+            yield tuple(row[i] if i is not None and i < len(row) else None for i in positions)
+
+def iter_json_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Yields the objects of a top-level JSON array without loading the whole file.
+
+    The file is read in blocks and each element is decoded with raw_decode() as
+    soon as it is complete. JSON Lines files (one object per line) work too.
+    Only the opening '[' and the closing ']' of the array are skipped: every element
+    must be an object, and anything else (a nested array, a number, a missing or
+    extra comma) raises ValueError instead of being flattened or guessed at.
+    An element that is still incomplete after JSON_MAX_RECORD_BYTES raises ValueError,
+    so a broken or non-array file can't make the buffer grow until EOF.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8-sig") as f:
+        buffer = ""
+        position = 0
+        at_eof = False
+        # What comes next: "start" (the '[' or the first JSON Lines object), "first"
+        # (an element or ']'), "element", "separator" (',' or ']'), "record" (the next
+        # JSON Lines object) or "done" (nothing but whitespace after the ']')
+        expect = "start"
+        count = 0
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position == len(buffer):
+                if at_eof:
+                    if expect in ("first", "element", "separator"):
+                        raise ValueError(f"{path} ends before the closing ']' of its array")
+                    return
+                buffer, position = f.read(JSON_READ_BYTES), 0
+                at_eof = not buffer
+                continue
+
+            char = buffer[position]
+            if expect == "start" and char == "[":
+                expect = "first"
+                position += 1
+                continue
+            if expect == "start":
+                expect = "record"
+            elif expect in ("first", "separator") and char == "]":
+                expect = "done"
+                position += 1
+                continue
+            elif expect == "separator":
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' after record {count} of {path}, found {char!r}")
+                expect = "element"
+                position += 1
+                continue
+            elif expect == "done":
+                raise ValueError(f"Unexpected data after the closing ']' of the array in {path}")
+            if char != "{":
+                raise ValueError(f"Expected a JSON object for record {count + 1} of {path}, found {char!r}")
+
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if at_eof:
+                    raise
+                if len(buffer) - position > JSON_MAX_RECORD_BYTES:
+                    raise ValueError(f"A JSON element in {path} is larger than {JSON_MAX_RECORD_BYTES:,} bytes "
+                                     f"(is the file one big object instead of an array of expenses?)")
+                # The element is cut off at the end of the buffer: read more and retry
+                more = f.read(JSON_READ_BYTES)
+                at_eof = not more
+                buffer, position = buffer[position:] + more, 0
+                continue
+            yield record
+            count += 1
+            position = end
+            if expect != "record":
+                expect = "separator"
+
+def _json_values(records: Iterator[Dict[str, Any]]) -> Iterator[tuple]:
+    """Picks (amount, category, description, timestamp) out of each JSON object."""
+    aliases = list(FIELD_ALIASES.values())
+    for record in records:
+        values = []
+        for names in aliases:
+            value = None
+            for name in names:
+                value = record.get(name)
+                if value not in (None, ""):
+                    break
+            values.append(value)
+        yield tuple(values)
+
+def iter_records(path: str) -> Iterator[tuple]:
+    """Streams (amount, category, description, timestamp) tuples, picking the reader
+    from the file extension. Values are still raw (unvalidated) here.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return iter_csv_records(path)
+    if extension in (".json", ".jsonl", ".ndjson"):
+        return _json_values(iter_json_records(path))
+    raise ValueError(f"Unsupported file type '{extension}' (use .csv or .json)")
+
+# ====================================================================
+# Schema Mapping & Dedup
+# ====================================================================
+
+def map_record(values: tuple) -> Tuple[float, str, str, str]:
+    """Validates raw (amount, category, description, timestamp) values from a reader.
+    Raises ValueError when a required field is missing or the amount isn't a number.
+    """
+    amount, category, description, timestamp = values
+    if amount in (None, "") or not category or not timestamp:
+        missing = [column for column, value in zip(FIELD_ALIASES, values) if column != "description" and value in (None, "")]
+        raise ValueError(f"missing {', '.join(missing) or 'fields'}")
+    return (
+        float(amount),
+        str(category).strip(),
+        str(description or "").strip(),
+        str(timestamp).strip(),
+    )
+
+def content_hash(row: Tuple[float, str, str, str]) -> bytes:
+    """A 16-byte fingerprint of an expense's content (its id is not part of it)."""
+    amount, category, description, timestamp = row
+    text = "\x1f".join((repr(float(amount)), category, description or "", timestamp))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+def existing_hashes(conn: sqlite3.Connection) -> Set[bytes]:
+    """Fingerprints of every expense already in the database (streamed in chunks)."""
+    hashes = set()
+    cursor = conn.execute("SELECT amount, category, description, timestamp FROM expenses")
+    while True:
+        rows = cursor.fetchmany(BATCH_SIZE)
+        if not rows:
+            return hashes
+        hashes.update(content_hash(tuple(row)) for row in rows)
+
+# ====================================================================
+# Import
+# ====================================================================
+
+def _secondary_indexes(conn: sqlite3.Connection) -> List[Tuple[str, str]]:
+    """(name, CREATE INDEX sql) of the expenses indexes that can be dropped and recreated."""
+    return conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'expenses' AND sql IS NOT NULL"
+    ).fetchall()
+
+def import_file(
+    path: str,
+    database: str = DEFAULT_DATABASE,
+    dedup: bool = False,
+    drop_indexes: Optional[bool] = None,
+    batch_size: int = BATCH_SIZE,
+) -> Dict[str, Any]:
+    """Streams a CSV/JSON file of expenses into the database.
+
+    Rows are inserted with executemany in batches of `batch_size`. The whole import
+    (including dropping and rebuilding the indexes) is ONE transaction, so a failed
+    import leaves the database exactly as it was, indexes included, and can simply be
+    run again. With `drop_indexes` (by default: files of at least
+    DROP_INDEXES_MIN_BYTES) the table's secondary indexes are dropped first and
+    rebuilt once at the end. With `dedup`, rows whose content matches an existing
+    expense (or an earlier row of the same file) are skipped.
+    Returns counts, timings and rows/sec.
+    """
+    if drop_indexes is None:
+        drop_indexes = os.path.getsize(path) >= DROP_INDEXES_MIN_BYTES
+
+    stats: Dict[str, Any] = {
+        "file": path, "rows_read": 0, "inserted": 0, "invalid": 0, "duplicates": 0, "problems": [],
+    }
+    started = time.perf_counter()
+    conn = sqlite3.connect(database)
+    dropped: List[Tuple[str, str]] = []
+    try:
+        seen = existing_hashes(conn) if dedup else None
+        # sqlite3 doesn't open a transaction before DDL by itself, and a DROP INDEX
+        # outside one would be committed on the spot
+        conn.execute("BEGIN IMMEDIATE")
+        dropped = _secondary_indexes(conn) if drop_indexes else []
+        for name, _ in dropped:
+            conn.execute(f'DROP INDEX "{name}"')
+
+        batch: List[Tuple[float, str, str, str]] = []
+        for line_number, record in enumerate(iter_records(path), start=1):
+            stats["rows_read"] += 1
+            try:
+                row = map_record(record)
+            except (ValueError, TypeError) as e:
+                stats["invalid"] += 1
+                if len(stats["problems"]) < MAX_REPORTED_PROBLEMS:
+                    stats["problems"].append(f"⚠️ Skipping record {line_number}: {e}")
+                continue
+            if seen is not None:
+                fingerprint = content_hash(row)
+                if fingerprint in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(fingerprint)
+
+            batch.append(row)
+            if len(batch) >= batch_size:
+                conn.executemany(INSERT_SQL, batch)
+                stats["inserted"] += len(batch)
+                batch = []
+
+        if batch:
+            conn.executemany(INSERT_SQL, batch)
+            stats["inserted"] += len(batch)
+        stats["load_seconds"] = round(time.perf_counter() - started, 3)
+
+        index_started = time.perf_counter()
+        for _, sql in dropped:
+            conn.execute(sql)
+        conn.commit()
+        stats["indexes_rebuilt"] = [name for name, _ in dropped]
+        stats["index_seconds"] = round(time.perf_counter() - index_started, 3)
+    except BaseException:
+        # Undoes the rows AND the dropped indexes: nothing of this import is kept
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    seconds = time.perf_counter() - started
+    stats["seconds"] = round(seconds, 3)
+    stats["rows_per_sec"] = round(stats["rows_read"] / seconds) if seconds > 0 else 0
+    return stats
+
+def print_import_report(stats: Dict[str, Any]):
+    for message in stats["problems"]:
+        print(message)
+    print(f"\n--- Import Report ({stats['file']}) ---")
+    print(f"Rows read        : {stats['rows_read']}")
+    print(f"Inserted         : {stats['inserted']}")
+    print(f"Invalid (skipped): {stats['invalid']}")
+    print(f"Duplicates       : {stats['duplicates']}")
+    if stats["indexes_rebuilt"]:
+        print(f"Indexes rebuilt  : {', '.join(stats['indexes_rebuilt'])} ({stats['index_seconds']:.2f}s)")
+    print(f"Time             : {stats['seconds']:.2f}s ({stats['rows_per_sec']:,} rows/sec)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Import expenses from CSV or JSON files")
+    parser.add_argument("files", nargs="+", help="transactions.csv, transactions.json, expenses_export.csv, ...")
+    parser.add_argument("--db", default=DEFAULT_DATABASE, help="Target SQLite database")
+    parser.add_argument("--dedup", action="store_true", help="Skip rows already in the database (by content hash)")
+    parser.add_argument("--drop-indexes", dest="drop_indexes", action="store_true", default=None,
+                        help="Drop and rebuild indexes around the load (default: only for big files)")
+    parser.add_argument("--keep-indexes", dest="drop_indexes", action="store_false")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    for path in args.files:
+        try:
+            stats = import_file(path, args.db, dedup=args.dedup, drop_indexes=args.drop_indexes,
+                                batch_size=args.batch_size)
+            print_import_report(stats)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"❌ Error importing {path}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import json
+import sqlite3
+from concurrent.futures import Future
+from typing import List, Dict, Any, Tuple
+
+# Reuse the group-commit writer from the expense API (with this database's own connections)
+from database import WriteBatcher
+
+JOURNEY_DATABASE_NAME = "learning_journey.db"
+
+# PRAGMAs applied to every journey connection. The journey data is read once at
+# startup and written by one writer thread, so a small cache is plenty.
+JOURNEY_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Warn if loading everything into memory at startup takes longer than this
+STARTUP_TARGET_SECONDS = 5.0
+
+# Small batches: a request waits for its own write, so don't hold it back for long
+JOURNEY_BATCH_MAX_ROWS = 500
+JOURNEY_BATCH_MAX_WAIT_MS = 0.0
+
+SKILL_COLUMNS = ("id", "name", "category", "proficiency", "learned_date", "notes")
+PROJECT_COLUMNS = ("id", "name", "description", "tech_stack", "status", "complexity", "abu_dhabi_relevance")
+PROGRESS_COLUMNS = ("day_number", "hours_studied", "topics_covered", "biggest_win", "ready_for_next")
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS skills (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        category TEXT NOT NULL,
+        proficiency INTEGER NOT NULL,
+        learned_date TEXT NOT NULL,
+        notes TEXT
+    )
+    """,
+    # tech_stack is stored as a JSON array
+    """
+    CREATE TABLE IF NOT EXISTS projects (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT NOT NULL,
+        tech_stack TEXT NOT NULL,
+        status TEXT NOT NULL,
+        complexity TEXT NOT NULL,
+        abu_dhabi_relevance INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS daily_progress (
+        day_number INTEGER PRIMARY KEY,
+        hours_studied REAL NOT NULL,
+        topics_covered TEXT NOT NULL,
+        biggest_win TEXT NOT NULL,
+        ready_for_next INTEGER NOT NULL
+    )
+    """,
+)
+
+def _insert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+# With an id (sample data, benchmarks) and without one: new records get their id from
+# SQLite (the rowid), so several server processes sharing the file can't collide
+INSERT_SKILL_SQL = _insert_sql("skills", SKILL_COLUMNS)
+INSERT_PROJECT_SQL = _insert_sql("projects", PROJECT_COLUMNS)
+NEW_SKILL_SQL = _insert_sql("skills", SKILL_COLUMNS[1:])
+NEW_PROJECT_SQL = _insert_sql("projects", PROJECT_COLUMNS[1:])
+# Logging the same day twice replaces the earlier entry
+UPSERT_PROGRESS_SQL = (
+    f"INSERT OR REPLACE INTO daily_progress ({', '.join(PROGRESS_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(PROGRESS_COLUMNS))})"
+)
+
+def _skill_row(skill: Dict[str, Any], columns: Tuple[str, ...] = SKILL_COLUMNS) -> tuple:
+    return tuple(skill.get(column) for column in columns)
+
+def _project_row(project: Dict[str, Any], columns: Tuple[str, ...] = PROJECT_COLUMNS) -> tuple:
+    return tuple(
+        json.dumps(project["tech_stack"]) if column == "tech_stack" else project.get(column)
+        for column in columns
+    )
+
+def _progress_row(progress: Dict[str, Any]) -> tuple:
+    return tuple(int(progress[c]) if c == "ready_for_next" else progress[c] for c in PROGRESS_COLUMNS)
+
+def open_journey_connection(database: str = JOURNEY_DATABASE_NAME) -> sqlite3.Connection:
+    """Opens a connection to the journey database.
+
+    A plain sqlite3 connection: the expense API's pool settings and its query metrics
+    (database.py / metrics.py) are not involved.
+    """
+    conn = sqlite3.connect(database, check_same_thread=False)
+    for pragma in JOURNEY_CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def initialize_journey_db(database: str = JOURNEY_DATABASE_NAME):
+    """Creates the skills, projects and daily_progress tables if they don't exist."""
+    conn = open_journey_connection(database)
+    try:
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+    except sqlite3.Error as e:
+        print(f"Error initializing journey database: {e}")
+        raise
+    finally:
+        conn.close()
+
+def seed_if_empty(skills: List[Dict[str, Any]], projects: List[Dict[str, Any]], database: str = JOURNEY_DATABASE_NAME) -> bool:
+    """Writes the sample data in one transaction when the database has no skills and no projects yet."""
+    conn = open_journey_connection(database)
+    try:
+        has_data = conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM skills) OR EXISTS (SELECT 1 FROM projects)"
+        ).fetchone()[0]
+        if has_data:
+            return False
+        with conn:
+            conn.executemany(INSERT_SKILL_SQL, [_skill_row(s) for s in skills])
+            conn.executemany(INSERT_PROJECT_SQL, [_project_row(p) for p in projects])
+        return True
+    except sqlite3.Error as e:
+        print(f"Error seeding journey database: {e}")
+        raise
+    finally:
+        conn.close()
+
+def load_all(database: str = JOURNEY_DATABASE_NAME) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Reads every skill, project and progress entry with one query per table."""
+    conn = open_journey_connection(database)
+    # Plain tuples are much cheaper to fetch than sqlite3.Row objects
+    conn.row_factory = None
+    try:
+        # A dict display builds each record about twice as fast as dict(zip(columns, row))
+        skills = [
+            {"id": row[0], "name": row[1], "category": row[2], "proficiency": row[3],
+             "learned_date": row[4], "notes": row[5]}
+            for row in conn.execute(f"SELECT {', '.join(SKILL_COLUMNS)} FROM skills ORDER BY id").fetchall()
+        ]
+        projects = []
+        # Many projects share the same tech stack text: parse each distinct one once,
+        # and give every project its own copy of the list
+        parsed_stacks: Dict[str, List[str]] = {}
+        for row in conn.execute(f"SELECT {', '.join(PROJECT_COLUMNS)} FROM projects ORDER BY id").fetchall():
+            stack = parsed_stacks.get(row[3])
+            if stack is None:
+                stack = parsed_stacks[row[3]] = json.loads(row[3])
+            projects.append({"id": row[0], "name": row[1], "description": row[2], "tech_stack": list(stack),
+                             "status": row[4], "complexity": row[5], "abu_dhabi_relevance": row[6]})
+        progress = []
+        for row in conn.execute(f"SELECT {', '.join(PROGRESS_COLUMNS)} FROM daily_progress ORDER BY day_number").fetchall():
+            entry = dict(zip(PROGRESS_COLUMNS, row))
+            entry["ready_for_next"] = bool(entry["ready_for_next"])
+            progress.append(entry)
+        return skills, projects, progress
+    except sqlite3.Error as e:
+        print(f"Error loading journey database: {e}")
+        raise
+    finally:
+        conn.close()
+
+class JourneyWriter:
+    """Writes records through to SQLite via a group-commit WriteBatcher.
+
+    Each save_* call returns a Future that resolves once the row is committed, and
+    writes arriving at the same time share one transaction. New skills and projects
+    are inserted without an id; their Future resolves to the id SQLite assigned.
+    """
+
+    def __init__(self, database: str = JOURNEY_DATABASE_NAME):
+        self._batcher = WriteBatcher(
+            database,
+            max_rows=JOURNEY_BATCH_MAX_ROWS,
+            max_wait_ms=JOURNEY_BATCH_MAX_WAIT_MS,
+            connect=open_journey_connection,
+        )
+
+    def save_skill(self, skill: Dict[str, Any]) -> Future:
+        return self._batcher.submit(NEW_SKILL_SQL, _skill_row(skill, SKILL_COLUMNS[1:]))
+
+    def save_project(self, project: Dict[str, Any]) -> Future:
+        return self._batcher.submit(NEW_PROJECT_SQL, _project_row(project, PROJECT_COLUMNS[1:]))
+
+    def save_progress(self, progress: Dict[str, Any]) -> Future:
+        return self._batcher.submit(UPSERT_PROGRESS_SQL, _progress_row(progress))
+
+    def close(self):
+        """Commits anything still queued and stops the writer thread."""
+        self._batcher.close()
@@ -0,0 +1,209 @@
+import csv
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+# Rows pulled from a SQLite cursor per fetchmany() call
+CURSOR_FETCH_SIZE = 5000
+
+Field = Union[str, Callable[[Dict[str, Any]], Any]]
+
+def _getter(field: Field) -> Callable[[Dict[str, Any]], Any]:
+    """A field name becomes row[name]; a function is used as it is."""
+    if callable(field):
+        return field
+    return lambda row: row[field]
+
+# ====================================================================
+# Sources (each one yields dict rows, one at a time)
+# Query takes any iterable of dicts, so the caller picks the reader: these two,
+# expense_importer.iter_json_records(path), database.iter_expenses(), a generator...
+# ====================================================================
+
+def iter_csv_rows(path: str) -> Iterator[Dict[str, str]]:
+    """CSV rows as dicts keyed by the header. Values stay text, like csv.DictReader."""
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        yield from csv.DictReader(f)
+
+def iter_cursor_rows(cursor: sqlite3.Cursor, fetch_size: int = CURSOR_FETCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """Rows of an executed cursor as dicts keyed by column name (fetchmany, not fetchall)."""
+    columns = [column[0] for column in cursor.description]
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            return
+        for row in rows:
+            yield dict(zip(columns, row))
+
+def _open_source(source: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(source, (str, bytes, os.PathLike)):
+        # A path would otherwise be iterated character by character
+        raise TypeError("Query needs rows, not a path: pass e.g. iter_csv_rows(path) "
+                        "or expense_importer.iter_json_records(path)")
+    if isinstance(source, sqlite3.Cursor):
+        return iter_cursor_rows(source)
+    return iter(source)
+
+# ====================================================================
+# Aggregates (constant memory: each keeps a few numbers, never the rows)
+# ====================================================================
+
+class Aggregate(ABC):
+    """One running result. start() makes the empty state, add() folds a row into it
+    and result() turns the state into the final value."""
+
+    @abstractmethod
+    def start(self) -> Any:
+        ...
+
+    @abstractmethod
+    def add(self, state: Any, row: Dict[str, Any]) -> Any:
+        ...
+
+    def result(self, state: Any) -> Any:
+        return state
+
+class Count(Aggregate):
+    def start(self):
+        return 0
+
+    def add(self, state, row):
+        return state + 1
+
+class FieldAggregate(Aggregate):
+    """An aggregate over one field of each row; self.value(row) reads it."""
+
+    def __init__(self, field: Field):
+        self.value = _getter(field)
+
+class Sum(FieldAggregate):
+    def start(self):
+        return 0.0
+
+    def add(self, state, row):
+        return state + float(self.value(row))
+
+class Mean(FieldAggregate):
+    def start(self):
+        return (0.0, 0)
+
+    def add(self, state, row):
+        return (state[0] + float(self.value(row)), state[1] + 1)
+
+    def result(self, state):
+        return state[0] / state[1] if state[1] else None
+
+class Min(FieldAggregate):
+    def start(self):
+        return None
+
+    def add(self, state, row):
+        value = float(self.value(row))
+        return value if state is None or value < state else state
+
+class Max(FieldAggregate):
+    def start(self):
+        return None
+
+    def add(self, state, row):
+        value = float(self.value(row))
+        return value if state is None or value > state else state
+
+class MaxBy(FieldAggregate):
+    """The whole row with the largest `field` (the first one on ties)."""
+
+    def start(self):
+        return (None, None)
+
+    def add(self, state, row):
+        value = float(self.value(row))
+        return (value, row) if state[0] is None or value > state[0] else state
+
+    def result(self, state):
+        return state[1]
+
+# ====================================================================
+# Query
+# ====================================================================
+
+class Query:
+    """A lazy pipeline over rows: Query(source).where(...).map(...).group_by(...).agg(...)
+
+    `source` is any iterable of dicts (a list, iter_csv_rows(path), a generator such
+    as database.iter_expenses()) or an executed SQLite cursor. Nothing runs until
+    the query is iterated or agg() is called; then every stage is applied to one row
+    at a time in a single pass, so no intermediate list is ever built.
+    Each where()/map()/group_by() returns a new Query, the original is unchanged.
+    """
+
+    def __init__(self, source: Any, stages: Tuple[Tuple[str, Callable], ...] = (), key: Optional[Field] = None):
+        self.source = source
+        self.stages = stages
+        self.key = key
+
+    def _with(self, **changes) -> "Query":
+        settings = {"source": self.source, "stages": self.stages, "key": self.key}
+        settings.update(changes)
+        return Query(**settings)
+
+    # --- Building the pipeline ---
+
+    def where(self, predicate: Callable[[Dict[str, Any]], bool]) -> "Query":
+        """Keep only the rows for which `predicate(row)` is true."""
+        return self._with(stages=self.stages + (("where", predicate),))
+
+    def map(self, func: Callable[[Dict[str, Any]], Dict[str, Any]]) -> "Query":
+        """Replace each row with `func(row)` (e.g. a copy with a fee added)."""
+        return self._with(stages=self.stages + (("map", func),))
+
+    def group_by(self, key: Field) -> "Query":
+        """Make agg() return one result per distinct `key` (a field name or a function)."""
+        return self._with(key=key)
+
+    # --- Running it ---
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Streams the rows that come out of the last stage."""
+        stages = self.stages
+        for row in _open_source(self.source):
+            for kind, func in stages:
+                if kind == "where":
+                    if not func(row):
+                        break
+                else:
+                    row = func(row)
+            else:
+                yield row
+
+    def agg(self, **aggregates: Aggregate) -> Dict[Any, Any]:
+        """Computes every aggregate in the same scan.
+
+        Without group_by(): {name: value}. With group_by(): {group: {name: value}}.
+        Memory stays constant in the number of rows (it grows with the groups only).
+        """
+        names = list(aggregates)
+        functions = [aggregates[name] for name in names]
+
+        if self.key is None:
+            states = [aggregate.start() for aggregate in functions]
+            for row in self:
+                states = [aggregate.add(state, row) for aggregate, state in zip(functions, states)]
+            return {name: aggregate.result(state) for name, aggregate, state in zip(names, functions, states)}
+
+        key = _getter(self.key)
+        groups: Dict[Any, List[Any]] = {}
+        for row in self:
+            group = key(row)
+            states = groups.get(group)
+            if states is None:
+                states = [aggregate.start() for aggregate in functions]
+            groups[group] = [aggregate.add(state, row) for aggregate, state in zip(functions, states)]
+        return {
+            group: {name: aggregate.result(state) for name, aggregate, state in zip(names, functions, states)}
+            for group, states in groups.items()
+        }
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Materializes the result rows (only for results that fit in memory)."""
+        return list(self)
@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Tuple
+
+# --- Configuration ---
+# Set EXPENSE_API_METRICS=0 to switch all instrumentation off (no timers, no middleware work).
+METRICS_ENABLED = os.environ.get("EXPENSE_API_METRICS", "1") != "0"
+
+# Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    """Counts observations per latency bucket, plus their sum and count."""
+
+    __slots__ = ("counts", "total", "count", "_lock")
+
+    def __init__(self):
+        # One extra slot for observations larger than the last bucket (+Inf)
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(LATENCY_BUCKETS, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+class MetricsRegistry:
+    """Holds every counter, histogram and gauge, and renders them in Prometheus text format."""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[Tuple[str, LabelSet], float] = {}
+        self._histograms: Dict[Tuple[str, LabelSet], Histogram] = {}
+        self._gauges: Dict[str, Callable[[], float]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str):
+        """Registers the TYPE and HELP lines for a metric."""
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name: str, labels: LabelSet = (), value: float = 1.0):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, labels: LabelSet, seconds: float):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        histogram.observe(seconds)
+
+    def gauge(self, name: str, help_text: str, read: Callable[[], float]):
+        """Registers a gauge whose value is read (by calling `read`) at scrape time."""
+        self.describe(name, "gauge", help_text)
+        self._gauges[name] = read
+
+    def reset(self):
+        """Forgets all recorded values (gauges stay registered)."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+
+        described = set()
+
+        def header(name):
+            if name not in described and name in self._help:
+                kind, help_text = self._help[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                described.add(name)
+
+        for (name, labels), value in counters:
+            header(name)
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+        for (name, labels), histogram in histograms:
+            header(name)
+            with histogram._lock:
+                counts = list(histogram.counts)
+                total, count = histogram.total, histogram.count
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS, counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', f'{bound:g}'),))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        for name, read in sorted(self._gauges.items()):
+            header(name)
+            lines.append(f"{name} {read():g}")
+
+        return "\n".join(lines) + "\n"
+
+def _format_labels(labels: LabelSet) -> str:
+    """Formats labels as {key="value",...}, escaping backslashes, quotes and newlines."""
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+# The one registry the API and database.py share
+REGISTRY = MetricsRegistry()
+
+REGISTRY.describe("expense_http_request_duration_seconds", "histogram", "HTTP request latency by route and method")
+REGISTRY.describe("expense_http_requests_total", "counter", "HTTP responses by route, method and status code")
+REGISTRY.describe("expense_db_operation_duration_seconds", "histogram", "Time spent in SQLite by operation")
+
+# --- Database Timers ---
+
+def observe_db(operation: str, started: float):
+    """Records the time since `started` (a perf_counter value) for one database operation."""
+    REGISTRY.observe("expense_db_operation_duration_seconds", (("operation", operation),), time.perf_counter() - started)
+
+# --- HTTP Middleware ---
+
+class MetricsMiddleware:
+    """Pure ASGI middleware that records per-route latency and status counts.
+
+    Routes are labelled by their template (e.g. "/expenses/search"), never by the
+    raw URL, so the number of time series stays small.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = REGISTRY):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope.get("method", "GET")
+            self.registry.observe(
+                "expense_http_request_duration_seconds",
+                (("route", path), ("method", method)),
+                time.perf_counter() - started,
+            )
+            self.registry.inc(
+                "expense_http_requests_total",
+                (("route", path), ("method", method), ("status", str(status_code))),
+            )
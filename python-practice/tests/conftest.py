@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# The modules live one directory up (python-practice/), next to each other
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# No background maintenance thread while the API is under test
+os.environ.setdefault("EXPENSE_MAINTENANCE_INTERVAL", "0")
+
+import database
+
+@pytest.fixture
+def expense_db(tmp_path, monkeypatch):
+    """A fresh, initialized expense database in a temp dir (shared pool and batcher point at it)."""
+    database.close_write_batcher()
+    database.close_pool()
+    monkeypatch.setattr(database, "DATABASE_NAME", str(tmp_path / "expenses.db"))
+    database.initialize_db()
+    yield database
+    database.close_write_batcher()
+    database.close_pool()
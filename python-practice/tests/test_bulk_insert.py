@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api_server
+
+RECORDS = [
+    {"expense_date": "2025-01-05", "amount": 12.5, "category": "Food", "description": "bulk lunch"},
+    {"expense_date": "2025-01-06", "amount": 40.0, "category": "Transport", "description": "bulk taxi"},
+    {"expense_date": "2025-02-01", "amount": 7.25, "category": "Food", "description": "bulk coffee"},
+]
+
+@pytest.fixture
+def client(expense_db):
+    with TestClient(api_server.app) as client:
+        yield client
+
+def _derived_counts(expense_db):
+    with expense_db.get_pool().connection() as conn:
+        rollups = dict(conn.execute(
+            "SELECT granularity, SUM(expense_count) FROM spend_rollups GROUP BY granularity"
+        ).fetchall())
+        indexed = conn.execute("SELECT COUNT(*) FROM expenses_fts WHERE expenses_fts MATCH 'bulk'").fetchone()[0]
+    return rollups, indexed
+
+@pytest.mark.parametrize("content_type, body", [
+    ("application/json", json.dumps(RECORDS)),
+    ("application/x-ndjson", "\n".join(json.dumps(record) for record in RECORDS)),
+])
+def test_bulk_insert_keeps_derived_tables_consistent(client, expense_db, content_type, body):
+    response = client.post("/expenses/bulk", content=body, headers={"Content-Type": content_type})
+
+    assert response.status_code == 200
+    assert response.json()["total_inserted"] == 3
+    assert expense_db.verify_category_totals() == []
+    assert _derived_counts(expense_db) == ({"day": 3, "week": 3, "month": 3}, 3)
+
+def test_triggers_are_back_after_a_bulk_insert(client, expense_db):
+    client.post("/expenses/bulk", json=RECORDS)
+    expense_db.add_expense("2025-03-01", 5.0, "Food", "bulk snack")
+
+    assert expense_db.verify_category_totals() == []
+    assert _derived_counts(expense_db) == ({"day": 4, "week": 4, "month": 4}, 4)
+
+def test_invalid_rows_are_reported_and_the_rest_inserted(client, expense_db):
+    records = [RECORDS[0], {**RECORDS[1], "amount": -1}, "not an object", RECORDS[2]]
+    result = client.post("/expenses/bulk", json=records).json()
+
+    assert result["total_received"] == 4
+    assert result["total_inserted"] == 2
+    assert [error["index"] for error in result["chunks"][0]["errors"]] == [1, 2]
+    assert expense_db.verify_category_totals() == []
+
+def test_bad_ndjson_line_does_not_stop_the_rest(client):
+    body = f"{json.dumps(RECORDS[0])}\n{{broken\n{json.dumps(RECORDS[1])}\n"
+    result = client.post("/expenses/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}).json()
+
+    assert result["total_inserted"] == 2
+    assert result["chunks"][0]["errors"][0]["index"] == 1
+
+def test_failed_chunk_rolls_back_and_leaves_totals_alone(client, expense_db, monkeypatch):
+    client.post("/expenses/bulk", json=RECORDS[:1])
+    before = expense_db.get_summary_by_category()
+
+    def broken_deltas(conn, after_id):
+        raise RuntimeError("disk on fire")
+    monkeypatch.setattr(expense_db, "_apply_bulk_deltas", broken_deltas)
+    result = client.post("/expenses/bulk", json=RECORDS[1:]).json()
+
+    assert result["total_inserted"] == 0
+    assert len(result["chunks"][0]["errors"]) == 2
+    assert expense_db.get_summary_by_category() == before
+    assert len(expense_db.get_all_expenses()) == 1
@@ -0,0 +1,57 @@
+import pytest
+
+ROWS = [
+    ("2025-01-05", 12.5, "Food", "lunch"),
+    ("2025-01-06", 800.0, "Rent", "january rent"),
+    ("2025-02-01", 3.25, "Food", "coffee"),
+    ("2025-02-14", 40.0, "Cinema", "movie night"),
+]
+
+def totals(db):
+    return {row["category"]: (row["expense_count"], round(row["total_spent"], 2))
+            for row in db.get_summary_by_category()}
+
+def test_bulk_insert_updates_totals(expense_db):
+    assert expense_db.add_expenses_bulk(ROWS) == len(ROWS)
+    assert expense_db.verify_category_totals() == []
+    assert totals(expense_db) == {"Food": (2, 15.75), "Rent": (1, 800.0), "Cinema": (1, 40.0)}
+
+def test_bulk_insert_restores_the_insert_triggers(expense_db):
+    expense_db.add_expenses_bulk(ROWS)
+    expense_db.add_expense("2025-03-01", 10.0, "Gym", "day pass")
+    assert expense_db.verify_category_totals() == []
+    assert totals(expense_db)["Gym"] == (1, 10.0)
+
+def test_single_and_batched_inserts(expense_db):
+    expense_db.add_expense(*ROWS[0])
+    futures = [expense_db.submit_expense(*row) for row in ROWS[1:]]
+    ids = [future.result(timeout=10) for future in futures]
+    assert len(set(ids)) == len(ids)
+    assert expense_db.verify_category_totals() == []
+    assert totals(expense_db) == {"Food": (2, 15.75), "Rent": (1, 800.0), "Cinema": (1, 40.0)}
+
+def test_update_and_delete(expense_db):
+    expense_db.add_expenses_bulk(ROWS)
+    with expense_db.get_pool().connection() as conn:
+        with conn:
+            # Move the coffee to another category and change the rent amount
+            conn.execute("UPDATE expenses SET category = 'Cinema' WHERE description = 'coffee'")
+            conn.execute("UPDATE expenses SET amount = 750 WHERE category = 'Rent'")
+    assert expense_db.verify_category_totals() == []
+    assert totals(expense_db) == {"Food": (1, 12.5), "Rent": (1, 750.0), "Cinema": (2, 43.25)}
+
+    with expense_db.get_pool().connection() as conn:
+        with conn:
+            conn.execute("DELETE FROM expenses WHERE category = 'Rent'")
+    assert expense_db.verify_category_totals() == []
+    # A category with no expenses left disappears from the totals
+    assert "Rent" not in totals(expense_db)
+
+@pytest.mark.parametrize("chunks", [1, 2])
+def test_bulk_then_rebuild_matches(expense_db, chunks):
+    size = len(ROWS) // chunks
+    for start in range(0, len(ROWS), size):
+        expense_db.add_expenses_bulk(ROWS[start:start + size])
+    before = totals(expense_db)
+    expense_db.rebuild_category_totals()
+    assert totals(expense_db) == before
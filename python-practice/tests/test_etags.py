@@ -0,0 +1,56 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api_server
+
+EXPENSE = {"expense_date": "2025-01-05", "amount": 12.5, "category": "Food", "description": "lunch"}
+
+@pytest.fixture
+def client(expense_db):
+    with TestClient(api_server.app) as client:
+        yield client
+
+def test_unchanged_data_gives_304(client):
+    first = client.get("/summary")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = client.get("/summary", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+
+@pytest.mark.parametrize("header", ['W/{etag}', '"other", {etag}', "*"])
+def test_if_none_match_forms(client, header):
+    etag = client.get("/summary").headers["etag"]
+    assert client.get("/summary", headers={"If-None-Match": header.format(etag=etag)}).status_code == 304
+
+def test_write_through_the_api_changes_the_etag(client):
+    etag = client.get("/summary").headers["etag"]
+    assert client.post("/expenses", json=EXPENSE).status_code == 200
+
+    response = client.get("/summary", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()[0]["category"] == "Food"
+
+def test_write_from_another_connection_changes_the_etag(client, expense_db):
+    etag = client.get("/expenses").headers["etag"]
+    # Another process writing to the same file bumps the version through the triggers
+    conn = sqlite3.connect(expense_db.DATABASE_NAME)
+    with conn:
+        conn.execute("INSERT INTO expenses (date, amount, category, description) VALUES ('2025-01-06', 5, 'Gym', NULL)")
+    conn.close()
+    assert client.get("/expenses", headers={"If-None-Match": etag}).status_code == 200
+
+def test_each_query_has_its_own_etag(client):
+    client.post("/expenses", json=EXPENSE)
+    all_rows = client.get("/expenses").headers["etag"]
+    food = client.get("/expenses", params={"category": "Food"}).headers["etag"]
+    assert all_rows != food
+    # Parameter order doesn't matter
+    a = client.get("/expenses?category=Food&limit=5").headers["etag"]
+    b = client.get("/expenses?limit=5&category=Food").headers["etag"]
+    assert a == b
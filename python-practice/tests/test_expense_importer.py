@@ -0,0 +1,81 @@
+import json
+import sqlite3
+
+import pytest
+
+import expense_importer
+
+ROWS = [
+    {"amount": 12.5, "category": "Food", "vendor": "Cafe", "date": "2025-01-05"},
+    {"amount": 40, "category": "Transport", "vendor": "Taxi", "date": "2025-01-06"},
+]
+
+@pytest.fixture
+def target_db(tmp_path):
+    path = str(tmp_path / "expenses.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE expenses (id INTEGER PRIMARY KEY, amount REAL NOT NULL, category TEXT NOT NULL, "
+                 "description TEXT, timestamp TEXT NOT NULL)")
+    conn.execute("CREATE INDEX idx_expenses_category ON expenses (category)")
+    conn.commit()
+    conn.close()
+    return path
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def _rows(database):
+    conn = sqlite3.connect(database)
+    try:
+        return conn.execute("SELECT amount, category, description, timestamp FROM expenses ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+@pytest.mark.parametrize("text", [
+    json.dumps(ROWS, indent=2),
+    "\n".join(json.dumps(row) for row in ROWS) + "\n",
+])
+def test_json_array_and_json_lines(tmp_path, text):
+    assert list(expense_importer.iter_json_records(_write(tmp_path, "rows.json", text))) == ROWS
+
+def test_empty_array(tmp_path):
+    assert list(expense_importer.iter_json_records(_write(tmp_path, "rows.json", " [ ] \n"))) == []
+
+@pytest.mark.parametrize("text, message", [
+    ('[{"amount": 1}, [{"amount": 2}]]', "Expected a JSON object for record 2"),
+    ('[[{"amount": 1}]]', "Expected a JSON object for record 1"),
+    ('[{"amount": 1}, 5]', "Expected a JSON object for record 2"),
+    ('[{"amount": 1},]', "Expected a JSON object for record 2"),
+    ('[{"amount": 1} {"amount": 2}]', "Expected ',' or ']'"),
+    ('[{"amount": 1}] {"amount": 2}', "after the closing ']'"),
+    ('[{"amount": 1}', "ends before the closing ']'"),
+])
+def test_anything_but_an_array_of_objects_is_rejected(tmp_path, text, message):
+    with pytest.raises(ValueError, match=message):
+        list(expense_importer.iter_json_records(_write(tmp_path, "rows.json", text)))
+
+def test_dedup_skips_existing_rows_and_repeats(tmp_path, target_db):
+    path = _write(tmp_path, "rows.json", json.dumps(ROWS + ROWS[:1]))
+    first = expense_importer.import_file(path, target_db, dedup=True)
+    second = expense_importer.import_file(path, target_db, dedup=True)
+
+    assert (first["inserted"], first["duplicates"]) == (2, 1)
+    assert (second["inserted"], second["duplicates"]) == (0, 3)
+    assert len(_rows(target_db)) == 2
+
+def test_failed_import_rolls_back_rows_and_indexes(tmp_path, target_db):
+    expense_importer.import_file(_write(tmp_path, "good.json", json.dumps(ROWS[:1])), target_db)
+    # The first element is inserted before the nested array is reached
+    bad = _write(tmp_path, "bad.json", json.dumps(ROWS[1:])[:-1] + ", [1, 2]]")
+
+    with pytest.raises(ValueError):
+        expense_importer.import_file(bad, target_db, drop_indexes=True, batch_size=1)
+
+    assert _rows(target_db) == [(12.5, "Food", "Cafe", "2025-01-05")]
+    conn = sqlite3.connect(target_db)
+    try:
+        assert [name for name, _ in expense_importer._secondary_indexes(conn)] == ["idx_expenses_category"]
+    finally:
+        conn.close()
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+import day3_expense_tracker as tracker
+
+@pytest.fixture
+def journal_dir(tmp_path, monkeypatch):
+    """Runs the tracker's file functions inside an empty temp dir."""
+    monkeypatch.chdir(tmp_path)
+    tracker.load_data()
+    return tmp_path
+
+def add(description, amount):
+    transaction = {"date": "2025-01-01", "description": description, "amount": amount}
+    tracker.transactions.append(transaction)
+    tracker.append_to_journal(transaction)
+
+def test_journal_entries_are_replayed(journal_dir):
+    add("coffee", 3.5)
+    add("book", 20.0)
+    tracker.load_data()
+    assert [t["description"] for t in tracker.transactions] == ["coffee", "book"]
+    assert tracker.load_error is None
+
+def test_torn_last_line_is_cut_off(journal_dir):
+    add("coffee", 3.5)
+    good_size = (journal_dir / tracker.JOURNAL_FILE).stat().st_size
+    # A crash while appending leaves half a line
+    with open(tracker.JOURNAL_FILE, "a") as f:
+        f.write('{"seq": 2, "op": "add", "transac')
+
+    tracker.load_data()
+    assert [t["description"] for t in tracker.transactions] == ["coffee"]
+    assert tracker.load_error is None
+    assert (journal_dir / tracker.JOURNAL_FILE).stat().st_size == good_size
+
+    # The next append starts on a clean line and survives a reload
+    add("book", 20.0)
+    tracker.load_data()
+    assert [t["description"] for t in tracker.transactions] == ["coffee", "book"]
+
+def test_corruption_in_the_middle_is_not_truncated(journal_dir):
+    add("coffee", 3.5)
+    with open(tracker.JOURNAL_FILE, "a") as f:
+        f.write("not json\n")
+        f.write(json.dumps({"seq": 3, "op": "add", "transaction": {"description": "book"}}) + "\n")
+    before = (journal_dir / tracker.JOURNAL_FILE).read_bytes()
+
+    tracker.load_data()
+    assert tracker.load_error is not None
+    assert (journal_dir / tracker.JOURNAL_FILE).read_bytes() == before
+    # Nothing may overwrite the files while the load is incomplete
+    assert tracker.compact_journal() is False
+    assert tracker.save_data(quiet=True) is False
+    assert (journal_dir / tracker.JOURNAL_FILE).read_bytes() == before
+
+def test_no_adds_after_a_failed_load(journal_dir, monkeypatch, capsys):
+    add("coffee", 3.5)
+    with open(tracker.JOURNAL_FILE, "a") as f:
+        f.write("not json\n")
+        f.write(json.dumps({"seq": 3, "op": "add", "transaction": {"description": "book"}}) + "\n")
+    before = (journal_dir / tracker.JOURNAL_FILE).read_bytes()
+    tracker.load_data()
+
+    with pytest.raises(RuntimeError):
+        tracker.append_to_journal({"description": "lost"})
+    # The menu refuses before asking for any input
+    monkeypatch.setattr("builtins.input", lambda prompt="": pytest.fail("should not prompt"))
+    tracker.add_transaction()
+    assert "Adding is disabled" in capsys.readouterr().out
+    assert (journal_dir / tracker.JOURNAL_FILE).read_bytes() == before
+
+def test_compaction_keeps_the_data(journal_dir):
+    add("coffee", 3.5)
+    add("book", 20.0)
+    assert tracker.compact_journal() is True
+    assert (journal_dir / tracker.JOURNAL_FILE).read_text() == ""
+    add("train", 9.0)
+    tracker.load_data()
+    assert [t["description"] for t in tracker.transactions] == ["coffee", "book", "train"]
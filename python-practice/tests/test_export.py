@@ -0,0 +1,81 @@
+import gzip
+import os
+import sqlite3
+
+import csv_export
+import day4_project_refinement as refinement
+
+def seed(db, count):
+    db.add_expenses_bulk([("2025-01-01", float(i), "Food", f"expense {i}") for i in range(count)])
+
+def test_csv_stream_has_every_row(expense_db):
+    seed(expense_db, 25)
+    text = "".join(expense_db.stream_expenses_csv(chunk_size=10))
+    lines = text.splitlines()
+    assert lines[0] == "expense_id,expense_date,amount,category,description"
+    assert [line.split(",")[0] for line in lines[1:]] == [str(i) for i in range(1, 26)]
+
+    compressed = b"".join(expense_db.stream_expenses_csv(compress=True, chunk_size=10))
+    assert gzip.decompress(compressed).decode("utf-8") == text
+
+def test_an_abandoned_export_holds_no_connection(expense_db):
+    seed(expense_db, 25)
+    pool = expense_db.get_pool()
+    stream = expense_db.stream_expenses_csv(chunk_size=10)
+    next(stream)
+    next(stream)
+    # The client went away after two chunks: nothing is borrowed in between
+    assert pool.in_use == 0
+    stream.close()
+
+    rows = expense_db.iter_expenses(chunk_size=10)
+    assert next(rows)["id"] == 1
+    assert pool.in_use == 0
+
+def test_interrupted_append_is_cut_off(tmp_path):
+    path = str(tmp_path / "expenses.csv")
+    csv_export.write_csv_file(["id\n", "1\n"], path)
+    csv_export.save_watermark(path, 1)
+    size = (tmp_path / "expenses.csv").stat().st_size
+
+    # Rows appended, but the crash came before the watermark was saved
+    csv_export.write_csv_file(["2\n"], path, append=True)
+    assert csv_export.read_watermark(path) == 1
+    assert (tmp_path / "expenses.csv").stat().st_size == size
+
+def test_empty_compressed_append_adds_nothing(tmp_path):
+    path = str(tmp_path / "expenses.csv.gz")
+    csv_export.write_csv_file(["id\n", "1\n"], path, compress=True)
+    csv_export.save_watermark(path, 1)
+    before = (tmp_path / "expenses.csv.gz").read_bytes()
+    csv_export.write_csv_file(iter([]), path, compress=True, append=True)
+    assert (tmp_path / "expenses.csv.gz").read_bytes() == before
+    assert csv_export.read_watermark(path) == 1
+
+def test_full_export_drops_the_old_watermark(tmp_path):
+    path = str(tmp_path / "expenses.csv")
+    csv_export.write_csv_file(["id\n", "1\n"], path)
+    csv_export.save_watermark(path, 1)
+    csv_export.write_csv_file(["id\n"], path)
+    assert csv_export.read_watermark(path) is None
+
+def test_summary_reads_the_newer_export(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    conn = sqlite3.connect(refinement.DB_NAME)
+    conn.execute("CREATE TABLE expenses (id INTEGER PRIMARY KEY, amount REAL, category TEXT, description TEXT, timestamp TEXT)")
+    conn.execute("INSERT INTO expenses VALUES (1, 10.0, 'Food', 'lunch', '2025-01-01')")
+    conn.commit()
+
+    refinement.export_to_csv()
+    conn.execute("INSERT INTO expenses VALUES (2, 5.0, 'Food', 'coffee', '2025-01-02')")
+    conn.commit()
+    conn.close()
+    refinement.export_to_csv(compress=True)
+    # Make sure the .gz really is the newer file, whatever the clock resolution
+    os.utime(refinement.EXPORT_FILE, (1, 1))
+    capsys.readouterr()
+
+    refinement.summarize_from_csv()
+    out = capsys.readouterr().out
+    assert f"Reading '{refinement.EXPORT_FILE}.gz'" in out
+    assert "$15.00" in out
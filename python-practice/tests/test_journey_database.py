@@ -0,0 +1,21 @@
+import metrics
+import journey_database
+
+SKILL = {"name": "SQL", "category": "Databases", "proficiency": 6, "learned_date": "2025-10-17", "notes": None}
+
+def test_writer_assigns_ids_without_touching_the_expense_metrics(tmp_path):
+    database = str(tmp_path / "journey.db")
+    journey_database.initialize_journey_db(database)
+    before = metrics.REGISTRY.render()
+
+    writer = journey_database.JourneyWriter(database)
+    try:
+        first = writer.save_skill(SKILL).result(timeout=10)
+        second = writer.save_skill(SKILL).result(timeout=10)
+    finally:
+        writer.close()
+
+    assert second == first + 1
+    skills, projects, progress = journey_database.load_all(database)
+    assert [skill["id"] for skill in skills] == [first, second]
+    assert metrics.REGISTRY.render() == before
@@ -0,0 +1,39 @@
+import pytest
+
+def test_cursor_round_trip(expense_db):
+    cursor = expense_db.encode_cursor("2025-03-01", 1234)
+    assert "=" not in cursor
+    assert expense_db.decode_cursor(cursor) == ("2025-03-01", 1234)
+
+@pytest.mark.parametrize("bad", ["", "not-a-cursor", "WzEsMl0", "eyJhIjoxfQ"])
+def test_invalid_cursor(expense_db, bad):
+    with pytest.raises(ValueError):
+        expense_db.decode_cursor(bad)
+
+def walk(db, **filters):
+    """Follows the cursors page by page and returns every row seen."""
+    rows, after = [], None
+    while True:
+        page, next_cursor = db.get_expenses_page(limit=3, after=after, **filters)
+        rows.extend(page)
+        if next_cursor is None:
+            return rows
+        after = db.decode_cursor(next_cursor)
+
+def test_pages_cover_every_row_once_newest_first(expense_db):
+    # Several rows share a date, so the id has to break the ties
+    rows = [(f"2025-01-{1 + i % 4:02d}", float(i), "Food" if i % 2 else "Rent", f"expense {i}") for i in range(10)]
+    expense_db.add_expenses_bulk(rows)
+
+    seen = walk(expense_db)
+    assert len(seen) == 10
+    assert len({row[0] for row in seen}) == 10
+    assert [(row[1], row[0]) for row in seen] == sorted(((row[1], row[0]) for row in seen), reverse=True)
+
+    food = walk(expense_db, category="Food")
+    assert len(food) == 5 and all(row[3] == "Food" for row in food)
+
+def test_last_page_has_no_cursor(expense_db):
+    expense_db.add_expenses_bulk([("2025-01-01", 1.0, "Food", None)] * 3)
+    page, next_cursor = expense_db.get_expenses_page(limit=3)
+    assert len(page) == 3 and next_cursor is None
@@ -0,0 +1,37 @@
+from day4_first_api import IndexedStore, TextSearchIndex
+
+SKILLS = [
+    {"id": 1, "name": "Python Basics", "category": "Programming", "notes": "functions and loops"},
+    {"id": 2, "name": "FastAPI", "category": "Web Development", "notes": "python web APIs"},
+    {"id": 3, "name": "SQL", "category": "Databases", "notes": "queries with python sqlite3"},
+    {"id": 4, "name": "Pandas", "category": "programming", "notes": "dataframes"},
+]
+
+def make_index():
+    index = TextSearchIndex(fields=["name", "notes"])
+    index.add_many(SKILLS)
+    return index
+
+def test_prefix_search_ranks_name_matches_first():
+    assert make_index().search("pyth") == [1, 2, 3]
+
+def test_typo_tolerance():
+    index = make_index()
+    # A misspelled complete word, and a misspelled last word
+    assert index.search("pyhton basics") == [1]
+    assert 1 in index.search("basics pyhton")
+    # The scan fallback has no typo tolerance
+    assert index.scan(SKILLS, "pyhton basics") == []
+
+def test_scan_fallback_matches_the_index_for_exact_words():
+    index = make_index()
+    for query in ("pyth", "python web", "data", "sql que", "nothing"):
+        assert index.scan(SKILLS, query, 10) == index.search(query, 10)
+
+def test_store_indexes_built_on_load():
+    store = IndexedStore(index_fields=["category"])
+    store.load(SKILLS)
+    store.build_indexes()
+    assert [skill["id"] for skill in store.find("category", "PROGRAMMING")] == [1, 4]
+    store.add({"id": 5, "name": "NumPy", "category": "Programming", "notes": ""})
+    assert store.count("category", "programming") == 3
@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+
+INSERT = "INSERT INTO expenses (date, amount, category, description) VALUES (?, ?, ?, ?)"
+
+@pytest.fixture
+def batcher(expense_db):
+    """A batcher that waits long enough for a test's submits to land in ONE batch."""
+    commits = []
+    batcher = expense_db.WriteBatcher(expense_db.DATABASE_NAME, max_wait_ms=300,
+                                      on_commit=lambda: commits.append(1))
+    batcher.commits = commits
+    yield batcher
+    batcher.close()
+
+def count_rows(db):
+    with db.get_pool().connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM expenses").fetchone()[0]
+
+def test_writes_are_group_committed(expense_db, batcher):
+    futures = [batcher.submit(INSERT, ("2025-01-01", float(i), "Food", None)) for i in range(20)]
+    ids = [future.result(timeout=10) for future in futures]
+    assert len(set(ids)) == 20
+    assert batcher.commits == [1]
+    assert count_rows(expense_db) == 20
+    assert expense_db.verify_category_totals() == []
+
+def test_a_failing_statement_fails_only_itself(expense_db, batcher):
+    good = batcher.submit(INSERT, ("2025-01-01", 1.0, "Food", None))
+    bad = batcher.submit(INSERT, ("2025-01-01", 2.0, None, None))   # category is NOT NULL
+    also_good = batcher.submit(INSERT, ("2025-01-01", 3.0, "Food", None))
+    assert good.result(timeout=10) and also_good.result(timeout=10)
+    with pytest.raises(sqlite3.IntegrityError):
+        bad.result(timeout=10)
+    assert count_rows(expense_db) == 2
+
+def test_an_error_that_rolls_back_the_transaction_fails_the_whole_batch(expense_db, batcher):
+    # RAISE(ROLLBACK) undoes the whole transaction, like SQLITE_FULL or an I/O error would
+    with expense_db.get_pool().connection() as conn:
+        with conn:
+            conn.execute("""
+                CREATE TRIGGER test_rollback BEFORE INSERT ON expenses
+                WHEN NEW.category = 'rollback'
+                BEGIN SELECT RAISE(ROLLBACK, 'forced rollback'); END
+            """)
+    futures = [
+        batcher.submit(INSERT, ("2025-01-01", 1.0, "Food", None)),
+        batcher.submit(INSERT, ("2025-01-01", 2.0, "rollback", None)),
+        batcher.submit(INSERT, ("2025-01-01", 3.0, "Food", None)),
+    ]
+    for future in futures:
+        with pytest.raises(sqlite3.Error):
+            future.result(timeout=10)
+    assert count_rows(expense_db) == 0
+    assert batcher.commits == []
+
+    # The batcher keeps working afterwards
+    assert batcher.submit(INSERT, ("2025-01-02", 4.0, "Food", None)).result(timeout=10)
+    assert count_rows(expense_db) == 1
+
+def test_a_dead_batcher_fails_writes_and_is_replaced(expense_db, tmp_path, monkeypatch):
+    dead = expense_db.WriteBatcher(str(tmp_path / "missing" / "dir" / "x.db"))
+    dead._thread.join(timeout=10)
+    with pytest.raises(RuntimeError):
+        dead.submit(INSERT, ("2025-01-01", 1.0, "Food", None))
+
+    monkeypatch.setattr(expense_db, "_write_batcher", dead)
+    assert expense_db.get_write_batcher() is not dead
+    assert expense_db.submit_expense("2025-01-01", 1.0, "Food", None).result(timeout=10)
@@ -0,0 +1,173 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from transaction_table import COLUMNS, TransactionTable, _date_to_int, _int_to_date
+
+class TransactionAnalysis:
+    """Vectorized questions over transactions, backed by NumPy arrays.
+
+    The columns are NumPy views of a TransactionTable's arrays (np.frombuffer), so
+    building the analysis copies nothing. Every question is one vectorized pass:
+    - mask(...)            -> a boolean filter array (combine with & and |)
+    - total / count        -> sums over the whole table or a mask
+    - group_by(...)        -> sum / count / mean per category or vendor (np.bincount)
+    - top(k) / largest()   -> arg-max / top-k without sorting everything
+    - scaled_total(factor) -> column arithmetic (e.g. a 5% fee) without copying records
+
+    While an analysis exists its table can't grow (the arrays are shared with NumPy
+    and Python refuses to resize them), so build a new one after adding rows.
+    """
+
+    def __init__(self, table: TransactionTable):
+        self.table = table
+        self.ids = np.frombuffer(table.ids, dtype=np.int64)
+        self.amounts = np.frombuffer(table.amounts, dtype=np.float64)
+        self.dates = np.frombuffer(table.dates, dtype=np.int32)
+        self.vendor_codes = np.frombuffer(table.vendor_codes, dtype=np.uint32)
+        self.category_codes = np.frombuffer(table.category_codes, dtype=np.uint32)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "TransactionAnalysis":
+        """Builds the analysis from a list of transaction dicts (the JSON/CSV format)."""
+        return cls(TransactionTable.from_records(records))
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    # --- Filters ---
+
+    def mask(
+        self,
+        category: Optional[str] = None,
+        vendor: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> np.ndarray:
+        """A boolean array that is True for the rows matching every given condition.
+
+        Strings are compared through their dictionary codes, so a category filter is
+        one integer comparison per row. Dates are inclusive 'YYYY-MM-DD' bounds.
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if category is not None:
+            keep &= self.category_codes == self.table.categories.code_of(category)
+        if vendor is not None:
+            keep &= self.vendor_codes == self.table.vendors.code_of(vendor)
+        if min_amount is not None:
+            keep &= self.amounts >= min_amount
+        if max_amount is not None:
+            keep &= self.amounts <= max_amount
+        if start_date is not None:
+            keep &= self.dates >= int(start_date.replace("-", ""))
+        if end_date is not None:
+            keep &= self.dates <= int(end_date.replace("-", ""))
+        return keep
+
+    # --- Totals ---
+
+    def total(self, mask: Optional[np.ndarray] = None) -> float:
+        amounts = self.amounts if mask is None else self.amounts[mask]
+        return float(amounts.sum())
+
+    def count(self, mask: Optional[np.ndarray] = None) -> int:
+        return len(self) if mask is None else int(np.count_nonzero(mask))
+
+    def scaled_total(self, factor: float, mask: Optional[np.ndarray] = None) -> float:
+        """Total after multiplying every amount by `factor` (e.g. 1.05 for a 5% fee).
+
+        The multiplication happens on the amounts column only; no record is copied.
+        """
+        return self.total(mask) * factor
+
+    def scaled_amounts(self, factor: float) -> np.ndarray:
+        """A new amounts column multiplied by `factor` (one float per row, not one dict)."""
+        return self.amounts * factor
+
+    # --- Group By ---
+
+    def group_by(self, column: str = "category", mask: Optional[np.ndarray] = None) -> Dict[str, Dict[str, float]]:
+        """{name: {"sum", "count", "mean"}} per category or vendor, highest sum first.
+
+        np.bincount adds up the amounts per dictionary code in a single pass.
+        """
+        if column == "category":
+            codes, names = self.category_codes, self.table.categories.values
+        elif column == "vendor":
+            codes, names = self.vendor_codes, self.table.vendors.values
+        else:
+            raise ValueError(f"Can only group by 'category' or 'vendor', not '{column}'")
+
+        amounts = self.amounts
+        if mask is not None:
+            codes, amounts = codes[mask], amounts[mask]
+        sums = np.bincount(codes, weights=amounts, minlength=len(names))
+        counts = np.bincount(codes, minlength=len(names))
+
+        groups = {}
+        for code in np.argsort(-sums, kind="stable"):
+            if counts[code]:
+                groups[names[code]] = {
+                    "sum": float(sums[code]),
+                    "count": int(counts[code]),
+                    "mean": float(sums[code] / counts[code]),
+                }
+        return groups
+
+    # --- Largest Transactions ---
+
+    def top(self, k: int = 1, mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """The k most expensive transactions (most expensive first).
+
+        np.argpartition finds the k largest in linear time; only those k are sorted.
+        """
+        rows = None if mask is None else np.flatnonzero(mask)
+        amounts = self.amounts if rows is None else self.amounts[rows]
+        k = min(k, len(amounts))
+        if k <= 0:
+            return []
+        best = np.argpartition(amounts, len(amounts) - k)[-k:]
+        best = best[np.argsort(-amounts[best], kind="stable")]
+        return self.records(best if rows is None else rows[best])
+
+    def largest(self, mask: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
+        """The single most expensive transaction (arg-max), or None if nothing matches."""
+        if mask is None:
+            return self.records([int(np.argmax(self.amounts))])[0] if len(self) else None
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return None
+        return self.records([int(rows[np.argmax(self.amounts[rows])])])[0]
+
+    def records(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        """Plain transaction dicts for the given row numbers (only those rows are built)."""
+        table = self.table
+        return [
+            dict(zip(COLUMNS, (
+                int(self.ids[row]),
+                table.vendors.values[self.vendor_codes[row]],
+                float(self.amounts[row]),
+                table.categories.values[self.category_codes[row]],
+                _int_to_date(int(self.dates[row])),
+            )))
+            for row in rows
+        ]
+
+def split_valid_records(records: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Separates records that fit the table's columns from the ones that don't
+    (e.g. a hand-edited transactions.json with a text amount). Returns (valid, invalid).
+    """
+    valid, invalid = [], []
+    for record in records:
+        try:
+            int(record["id"])
+            float(record["amount"])
+            _date_to_int(record["date"])
+            if not isinstance(record["vendor"], str) or not isinstance(record["category"], str):
+                raise TypeError("vendor and category must be text")
+            valid.append(record)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            invalid.append(record)
+    return valid, invalid
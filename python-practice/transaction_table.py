@@ -0,0 +1,208 @@
+import csv
+import json
+import os
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List
+
+# Same fields (and order) as the records in transactions.json / transactions.csv
+COLUMNS = ("id", "vendor", "amount", "category", "date")
+
+class StringDictionary:
+    """Maps each distinct string to a small int code (dictionary encoding).
+
+    A category like "Food" is stored once here; every row only keeps its code.
+    """
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code_of(self, value: str) -> int:
+        """The code of `value`, or -1 if it never appeared."""
+        return self._codes.get(value, -1)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+def _date_to_int(text: str) -> int:
+    """'2025-10-16' -> 20251016 (fits a 32-bit int and still sorts by date)."""
+    year, month, day = text.split("-")
+    return int(year) * 10000 + int(month) * 100 + int(day)
+
+def _int_to_date(value: int) -> str:
+    return f"{value // 10000:04d}-{value // 100 % 100:02d}-{value % 100:02d}"
+
+class TransactionRow:
+    """A lightweight view of one row: it holds only the table and a row number."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "TransactionTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def id(self) -> int:
+        return self._table.ids[self._index]
+
+    @property
+    def vendor(self) -> str:
+        return self._table.vendors.values[self._table.vendor_codes[self._index]]
+
+    @property
+    def amount(self) -> float:
+        return self._table.amounts[self._index]
+
+    @property
+    def category(self) -> str:
+        return self._table.categories.values[self._table.category_codes[self._index]]
+
+    @property
+    def date(self) -> str:
+        return _int_to_date(self._table.dates[self._index])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {column: getattr(self, column) for column in COLUMNS}
+
+    def __repr__(self) -> str:
+        return f"TransactionRow({self.to_dict()})"
+
+class TransactionTable:
+    """Transactions stored column by column instead of as a list of dicts.
+
+    - id, amount and date live in typed `array`s (8 + 8 + 4 bytes per row)
+    - vendor and category are dictionary-encoded: each row stores a 4-byte code
+      and every distinct string is kept once
+    - table[i] returns a TransactionRow view; to_dicts() rebuilds plain dicts
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.amounts = array("d")
+        self.dates = array("i")
+        self.vendor_codes = array("I")
+        self.category_codes = array("I")
+        self.vendors = StringDictionary()
+        self.categories = StringDictionary()
+
+    # --- Adding Rows ---
+
+    def append(self, id: int, vendor: str, amount: float, category: str, date: str):
+        self.ids.append(int(id))
+        self.vendor_codes.append(self.vendors.encode(vendor))
+        self.amounts.append(float(amount))
+        self.category_codes.append(self.categories.encode(category))
+        self.dates.append(_date_to_int(date))
+
+    def append_record(self, record: Dict[str, Any]):
+        self.append(record["id"], record["vendor"], record["amount"], record["category"], record["date"])
+
+    def extend(self, records: Iterable[Dict[str, Any]]):
+        """Appends many records, one column at a time (much faster than append_record in a loop)."""
+        records = records if isinstance(records, list) else list(records)
+        vendor_code, category_code = self.vendors.encode, self.categories.encode
+        # Most transactions share a handful of dates, so each one is parsed only once
+        date_cache: Dict[str, int] = {}
+
+        def date_value(text):
+            value = date_cache.get(text)
+            if value is None:
+                value = date_cache[text] = _date_to_int(text)
+            return value
+
+        self.ids.extend([int(record["id"]) for record in records])
+        self.vendor_codes.extend([vendor_code(record["vendor"]) for record in records])
+        self.amounts.extend([float(record["amount"]) for record in records])
+        self.category_codes.extend([category_code(record["category"]) for record in records])
+        self.dates.extend([date_value(record["date"]) for record in records])
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "TransactionTable":
+        table = cls()
+        table.extend(records)
+        return table
+
+    # --- Reading Rows ---
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> TransactionRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TransactionTable index out of range")
+        return TransactionRow(self, index)
+
+    def __iter__(self) -> Iterator[TransactionRow]:
+        for index in range(len(self)):
+            yield TransactionRow(self, index)
+
+    def to_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Yields each row as a plain dict (the format of the JSON/CSV files)."""
+        vendors, categories = self.vendors.values, self.categories.values
+        for id, vendor_code, amount, category_code, date in zip(
+            self.ids, self.vendor_codes, self.amounts, self.category_codes, self.dates
+        ):
+            yield {
+                "id": id,
+                "vendor": vendors[vendor_code],
+                "amount": amount,
+                "category": categories[category_code],
+                "date": _int_to_date(date),
+            }
+
+    # --- Summaries ---
+
+    def total_amount(self) -> float:
+        return sum(self.amounts)
+
+    def category_totals(self) -> Dict[str, float]:
+        """Total spent per category. Sums into a list indexed by category code, so the
+        loop never hashes a string."""
+        totals = [0.0] * len(self.categories)
+        for code, amount in zip(self.category_codes, self.amounts):
+            totals[code] += amount
+        return dict(zip(self.categories.values, totals))
+
+    def memory_bytes(self) -> int:
+        """Bytes used by the column buffers plus the distinct vendor/category strings."""
+        columns = (self.ids, self.amounts, self.dates, self.vendor_codes, self.category_codes)
+        size = sum(column.itemsize * len(column) for column in columns)
+        for dictionary in (self.vendors, self.categories):
+            size += sum(len(value.encode("utf-8")) for value in dictionary.values)
+        return size
+
+    # --- File Adapters (same formats as day3_expense_tracker.save_data) ---
+
+    @classmethod
+    def load_json(cls, path: str) -> "TransactionTable":
+        with open(path, "r") as f:
+            return cls.from_records(json.load(f))
+
+    @classmethod
+    def load_csv(cls, path: str) -> "TransactionTable":
+        with open(path, "r", newline="") as f:
+            return cls.from_records(csv.DictReader(f))
+
+    def save_json(self, path: str):
+        # Temp file + rename, like save_data(), so a crash never leaves half a file
+        with open(path + ".tmp", "w") as f:
+            json.dump(list(self.to_dicts()), f, indent=4)
+        os.replace(path + ".tmp", path)
+
+    def save_csv(self, path: str):
+        with open(path + ".tmp", "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.to_dicts())
+        os.replace(path + ".tmp", path)